@@ -1,14 +1,22 @@
 import os
 import subprocess
 
-from flask import Flask
+from flask import (Flask, Response)
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
-from blueprints.ai_blueprint import ai_bp
+from blueprints.ai_blueprint import (ai_bp, metrics)
 from blueprints.quran_blueprint import quran_bp
+from blueprints.data_loader import (DataWatcher, QuranStore, SharedDataStore)
+
+#** Compiles missing Quran stores once at startup (in the gunicorn master with preload_app; workers wait on the build lock
+#** otherwise). ISLAMAI_BUILD_STORES=0 skips it and /quran/keyword answers 503 until the stores are built offline.
+if os.environ.get('ISLAMAI_BUILD_STORES', '1') != '0':
+    QuranStore.ensure_all()
 
 app = Flask(__name__)
+#** Per-route latency (parse/lookup/serialize), response sizes and cache results for /metrics
+metrics.init_app(app)
 app.register_blueprint(ai_bp)
 app.register_blueprint(quran_bp)
 
@@ -20,6 +28,15 @@ def ai_index():
             'api-index': '/islam-ai/v1/index'
             }
 
+@app.route('/memory')
+def memory_report():
+    #** Per-worker RSS/PSS versus the shared dataset segment (see gunicorn.conf.py)
+    return SharedDataStore.memory_report()
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 class MyHandler(FileSystemEventHandler):
     def on_modified(self, event):
         if event.src_path.endswith(".py"):
@@ -30,6 +47,8 @@ if __name__ == '__main__':
     observer = Observer()
     observer.schedule(MyHandler(), path='.', recursive=True)
     observer.start()
+    #** Data files (islamic_data/jsons) are reloaded in place instead of restarting the server
+    DataWatcher.start()
     
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
 
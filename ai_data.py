@@ -1,18 +1,27 @@
+import argparse
 import asyncio
+import gzip
+import hashlib
 import json
+import os
 import re
+import sqlite3
 import threading
 from bisect import insort
-from collections import (OrderedDict, namedtuple)
+from collections import (Counter, OrderedDict, deque, namedtuple)
 from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from copy import deepcopy
 from dataclasses import dataclass
 from functools import lru_cache
+from itertools import chain
 from multiprocessing import cpu_count
 from pathlib import Path
-from random import choice
-from time import time
+from random import (choice, uniform)
+from time import (monotonic, time)
+from urllib.parse import (urljoin, urlsplit)
 from aiohttp import (ClientSession, TCPConnector, client_exceptions)
 from bs4 import BeautifulSoup
 # from docx import Document
@@ -21,10 +30,12 @@ from nested_lookup import nested_lookup as nested
 from pdfminer.high_level import extract_pages
 from rapidfuzz import (fuzz, process)
 from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 from unidecode import unidecode
 from string import ascii_lowercase
 # import tracemalloc
 from blueprints.data_loader import DataLoader as dl
+from blueprints.data_loader import (ArabicNormalizer, KeywordIndex, QuranStore)
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -88,11 +99,580 @@ class SingletonMeta(type):
                 cls._instances[cls] = instance
         return cls._instances[cls]
 
+@dataclass
+class RetryPolicy:
+    '''
+    ### Note:
+        >>> Bounded retries for BaseAPI._request/_get_element: exponential backoff with full jitter
+            (a random delay in [0, min(max_delay, base_delay * 2**attempt)]).
+            Connection errors, timeouts, `statuses` and every status whose class (status // 100) is in `status_classes` are retried.
+    '''
+    attempts: int=4
+    base_delay: float=0.5
+    max_delay: float=30.0
+    statuses: tuple=(408, 429)
+    status_classes: tuple=(5,)
+    
+    def retryable(self, status):
+        return status in self.statuses or status // 100 in self.status_classes
+    
+    def delay(self, attempt, retry_after=None):
+        delay = uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        #** Retry-After (seconds) from 429/503 responses is honoured up to max_delay
+        if retry_after is not None and str(retry_after).isdigit():
+            delay = max(delay, min(float(retry_after), self.max_delay))
+        return delay
+
+class CircuitBreaker:
+    '''
+    ### Note:
+        >>> Per-host circuit breaker: after `threshold` consecutive failures the host is `open` and its requests
+            are shed for `cooldown` seconds, then one probe request is let through (`half_open`);
+            a success closes the circuit, a failure opens it again.
+        >>> Every request that was allowed ends with record_success, record_failure or `release` (no verdict on the host,
+            E.g an invalid URL or a cancelled request), so a half-open probe never leaves the circuit stuck.
+    '''
+    _breakers = {}
+    
+    def __init__(self, host, threshold=5, cooldown=30.0):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.state = 'closed'
+        self.opened_at = 0.0
+        self.trips = 0
+    
+    @classmethod
+    def get(cls, host, **kwargs):
+        if host not in cls._breakers:
+            cls._breakers[host] = cls(host, **kwargs)
+        return cls._breakers[host]
+    
+    def allow(self):
+        if self.state == 'open' and monotonic() - self.opened_at >= self.cooldown:
+            self.state = 'half_open'
+            return True
+        return self.state == 'closed'
+    
+    def record_success(self):
+        self.failures = 0
+        self.state = 'closed'
+    
+    def release(self):
+        #** The probe said nothing about the host: the next request probes again (cooldown already elapsed)
+        if self.state == 'half_open':
+            self.state = 'open'
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.threshold:
+            if self.state != 'open':
+                self.trips += 1
+            self.state = 'open'
+            self.opened_at = monotonic()
+
+class CircuitOpenError(client_exceptions.ClientConnectionError):
+    '''Raised when a request is shed because its host circuit is open'''
+
+class TokenBucket:
+    '''Per-host rate limit: `rate` requests per second with bursts of up to `capacity`'''
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = monotonic()
+    
+    def try_acquire(self):
+        '''Takes a token and returns 0, or returns the seconds until the next token'''
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+class CrawlScheduler:
+    '''
+    ### Note:
+        >>> Every BaseAPI._request waits for a `slot(host)`: requests are queued in priority lanes (lower value first)
+            and dispatched while fewer than `max_concurrency` are running and their host's TokenBucket has a token.
+            Within a priority, the lane (extractor) with the fewest running (then completed) requests is served first,
+            so extractors run together in main() share the crawl fairly.
+        >>> The lane/priority of a request comes from the `lane`/`priority` context variables (see `in_lane`),
+            falling back to the BaseAPI subclass name.
+    
+    E.g
+        >>> await CrawlScheduler.in_lane(QuranAPI().extract_surahs_info(), 'surahs-info', priority=0)
+    '''
+    lane = ContextVar('crawl_lane', default=None)
+    priority = ContextVar('crawl_priority', default=1)
+    
+    def __init__(self, max_concurrency=32, rate=4.0, burst=8, host_rates=None):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        #** {host: (rate, burst)} overrides
+        self.host_rates = host_rates or {}
+        self.buckets = {}
+        self.running = 0
+        self.lane_running = Counter()
+        self.completed = Counter()
+        #** {priority: OrderedDict({lane: deque([(host, Future), ...])})}
+        self.waiters = {}
+        self._timer = None
+    
+    @staticmethod
+    async def in_lane(coro, lane, priority=1):
+        #** Runs inside its own task context, so the lane only applies to `coro` (and the tasks it spawns)
+        CrawlScheduler.lane.set(lane)
+        CrawlScheduler.priority.set(priority)
+        return await coro
+    
+    def bucket(self, host):
+        if host not in self.buckets:
+            rate, burst = self.host_rates.get(host, (self.rate, self.burst))
+            self.buckets[host] = TokenBucket(rate, burst)
+        return self.buckets[host]
+    
+    def _next_waiter(self):
+        #** Returns (lane, future) of the next dispatchable request, or (None, seconds until a token frees up)
+        delay = None
+        for priority in sorted(self.waiters):
+            lanes = self.waiters[priority]
+            for lane in sorted(lanes, key=lambda lane: (self.lane_running[lane], self.completed[lane])):
+                queue = lanes[lane]
+                while queue and queue[0][1].done():
+                    queue.popleft()
+                if not queue:
+                    continue
+                wait = self.bucket(queue[0][0]).try_acquire()
+                if wait:
+                    delay = wait if delay is None else min(delay, wait)
+                    continue
+                return lane, queue.popleft()[1]
+        return None, delay
+    
+    def _cleanup(self):
+        for priority in list(self.waiters):
+            lanes = self.waiters[priority]
+            for lane in [lane for lane, queue in lanes.items() if not queue]:
+                del lanes[lane]
+            if not lanes:
+                del self.waiters[priority]
+    
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+    
+    def _dispatch(self):
+        delay = None
+        while self.running < self.max_concurrency:
+            lane, future = self._next_waiter()
+            if lane is None:
+                delay = future
+                break
+            self.running += 1
+            self.lane_running[lane] += 1
+            future.set_result(None)
+        self._cleanup()
+        if delay is not None and self.waiters:
+            loop = asyncio.get_running_loop()
+            if self._timer is None or self._timer.when() > loop.time() + delay:
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = loop.call_later(delay, self._on_timer)
+    
+    def _release(self, lane):
+        self.running -= 1
+        self.lane_running[lane] -= 1
+        self.completed[lane] += 1
+        self._dispatch()
+    
+    @asynccontextmanager
+    async def slot(self, host, lane=None, priority=None):
+        lane = lane or self.lane.get() or 'default'
+        priority = self.priority.get() if priority is None else priority
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(priority, OrderedDict()).setdefault(lane, deque()).append((host, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            #** Cancelled after the slot was handed over
+            if future.done() and not future.cancelled():
+                self._release(lane)
+            raise
+        try:
+            yield
+        finally:
+            self._release(lane)
+
+class CacheMissError(LookupError):
+    '''Raised in replay mode when a request is not in the HTTPCache'''
+
+#^ Errors a crawl unit gives up with (retries exhausted, circuit open, not replayable, page never rendered): handled per unit
+CRAWL_ERRORS = (client_exceptions.ClientError, asyncio.TimeoutError, CacheMissError, WebDriverException)
+
+class HTTPCache:
+    '''
+    ### Note:
+        >>> On-disk HTTP cache consulted by BaseAPI._request (islamic_data/http_cache).
+            Requests are keyed by sha256(URL + headers) (RapidAPI keys excluded, tokens rotate);
+            bodies are stored gzip-compressed and content-addressed (bodies/<sha256[:2]>/<sha256>.gz),
+            with ETag, Last-Modified, content type and fetch time in `index.sqlite3`.
+        >>> Modes (`ISLAMAI_HTTP_CACHE`):
+            - online (default): entries younger than `max_age` are served from disk, older ones are revalidated
+                                with If-None-Match/If-Modified-Since (304 -> cached body).
+            - replay: offline re-parsing, every request is served from disk (CacheMissError otherwise).
+            - off: no cache.
+        >>> The bodies are capped to `max_bytes`; the least recently used entries are evicted first.
+            Hits only record their access time in memory; it is written in one transaction every `ACCESS_FLUSH` hits
+            (and before evicting, storing or closing), so replaying from disk does not commit once per request.
+    '''
+    VOLATILE_HEADERS = ('x-rapidapi-key',)
+    ACCESS_FLUSH = 256
+    #^ Entries deleted per eviction query (oldest `accessed_at` first)
+    EVICT_BATCH = 64
+    
+    def __init__(self, path, mode='online', max_bytes=2 * 1024**3, max_age=7 * 24 * 3600):
+        self.path = Path(path)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = Counter()
+        (self.path / 'bodies').mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path / 'index.sqlite3')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT NOT NULL, digest TEXT NOT NULL,
+                            size INTEGER NOT NULL, content_type TEXT, encoding TEXT, etag TEXT, last_modified TEXT,
+                            fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_digest ON responses (digest)')
+        #** {key: accessed_at} of the hits not written yet
+        self._accessed = OrderedDict()
+        self._total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM responses)').fetchone()[0]
+    
+    @classmethod
+    def key(cls, url, headers=None):
+        headers = sorted((key.lower(), str(value)) for key, value in (headers or {}).items() if key.lower() not in cls.VOLATILE_HEADERS)
+        return hashlib.sha256(json.dumps([url, headers]).encode('utf-8')).hexdigest()
+    
+    def _body_path(self, digest):
+        return self.path / 'bodies' / digest[:2] / f'{digest}.gz'
+    
+    def get(self, key):
+        '''Returns the entry {digest, content_type, encoding, etag, last_modified, fetched_at, fresh} or None'''
+        row = self._db.execute('''SELECT digest, content_type, encoding, etag, last_modified, fetched_at
+                                FROM responses WHERE key = ?''', (key,)).fetchone()
+        if row is None or not self._body_path(row[0]).is_file():
+            return None
+        entry = dict(zip(('digest', 'content_type', 'encoding', 'etag', 'last_modified', 'fetched_at'), row))
+        entry['fresh'] = time() - entry['fetched_at'] < self.max_age
+        self._accessed[key] = time()
+        if len(self._accessed) >= self.ACCESS_FLUSH:
+            self.flush()
+        return entry
+    
+    def flush(self):
+        '''Writes the pending access times in one transaction'''
+        if not self._accessed:
+            return
+        accessed, self._accessed = self._accessed, OrderedDict()
+        self._db.executemany('UPDATE responses SET accessed_at = ? WHERE key = ?', ((at, key) for key, at in accessed.items()))
+        self._db.commit()
+        self.stats['access_flushes'] += 1
+    
+    @staticmethod
+    def validators(entry):
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def body(self, entry):
+        return gzip.decompress(self._body_path(entry['digest']).read_bytes())
+    
+    @staticmethod
+    def decode(body, content_type, encoding):
+        #** Same results as response.json()/response.text()
+        text = body.decode(encoding or 'utf-8', errors='replace')
+        return json.loads(text) if content_type and 'json' in content_type else text
+    
+    def put(self, key, url, body, headers, content_type, encoding):
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        if not body_path.is_file():
+            body_path.parent.mkdir(exist_ok=True)
+            temp_path = body_path.with_suffix('.tmp')
+            temp_path.write_bytes(gzip.compress(body))
+            temp_path.replace(body_path)
+        size = body_path.stat().st_size
+        shared = self._db.execute('SELECT 1 FROM responses WHERE digest = ? AND key != ? LIMIT 1', (digest, key)).fetchone()
+        previous = self._db.execute('SELECT digest FROM responses WHERE key = ?', (key,)).fetchone()
+        now = time()
+        self._accessed.pop(key, None)
+        self._db.execute('''INSERT OR REPLACE INTO responses (key, url, digest, size, content_type, encoding, etag, last_modified, fetched_at, accessed_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                        (key, url, digest, size, content_type, encoding, headers.get('ETag'), headers.get('Last-Modified'), now, now))
+        if previous is not None and previous[0] != digest:
+            self._drop_body(previous[0])
+        if shared is None and (previous is None or previous[0] != digest):
+            self._total += size
+        self._db.commit()
+        self.stats['stored'] += 1
+        self._evict()
+    
+    def revalidated(self, key, headers):
+        '''304 Not Modified: the cached body is fresh again (validators are updated if the server sent new ones)'''
+        self._db.execute('''UPDATE responses SET fetched_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                            WHERE key = ?''', (time(), headers.get('ETag'), headers.get('Last-Modified'), key))
+        self._db.commit()
+        self.stats['revalidated'] += 1
+    
+    def close(self):
+        self.flush()
+        self._db.close()
+    
+    def _drop_body(self, digest):
+        #** Deletes the body once no entry references it
+        if self._db.execute('SELECT 1 FROM responses WHERE digest = ? LIMIT 1', (digest,)).fetchone() is None:
+            body_path = self._body_path(digest)
+            if body_path.is_file():
+                self._total -= body_path.stat().st_size
+                body_path.unlink()
+    
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        #** Recent hits must count before choosing the least recently used entries
+        self.flush()
+        while self._total > self.max_bytes:
+            #** Only the oldest entries are read (accessed_at index), never the whole table
+            rows = self._db.execute('SELECT key, digest FROM responses ORDER BY accessed_at LIMIT ?', (self.EVICT_BATCH,)).fetchall()
+            if not rows:
+                break
+            for key, digest in rows:
+                if self._total <= self.max_bytes:
+                    break
+                self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._drop_body(digest)
+                self.stats['evicted'] += 1
+        self._db.commit()
+
+class WorkManifest:
+    '''
+    ### Note:
+        >>> Checkpointed work units of an extractor (islamic_data/manifests/<name>.jsonl).
+            Every completed unit (E.g `surah-2/lang-14`) is appended to the manifest with the sha256 of its result,
+            and the result itself is stored content-addressed (manifests/units/<sha256[:2]>/<sha256>.json).
+        >>> `run(unit, job)` returns the stored result of a completed unit (hash verified) instead of running `job`,
+            so a crashed or interrupted crawl resumes where it stopped and long crawls can be spread over several runs.
+        >>> A unit that gives up (CRAWL_ERRORS: retries exhausted, circuit open, replay miss, element never rendered) returns an empty result
+            without being checkpointed, so the gather of its sibling units goes on and the next run retries it (`failed`).
+            Callers must not export a file assembled from a failed unit (`skip_export`), or a resumed crawl
+            would overwrite a complete file with empty languages.
+        >>> Empty results (E.g `{}` of a page `_request` answered with '') and results that are not JSON serializable
+            are returned but never checkpointed (`unchecked`), so they are fetched again instead of being replayed forever.
+        >>> `reset()` (or `python ai_data.py --fresh`, BaseAPI.fresh_manifests) starts the extractors from scratch.
+    
+    E.g
+        >>> manifest = BaseAPI.get_manifest('surahquran')
+        >>> verses = await manifest.run(f'surah-{surahID}/lang-{langID}', lambda: _parse_surah(...))
+    '''
+    def __init__(self, name, path):
+        self.name = name
+        self.path = Path(path)
+        self.manifest_path = self.path / f'{name}.jsonl'
+        self.units_path = self.path / 'units'
+        self.units_path.mkdir(parents=True, exist_ok=True)
+        self.stats = Counter()
+        #** {unit: error} of the units that gave up in this run
+        self.failed = OrderedDict()
+        #** {unit: sha256} (the last line of a unit wins)
+        self.completed = OrderedDict()
+        if self.manifest_path.is_file():
+            with open(self.manifest_path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        #** Truncated last line of a crashed run
+                        continue
+                    self.completed[record['unit']] = record['sha256']
+    
+    def _result_path(self, digest):
+        return self.units_path / digest[:2] / f'{digest}.json'
+    
+    def done(self, unit):
+        return unit in self.completed and self._result_path(self.completed[unit]).is_file()
+    
+    def load(self, unit):
+        digest = self.completed[unit]
+        contents = self._result_path(digest).read_bytes()
+        if hashlib.sha256(contents).hexdigest() != digest:
+            raise ValueError(f'Corrupted result for unit `{unit}` of `{self.name}`')
+        return json.loads(contents, object_pairs_hook=OrderedDict)
+    
+    @staticmethod
+    def is_empty(result):
+        '''None, '' and containers holding only empty values (E.g {'Sahih International': {}})'''
+        if isinstance(result, dict):
+            return all(WorkManifest.is_empty(i) for i in result.values())
+        if isinstance(result, (list, tuple)):
+            return all(WorkManifest.is_empty(i) for i in result)
+        return result is None or result == ''
+    
+    def complete(self, unit, result):
+        contents = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        digest = hashlib.sha256(contents).hexdigest()
+        result_path = self._result_path(digest)
+        if not result_path.is_file():
+            result_path.parent.mkdir(exist_ok=True)
+            temp_path = result_path.with_suffix('.tmp')
+            temp_path.write_bytes(contents)
+            temp_path.replace(result_path)
+        #** Checkpoint: one appended line per unit
+        with open(self.manifest_path, mode='a', encoding='utf-8') as file:
+            file.write(json.dumps({'unit': unit, 'sha256': digest, 'completed_at': time()}) + '\n')
+        self.completed[unit] = digest
+        self.stats['completed'] += 1
+    
+    async def run(self, unit, job):
+        if self.done(unit):
+            try:
+                result = self.load(unit)
+                self.stats['skipped'] += 1
+                return result
+            except ValueError:
+                self.stats['corrupted'] += 1
+        try:
+            result = await job()
+        except CRAWL_ERRORS as error:
+            self.stats['failed'] += 1
+            self.failed[unit] = f'{type(error).__name__}: {error}'
+            print(f'\033[1;31m`{self.name}` unit {unit} failed ({self.failed[unit]}), it will be retried on the next run\033[0m')
+            return OrderedDict()
+        if self.is_empty(result):
+            self.stats['unchecked'] += 1
+            return result
+        try:
+            self.complete(unit, result)
+        except (TypeError, ValueError):
+            #** Not JSON serializable: usable by this run, never replayed
+            self.stats['unchecked'] += 1
+        return result
+    
+    def incomplete(self, prefix='', units=()):
+        '''Whether a unit under `prefix` (E.g `surah-2/`) or one of `units` gave up in this run'''
+        return any(unit in self.failed for unit in units) or bool(prefix) and any(unit.startswith(prefix) for unit in self.failed)
+    
+    def skip_export(self, file_name, prefix='', units=()):
+        '''Keeps the previously exported file when one of its units gave up'''
+        if not self.incomplete(prefix, units):
+            return False
+        self.stats['unexported'] += 1
+        print(f'\033[1;31m`{file_name}` was not exported (failed units), the previous file is kept\033[0m')
+        return True
+    
+    def reset(self):
+        '''Starts the extractor from scratch (stored results are kept, they are content-addressed)'''
+        self.completed.clear()
+        self.manifest_path.unlink(missing_ok=True)
+        self.stats['reset'] += 1
+
+class DriverPool:
+    '''
+    ### Note:
+        >>> Bounded pool of reusable WebDrivers (at most `size` alive, each recycled after `max_uses`).
+            A driver is health checked before reuse, reset to the top-level document when returned,
+            quit when it raised during use, and every driver is quit by `close()` (end of main()).
+        >>> `factory` builds a driver (BaseAPI._get_driver by default); any object with get/quit/current_url/switch_to
+            works, so the pool can be tested with a fake driver.
+    
+    E.g
+        >>> async with BaseAPI.get_driver_pool().driver() as driver:
+                await asyncio.to_thread(driver.get, url)
+    '''
+    def __init__(self, factory=None, size=2, max_uses=100):
+        self.factory = factory or BaseAPI._get_driver
+        self.size = size
+        self.max_uses = max_uses
+        self.stats = Counter()
+        self._slots = asyncio.Semaphore(size)
+        self._idle = deque()
+        #** {driver: uses} of every live driver (idle or checked out)
+        self._drivers = {}
+    
+    @staticmethod
+    def _healthy(driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+    
+    def _quit(self, driver):
+        self._drivers.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        self.stats['quit'] += 1
+    
+    async def _checkout(self):
+        while self._idle:
+            driver = self._idle.pop()
+            if self._drivers.get(driver, 0) < self.max_uses and await asyncio.to_thread(self._healthy, driver):
+                self.stats['reused'] += 1
+                return driver
+            self.stats['recycled'] += 1
+            await asyncio.to_thread(self._quit, driver)
+        driver = await asyncio.to_thread(self.factory)
+        self._drivers[driver] = 0
+        self.stats['created'] += 1
+        return driver
+    
+    @asynccontextmanager
+    async def driver(self):
+        async with self._slots:
+            driver = await self._checkout()
+            self._drivers[driver] += 1
+            try:
+                yield driver
+                await asyncio.to_thread(driver.switch_to.default_content)
+            except BaseException:
+                await asyncio.to_thread(self._quit, driver)
+                raise
+            self._idle.append(driver)
+    
+    async def close(self):
+        self._idle.clear()
+        for driver in list(self._drivers):
+            await asyncio.to_thread(self._quit, driver)
+
 @dataclass
 class BaseAPI(metaclass=SingletonMeta):
     '''Class for flexible methods'''
     config: ConfigInfo=ConfigInfo()
     path: Path=Path(__file__).parent.absolute() / 'islamic_data'
+    #^ Pooled session shared by every BaseAPI subclass (one per process and event loop)
+    _session = None
+    _session_loop = None
+    _scheduler = None
+    _http_cache = None
+    _manifests = {}
+    #^ Resets every WorkManifest when it is first used (`--fresh`)
+    fresh_manifests = False
+    _driver_pool = None
+    driver_pool_options = {'size': 2, 'max_uses': 100}
+    connector_options = {'limit': 64, 'limit_per_host': 8, 'ttl_dns_cache': 300, 'keepalive_timeout': 30}
+    scheduler_options = {'max_concurrency': 32, 'rate': 4.0, 'burst': 8}
+    retry_policy = RetryPolicy()
+    #^ retries, gave_up, shed (circuit open), token_rotations, element_retries, iframe_fast_path, iframe_browser
+    retry_stats = Counter()
     
     def __init__(self):
         self.url = self.config
@@ -101,6 +681,73 @@ class BaseAPI(metaclass=SingletonMeta):
     def get_instance(cls):
         return cls()
     
+    @staticmethod
+    async def get_session():
+        '''
+        ### Note:
+            >>> Returns the keep-alive ClientSession shared by all scrapers (QuranAPI, HadithAPI, ...).
+                Connections are reused across requests, limited per host and DNS lookups are cached.
+                The session is recreated if the previous one was closed or belongs to another event loop.
+        '''
+        loop = asyncio.get_running_loop()
+        session = BaseAPI._session
+        if session is None or session.closed or BaseAPI._session_loop is not loop:
+            connector = TCPConnector(ssl=False, use_dns_cache=True, enable_cleanup_closed=True, **BaseAPI.connector_options)
+            BaseAPI._session = session = ClientSession(connector=connector, raise_for_status=True)
+            BaseAPI._session_loop = loop
+        return session
+    
+    @staticmethod
+    def get_scheduler():
+        '''CrawlScheduler shared by all scrapers (recreated with the session for a new event loop)'''
+        loop = asyncio.get_running_loop()
+        if BaseAPI._scheduler is None or BaseAPI._scheduler[0] is not loop:
+            BaseAPI._scheduler = (loop, CrawlScheduler(**BaseAPI.scheduler_options))
+        return BaseAPI._scheduler[1]
+    
+    @classmethod
+    def get_http_cache(cls):
+        '''HTTPCache of islamic_data/http_cache (None when `ISLAMAI_HTTP_CACHE=off`)'''
+        mode = os.environ.get('ISLAMAI_HTTP_CACHE', 'online').lower()
+        if mode == 'off':
+            return None
+        previous = BaseAPI._http_cache
+        if previous is None or previous.mode != mode:
+            BaseAPI._http_cache = HTTPCache(cls.path / 'http_cache', mode=mode)
+            if previous is not None:
+                BaseAPI._http_cache.stats = previous.stats
+                previous.close()
+        return BaseAPI._http_cache
+    
+    @classmethod
+    def get_manifest(cls, name):
+        '''WorkManifest of an extractor (islamic_data/manifests)'''
+        if name not in BaseAPI._manifests:
+            BaseAPI._manifests[name] = WorkManifest(name, cls.path / 'manifests')
+            if BaseAPI.fresh_manifests:
+                BaseAPI._manifests[name].reset()
+        return BaseAPI._manifests[name]
+    
+    @staticmethod
+    def get_driver_pool():
+        '''DriverPool shared by the Selenium scrapers (one per event loop, see close_drivers)'''
+        loop = asyncio.get_running_loop()
+        if BaseAPI._driver_pool is None or BaseAPI._driver_pool[0] is not loop:
+            BaseAPI._driver_pool = (loop, DriverPool(**BaseAPI.driver_pool_options))
+        return BaseAPI._driver_pool[1]
+    
+    @staticmethod
+    async def close_drivers():
+        pool, BaseAPI._driver_pool = BaseAPI._driver_pool, None
+        if pool is not None:
+            await pool[1].close()
+    
+    @staticmethod
+    async def close_session():
+        session, BaseAPI._session, BaseAPI._session_loop = BaseAPI._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+    
     def _get_rand_token(self):
         from random import choice
         rapid_api_url, _, config = self._get_rapidapi(g_config=True)
@@ -131,43 +778,90 @@ class BaseAPI(metaclass=SingletonMeta):
         default_values = (self.url, '', None, False, False)
         url, endpoint, headers, slash, rapidapi = tuple(kwargs.get(key, default_values[i]) for i, key in enumerate(('url', 'endpoint', 'headers', 'slash', 'rapidapi')))
         slash = '/' if slash else ''
-        full_endpoint = f'{url}{slash+str(endpoint)}'
-        response = None
-        try:
-            async with ClientSession(connector=TCPConnector(ssl=False, enable_cleanup_closed=True,
-                                                            force_close=True, ttl_dns_cache=300),
-                                                            raise_for_status=True) as session:
-                async with session.get(full_endpoint, headers=headers) as response:
-                    response = await response.json()
-                    return response
-        except (client_exceptions.ContentTypeError):
-            response = await response.text()
-            return response
-        except (client_exceptions.ServerDisconnectedError,
-                client_exceptions.ClientConnectionError):
-            return await self._request(**kwargs)
-        except client_exceptions.InvalidURL:
-            return ''
-        except client_exceptions.ClientResponseError as error_:
-            mask_ = lambda token: '{}{}'.format(token[:4], '*'*(len(token)//3))
-            rapid_api_url, new_headers = ('', '')
-            new_token = ''
-            if not self._get_rand_token():
-                raise error_('All tokens failed.')
-            if rapidapi and not response:
-                await asyncio.sleep(0.1)
-                headers = kwargs.get('headers', '')
-                rapid_api_url, new_headers = self._get_rand_token()
-                new_token = mask_(new_headers.get('X-RapidAPI-Key', ''))
-            new_kwargs = {
-                'url': rapid_api_url,
-                'headers': new_headers
-                }
-            kwargs.update(new_kwargs)
-            response = await self._request(**kwargs)
-            if response:
-                return response
-            print(f"Token failed. Token ({new_token}) being used.")
+        policy, scheduler = self.retry_policy, self.get_scheduler()
+        lane = kwargs.get('lane') or CrawlScheduler.lane.get() or type(self).__name__
+        cache, entry = self.get_http_cache(), None
+        if cache is not None:
+            cache_key = cache.key(f'{url}{slash+str(endpoint)}', headers)
+            entry = cache.get(cache_key)
+            if entry is not None and (cache.mode == 'replay' or entry['fresh']):
+                cache.stats['replayed' if cache.mode == 'replay' else 'hits'] += 1
+                return cache.decode(cache.body(entry), entry['content_type'], entry['encoding'])
+            if cache.mode == 'replay':
+                cache.stats['replay_misses'] += 1
+                raise CacheMissError(f'{url}{slash+str(endpoint)} is not cached (ISLAMAI_HTTP_CACHE=replay)')
+        for attempt in range(policy.attempts):
+            full_endpoint = f'{url}{slash+str(endpoint)}'
+            host = urlsplit(full_endpoint).netloc
+            breaker = CircuitBreaker.get(host)
+            if not breaker.allow():
+                self.retry_stats['shed'] += 1
+                raise CircuitOpenError(f'Circuit open for `{breaker.host}`: {full_endpoint}')
+            response, retry_after, settled = None, None, False
+            try:
+                session = await self.get_session()
+                request_headers = {**(headers or {}), **HTTPCache.validators(entry)}
+                async with scheduler.slot(host, lane, kwargs.get('priority')), session.get(full_endpoint, headers=request_headers) as response:
+                    body = await response.read()
+                    content_type, encoding = response.content_type, response.get_encoding()
+                breaker.record_success()
+                settled = True
+                if cache is None:
+                    return HTTPCache.decode(body, content_type, encoding)
+                if response.status == 304 and entry is not None:
+                    cache.revalidated(cache_key, response.headers)
+                    return cache.decode(cache.body(entry), entry['content_type'], entry['encoding'])
+                cache.put(cache_key, full_endpoint, body, response.headers, content_type, encoding)
+                return HTTPCache.decode(body, content_type, encoding)
+            except client_exceptions.InvalidURL:
+                return ''
+            except client_exceptions.ClientResponseError as error_:
+                last_error, settled = error_, True
+                #** RapidAPI: rejected/limited tokens are swapped for another random token
+                if rapidapi and error_.status in (401, 403, 429) and (new_token := self._get_rand_token()):
+                    #** The host answered: the token (not the host) is at fault
+                    breaker.record_success()
+                    url, headers = new_token
+                    self.retry_stats['token_rotations'] += 1
+                elif not policy.retryable(error_.status):
+                    #** 4xx: the host is healthy, the resource is not there (E.g 404)
+                    breaker.record_success()
+                    return ''
+                else:
+                    breaker.record_failure()
+                retry_after = (error_.headers or {}).get('Retry-After')
+            except (client_exceptions.ClientConnectionError, asyncio.TimeoutError) as error_:
+                last_error, settled = error_, True
+                breaker.record_failure()
+            finally:
+                #** Invalid URL, payload/decoding errors, cancellation: no verdict on the host
+                if not settled:
+                    breaker.release()
+            if attempt + 1 < policy.attempts:
+                self.retry_stats['retries'] += 1
+                await asyncio.sleep(policy.delay(attempt, retry_after))
+        self.retry_stats['gave_up'] += 1
+        print(f'\033[1;31mGave up on {full_endpoint} after {policy.attempts} attempts ({type(last_error).__name__})\033[0m')
+        if entry is not None:
+            #** Stale copy rather than nothing when the source is down
+            cache.stats['stale'] += 1
+            return cache.decode(cache.body(entry), entry['content_type'], entry['encoding'])
+        raise last_error
+    
+    @classmethod
+    def crawl_report(cls):
+        '''Retry/breaker/scheduler/HTTP cache/manifest counters of the crawl (printed at the end of main())'''
+        breakers = {host: {'state': breaker.state, 'trips': breaker.trips}
+                    for host, breaker in CircuitBreaker._breakers.items() if breaker.trips or breaker.state != 'closed'}
+        scheduler = cls._scheduler[1] if cls._scheduler is not None else None
+        pool = cls._driver_pool[1] if cls._driver_pool is not None else None
+        return {**{key: cls.retry_stats[key] for key in ('retries', 'gave_up', 'shed', 'token_rotations', 'element_retries',
+                                                          'iframe_fast_path', 'iframe_browser')},
+                'drivers': dict(pool.stats) if pool is not None else {},
+                'open_circuits': breakers,
+                'requests_per_lane': dict(scheduler.completed) if scheduler is not None else {},
+                'http_cache': dict(cls._http_cache.stats) if cls._http_cache is not None else {},
+                'manifests': {name: {**manifest.stats, 'failed_units': list(manifest.failed)} for name, manifest in cls._manifests.items()}}
     
     @staticmethod
     def best_match(string, values_: list, **kwargs):
@@ -217,10 +911,12 @@ class BaseAPI(metaclass=SingletonMeta):
             return contents
         return soup
 
-    async def get_quran_keyword(self, keyword=''):
-        '''Mainly for Quran RapidAPI'''
-        rapid_api_url, headers = self._get_rapidapi()
-        return await self._request(url=rapid_api_url, endpoint=f'corpus/{keyword}', slash=True, headers=headers)
+    async def get_quran_keyword(self, keyword='', lang=None, stem=None):
+        '''Counts and locates `keyword` with the local KeywordIndex (previously Quran RapidAPI `corpus/{keyword}`)'''
+        lang = lang or ('Arabic' if ArabicNormalizer.is_arabic(keyword) else 'English')
+        #** Offline (scraper) use: compiles the store under its build lock if it is missing
+        await asyncio.to_thread(QuranStore.ensure, 'surah-quran')
+        return KeywordIndex.get('surah-quran').search(keyword, lang, stem=stem)
 
     @staticmethod
     def _get_driver():
@@ -232,15 +928,19 @@ class BaseAPI(metaclass=SingletonMeta):
     @staticmethod
     async def _get_element(*args):
         driver, by, tag_name = args
-        element=None
-        try:
-            wait = WebDriverWait(driver, 10)
-            element = wait.until(presence_of_element_located((by, tag_name)))
-        except (TimeoutException, WebDriverException, NoSuchElementException, NoSuchFrameException):
-            if not element:
-                print(f'Element `{tag_name}` not found. Trying again.')
-                return await BaseAPI._get_element(*args)
-        return element
+        policy = BaseAPI.retry_policy
+        for attempt in range(policy.attempts):
+            try:
+                wait = WebDriverWait(driver, 10)
+                return await asyncio.to_thread(wait.until, presence_of_element_located((by, tag_name)))
+            except (TimeoutException, WebDriverException, NoSuchElementException, NoSuchFrameException) as error_:
+                last_error = error_
+                if attempt + 1 < policy.attempts:
+                    print(f'Element `{tag_name}` not found. Trying again.')
+                    BaseAPI.retry_stats['element_retries'] += 1
+                    await asyncio.sleep(policy.delay(attempt))
+        BaseAPI.retry_stats['gave_up'] += 1
+        raise last_error
 
     @staticmethod
     def add_line_breaks(text, words_per_line=7, join_spacing=''):
@@ -264,6 +964,7 @@ class QuranAPI(BaseAPI):
     async def surahquran_extract_surahs(self, export=False):
         '''lang, ayaID, surahID'''
         surahquran_endpoint = 'Surah-translation/meanings-language-{}-surah-{}.html'
+        manifest = self.get_manifest('surahquran')
 
         async def _get_langs():
             '''Returns {langID:lang}'''
@@ -295,38 +996,45 @@ class QuranAPI(BaseAPI):
                 verse_contents[verseID] = verse
             return verse_contents
 
+        async def _parse_unit(en=False, **kwargs):
+            #** Work unit: surah x language
+            unit = 'surah-{}/lang-{}{}'.format(kwargs.get('surahID'), kwargs.get('langID'), '-en' if en else '')
+            return await manifest.run(unit, lambda: _parse_surah(en, **kwargs))
+
         async def _parse_langs(**kwargs):
             all_langs, en_verses = await asyncio.gather(*[
                                                 _get_langs(),
-                                                _parse_surah(langID=2, en=True, **kwargs)])
+                                                _parse_unit(langID=2, en=True, **kwargs)])
             lang_contents = OrderedDict({'languages': {}})
-            for (langID, lang) in all_langs.items():
-                verses = await _parse_surah(langID=langID, **kwargs)
+            all_verses = await asyncio.gather(*(_parse_unit(langID=langID, **kwargs) for langID in all_langs))
+            for lang, verses in zip(all_langs.values(), all_verses):
                 lang_contents['languages'][lang] = verses
             lang_contents['languages']['English'] = en_verses
             sorted_languages = {k: v for k, v in sorted(lang_contents['languages'].items())}
             return sorted_languages
 
+        async def _extract_surah(idx, surahID, surah_name_):
+            surah_name, surah_name_ar = surah_name_['name_complex'], surah_name_['surah_name_ar']
+            surah_contents = await _parse_langs(surahID=surahID)
+            full_surah = {
+                        'name_complex': surah_name,
+                        'surah_name_ar': surah_name_ar,
+                        'verses': {**surah_contents}
+                        }
+            file_name = f'{idx}-{unidecode(surah_name)}'
+            surah_base_contents = await self._surah_base_info(idx, source='`https://surahquran.com`')
+            surah_base_contents.update(full_surah)
+            if not manifest.skip_export(file_name, prefix=f'surah-{surahID}/'):
+                self._exporter(surah_base_contents, file_name=file_name, path='jsons/quran/surah-quran')
+            return full_surah
+
         async def _extract_all():
             surah_list = await self._surah_list()
-            all_surahs = OrderedDict()
-            for idx, (surahID, surah_name_) in tqdm(enumerate(surah_list.items(), start=1),
-                                                    total=len(surah_list), desc='Processing Surahs (SurahQuran)',
-                                                    unit='MB', colour='green'):
-                surah_name, surah_name_ar = surah_name_['name_complex'], surah_name_['surah_name_ar']
-                surah_contents = await _parse_langs(surahID=surahID)
-                if idx not in all_surahs:
-                    all_surahs[idx] = {}
-                all_surahs[idx] = {
-                                    'name_complex': surah_name,
-                                    'surah_name_ar': surah_name_ar,
-                                    'verses': {**surah_contents}
-                                    }
-                file_name = f'{idx}-{unidecode(surah_name)}'
-                surah_base_contents = await self._surah_base_info(idx, source='`https://surahquran.com`')
-                full_surah = all_surahs[idx]
-                surah_base_contents.update(full_surah)
-                self._exporter(surah_base_contents, file_name=file_name, path='jsons/quran/surah-quran')
+            surahs = await tqdm_asyncio.gather(*(_extract_surah(idx, surahID, surah_name_)
+                                                for idx, (surahID, surah_name_) in enumerate(surah_list.items(), start=1)),
+                                                total=len(surah_list), desc='Processing Surahs (SurahQuran)',
+                                                unit='MB', colour='green')
+            all_surahs = OrderedDict({idx: surah for idx, surah in enumerate(surahs, start=1)})
             return all_surahs
         
         if export:
@@ -355,6 +1063,7 @@ class QuranAPI(BaseAPI):
 
     async def altafsir_extract_surahs(self, export=False):
         altafsir_endpoint = 'ViewTranslations.asp?Display=yes&SoraNo={}&Ayah=0&toAyah=0&Language={}&LanguageID=2&TranslationBook={}'
+        manifest = self.get_manifest('altafsir')
         #** 'lang_author_ids': {language: [langID, translator(s)ID]}
         lang_author_ids = {
                         'albanian': [27, 19], 'azerbaijani': [24, 0], 'bosnian': [19, 0],
@@ -370,25 +1079,47 @@ class QuranAPI(BaseAPI):
                     }
         
         async def _get_lang_authors():
-            lang_authors = OrderedDict({})
             #**Same langIDs for all languages
-            for _, (lang, _) in enumerate(lang_author_ids.items()):
+            async def _get_authors(lang):
                 endpoint = altafsir_endpoint.format(1, lang_author_ids.get(lang)[0], lang_author_ids.get(lang)[1])
                 soup_ = await self._extract_contents(endpoint=endpoint, slash=True, url=self.url.altafsir, tag_='option')
                 soup = [i.text for i in soup_]
                 authors = soup[soup.index('Uzbek')+1:]
-                updated_authors = [0]if not authors else list(zip(authors, lang_author_ids.get(lang)[1:]))
-                lang_authors[lang] = updated_authors
+                return [0]if not authors else list(zip(authors, lang_author_ids.get(lang)[1:]))
+            all_authors = await asyncio.gather(*(_get_authors(lang) for lang in lang_author_ids))
+            lang_authors = OrderedDict(zip(lang_author_ids, all_authors))
             return lang_authors
         
+        async def _iframe_source(url):
+            #** Fast path: the iframe `src` of the static page is fetched with the shared HTTP client (cached, scheduled)
+            page = await self._request(url=url)
+            iframe = BeautifulSoup(page, 'html.parser').find('iframe', src=True) if isinstance(page, str) else None
+            if iframe is None:
+                return None
+            iframe_content = await self._request(url=urljoin(url, iframe['src']))
+            return iframe_content if isinstance(iframe_content, str) and iframe_content.strip() else None
+        
+        async def _browser_source(url):
+            #** Slow path: the iframe is rendered by a pooled headless browser
+            def _frame_source(driver, iframe_element):
+                driver.switch_to.frame(iframe_element)
+                return driver.page_source
+            async with self.get_driver_pool().driver() as driver:
+                await asyncio.to_thread(driver.get, url)
+                iframe_element = await self._get_element(driver, By.TAG_NAME, 'iframe')
+                return await asyncio.to_thread(_frame_source, driver, iframe_element)
+        
         async def _parse_verses(surahID, langID, authorID):
             endpoint = altafsir_endpoint.format(surahID, langID, authorID)
             url = f'{self.url.altafsir}/{endpoint}'
-            driver = self._get_driver()
-            driver.get(url)
-            iframe_element = await self._get_element(driver, By.TAG_NAME, 'iframe')
-            driver.switch_to.frame(iframe_element)
-            iframe_content = driver.page_source
+            try:
+                iframe_content = await _iframe_source(url)
+            except CRAWL_ERRORS:
+                #** 404, retries exhausted or circuit open on the fast path: the browser still renders the page
+                iframe_content = None
+            self.retry_stats['iframe_fast_path' if iframe_content is not None else 'iframe_browser'] += 1
+            if iframe_content is None:
+                iframe_content = await _browser_source(url)
             soup = BeautifulSoup(iframe_content, 'html.parser')
             old_contents = [i for i in ' '.join([i.text for i in soup]).split('\n') if i][1:]
             surah_rapidapi_info = await self._surah_base_info(surahID)
@@ -429,39 +1160,44 @@ class QuranAPI(BaseAPI):
         async def _parse_langs(**kwargs):
             lang_authors = await _get_lang_authors()
             all_contents = OrderedDict({'languages': {}})
-            for _, (lang, author_ids) in enumerate(lang_authors.items()):
-                lang_contents = {}
-                for idx_, authorIDs in enumerate(author_ids, start=1):
-                    author_name = None if authorIDs==0 else authorIDs[0]
-                    authorID = 0 if authorIDs==0 else authorIDs[1]
-                    langID = lang_author_ids.get(lang)[0]
-                    author_contents = {author_name: {}}
-                    author_lang_contents = await _parser(langID=langID, authorID=authorID, **kwargs)
-                    author_contents[author_name] = author_lang_contents
-                    lang_contents[idx_] = author_contents
-                all_contents['languages'][lang] = {'translators':lang_contents}
+            
+            async def _parse_author(lang, authorIDs):
+                author_name = None if authorIDs==0 else authorIDs[0]
+                authorID = 0 if authorIDs==0 else authorIDs[1]
+                langID = lang_author_ids.get(lang)[0]
+                #** Work unit: surah x translator
+                unit = f'surah-{kwargs.get("surahID")}/lang-{langID}/translator-{authorID}'
+                author_lang_contents = await manifest.run(unit, lambda: _parser(langID=langID, authorID=authorID, **kwargs))
+                return {author_name: author_lang_contents}
+            
+            units = [(lang, idx_, authorIDs) for lang, author_ids in lang_authors.items() for idx_, authorIDs in enumerate(author_ids, start=1)]
+            authors = await asyncio.gather(*(_parse_author(lang, authorIDs) for lang, _, authorIDs in units))
+            for (lang, idx_, _), author_contents in zip(units, authors):
+                all_contents['languages'].setdefault(lang, {'translators': {}})['translators'][idx_] = author_contents
             return all_contents
         
+        async def _extract_surah(idx, surah_id, surah_name_):
+            surah_name, surah_name_ar = surah_name_['name_complex'], surah_name_['surah_name_ar']
+            surah_contents = await _parse_langs(surahID=surah_id)
+            full_surah = {
+                        'name_complex': surah_name,
+                        'surah_name_ar': surah_name_ar,
+                        'verses': {**surah_contents}
+                        }
+            file_name = f'{idx}-{unidecode(surah_name)}'
+            surah_base_contents = await self._surah_base_info(idx, source='`https://altafsir.com`')
+            surah_base_contents.update(full_surah)
+            if not manifest.skip_export(file_name, prefix=f'surah-{surah_id}/'):
+                self._exporter(surah_base_contents, file_name=file_name, path='jsons/quran/altafsir')
+            return full_surah
+        
         async def _extract_all():
             surah_list = await self._surah_list()
-            all_surahs = OrderedDict()
-            for idx, (surah_id, surah_name_) in tqdm(enumerate(surah_list.items(), start=1),
-                                                    total=len(surah_list), desc='Processing Surahs (Altafsir)',
-                                                    unit='MB', colour='green'):
-                surah_name, surah_name_ar = surah_name_['name_complex'], surah_name_['surah_name_ar']
-                surah_contents = await _parse_langs(surahID=surah_id)
-                if idx not in all_surahs:
-                    all_surahs[idx] = {}
-                all_surahs[idx] = {
-                                    'name_complex': surah_name,
-                                    'surah_name_ar': surah_name_ar,
-                                    'verses': {**surah_contents}
-                                    }
-                file_name = f'{idx}-{unidecode(surah_name)}'
-                surah_base_contents = await self._surah_base_info(idx, source='`https://altafsir.com`')
-                full_surah = all_surahs[idx]
-                surah_base_contents.update(full_surah)
-                self._exporter(surah_base_contents, file_name=file_name, path='jsons/quran/altafsir')
+            surahs = await tqdm_asyncio.gather(*(_extract_surah(idx, surah_id, surah_name_)
+                                                for idx, (surah_id, surah_name_) in enumerate(surah_list.items(), start=1)),
+                                                total=len(surah_list), desc='Processing Surahs (Altafsir)',
+                                                unit='MB', colour='green')
+            all_surahs = OrderedDict({idx: surah for idx, surah in enumerate(surahs, start=1)})
             return all_surahs
         if export:
             return await self._merge_all('all-surahs-altafsir', 'altafsir')
@@ -505,33 +1241,35 @@ class QuranAPI(BaseAPI):
             verse_count = await _get_surah_verses(surahID)
             return len(verse_count)
 
+        async def _parse_surah(surahID, surah_name):
+            verse_count, surah_verses = await asyncio.gather(
+                                        _get_verse_count(surahID),
+                                        _get_surah_verses(surahID))
+            verse_descrs = await asyncio.gather(*(_get_descr(ayaID, surahID) for ayaID, _ in enumerate(surah_verses, start=1)))
+            all_verse_info = []
+
+            for ayaID, (verse, verse_descr) in enumerate(zip(surah_verses, verse_descrs), start=1):
+                verse_info = OrderedDict({'verse-id': '', 'verse': '', 'description': ''})
+                id_ = f'[{surahID}:{ayaID}]'
+                verse_info['verse-id'] = id_
+                verse_info['verse'] = verse
+                verse_info['description'] = verse_descr
+                all_verse_info.append(verse_info.copy())
+
+            surah = {
+                'name': surah_name,
+                'id': surahID,
+                'verse-count': verse_count,
+                'verse-info': all_verse_info
+            }
+            self._exporter(surah, file_name=f'{surahID}-{surah_name}', path='jsons/quran/verse-meanings')
+            return surah
+
         async def _parse_all():
             surah_dict = await _get_surah_dict()
-            all_surah_contents = OrderedDict()
-
-            for surahID, surah_name in tqdm(surah_dict.items(), desc='Processing Surah Meanings', colour='green', unit='MB'):
-                verse_count, surah_verses = await asyncio.gather(
-                                            _get_verse_count(surahID),
-                                            _get_surah_verses(surahID))
-                all_verse_info = []
-
-                for ayaID, verse in enumerate(surah_verses, start=1):
-                    verse_info = OrderedDict({'verse-id': '', 'verse': '', 'description': ''})
-                    verse_descr = await _get_descr(ayaID, surahID)
-                    id_ = f'[{surahID}:{ayaID}]'
-                    verse_info['verse-id'] = id_
-                    verse_info['verse'] = verse
-                    verse_info['description'] = verse_descr
-                    all_verse_info.append(verse_info.copy())
-
-                all_surah_contents[surahID] = {
-                    'name': surah_name,
-                    'id': surahID,
-                    'verse-count': verse_count,
-                    'verse-info': all_verse_info
-                }
-                surah = all_surah_contents[surahID]
-                self._exporter(surah, file_name=f'{surahID}-{surah_name}', path='jsons/quran/verse-meanings')
+            surahs = await tqdm_asyncio.gather(*(_parse_surah(surahID, surah_name) for surahID, surah_name in surah_dict.items()),
+                                                desc='Processing Surah Meanings', colour='green', unit='MB')
+            all_surah_contents = OrderedDict(zip(surah_dict, surahs))
             return all_surah_contents
         if export:
             return await self._merge_all('all-surah-meanings', 'verse-meanings')
@@ -683,6 +1421,65 @@ class QuranAPI(BaseAPI):
             return await self._merge_all('all-duas', 'duas')
         return ramadan_duas
 
+class HadithEditionCache:
+    '''
+    ### Note:
+        >>> English hadith editions (hadith_api_links.json) for the HadithAPI English fallback text.
+            Each edition is downloaded once, indexed by hadithnumber and persisted to
+            islamic_data/hadith_editions/<edition>.json, so lookups are O(1) dict accesses across runs.
+        >>> Concurrent lookups of the same edition wait for a single download (one lock per edition).
+    '''
+    def __init__(self, api, path):
+        self.api = api
+        self.path = Path(path)
+        self.stats = Counter()
+        self._links = None
+        self._editions = {}
+        self._indexes = {}
+        self._locks = {}
+    
+    @property
+    def links(self):
+        if self._links is None:
+            self._links = load(path='jsons', file_name='hadith_api_links')
+        return self._links
+    
+    def edition(self, book_name):
+        if book_name not in self._editions:
+            self._editions[book_name] = self.api.best_match(book_name, values_=self.links.keys())[0]
+        return self._editions[book_name]
+    
+    @staticmethod
+    def _number(hadithnumber):
+        #** 12 and 12.0 are the same key, 12.3 (sub-numbered hadiths) is kept as is
+        return str(int(float(hadithnumber))) if float(hadithnumber).is_integer() else str(hadithnumber)
+    
+    async def index(self, edition):
+        if edition in self._indexes:
+            return self._indexes[edition]
+        async with self._locks.setdefault(edition, asyncio.Lock()):
+            if edition in self._indexes:
+                return self._indexes[edition]
+            index_path = self.path / f'{edition}.json'
+            if index_path.is_file():
+                index = json.loads(index_path.read_text(encoding='utf-8'))
+                self.stats['loaded'] += 1
+            else:
+                book = await self.api._request(url=self.links[edition])
+                hadiths = book.get('hadiths', []) if isinstance(book, dict) else []
+                index = {self._number(hadith['hadithnumber']): hadith.get('text', '') for hadith in hadiths}
+                self.stats['downloaded'] += 1
+                if index:
+                    self.path.mkdir(parents=True, exist_ok=True)
+                    index_path.write_text(json.dumps(index, ensure_ascii=False), encoding='utf-8')
+            self._indexes[edition] = index
+            return index
+    
+    async def text(self, book_name, hadithnumber):
+        index = await self.index(self.edition(book_name))
+        self.stats['lookups'] += 1
+        return index.get(self._number(hadithnumber), '')
+
 class HadithAPI(BaseAPI):
     def __init__(self):
         super().__init__()
@@ -690,6 +1487,8 @@ class HadithAPI(BaseAPI):
     async def extract_all_hadiths(self, export=False):
         mp_url, mp_endpoint = self.url.urdu_point, 'islam'
         full_endpoint = '{}/hadees-{}/{}'
+        manifest = self.get_manifest('hadiths')
+        editions = HadithEditionCache(self, self.path / 'hadith_editions')
         main_page = await self._extract_contents(url=mp_url, endpoint=mp_endpoint, slash=True)
         
         async def _get_hadith_mp():
@@ -740,10 +1539,11 @@ class HadithAPI(BaseAPI):
                         chap_endpoints.append(i)
                 chap_names_endpoints = [(*i,j) for i,j in zip(book_chap_names, chap_endpoints)]
                 all_book_chaps = OrderedDict()
-                for idx, i in enumerate(chap_names_endpoints, start=1):
+                chap_htmls = await asyncio.gather(*(self._extract_contents(url=mp_url, slash=True,
+                                                                            endpoint=full_endpoint.format(mp_endpoint, 'chapters', chap_endpoint))
+                                                    for *_, chap_endpoint in chap_names_endpoints))
+                for idx, (i, chap_html) in enumerate(zip(chap_names_endpoints, chap_htmls), start=1):
                     chap_ar, chap_en, chap_endpoint = i
-                    endpoint = full_endpoint.format(mp_endpoint, 'chapters', chap_endpoint)
-                    chap_html = await self._extract_contents(url=mp_url, endpoint=endpoint, slash=True)
                     hadees_hrefs = ['/'.join(i['href'].split('/')[-2:]) for i in chap_html.find_all(class_='fr full hadith_item')]
                     chap_table = _get_chap_table(chap_html)
                     chap_name = chap_table.pop('Chapter Name')
@@ -775,13 +1575,8 @@ class HadithAPI(BaseAPI):
                 return hadees_num
             
             async def _get_en_text(hadithID):
-                await asyncio.sleep(1)
                 book_name = ''.join(Path(hadees_endpoint).parts[-2].split('-')[1:])
-                api_links = load(path='jsons', file_name='hadith_api_links')
-                right_name = self.best_match(book_name, values_=api_links.keys())[0]
-                book_html = await self._request(url=api_links[right_name])
-                text_hadiths = OrderedDict({hadith_no: hadith for hadith_no, hadith in zip(nested('hadithnumber', book_html), nested('text', book_html))})
-                return text_hadiths.get(hadithID, '')
+                return await editions.text(book_name, hadithID)
             
             async def _get_chap_translations():
                 async def _get_translations():
@@ -818,26 +1613,15 @@ class HadithAPI(BaseAPI):
                 })
                 return endpoints
             
-            async def _executor(h_endpoints):
-                await asyncio.sleep(1)
-                _endpoints = OrderedDict()
-                for idx, (_idx, endpoints) in enumerate(h_endpoints.items(), start=1):
-                    e_endpoints = OrderedDict()
-                    for endpoint_idx, endpoint in enumerate(endpoints, start=1):
-                        if endpoint_idx not in e_endpoints:
-                            e_endpoints[endpoint_idx] = OrderedDict()
-                        e_endpoints[endpoint_idx] = (await _parse_hadees(endpoint))
-                    
-                    if idx not in _endpoints:
-                        _endpoints[idx] = OrderedDict()
-                    _endpoints[idx] = e_endpoints
-                
-                return _endpoints
+            async def _parse_chapter(endpoints):
+                #** Work unit: hadith endpoint
+                hadithes = await asyncio.gather(*(manifest.run(endpoint, lambda endpoint=endpoint: _parse_hadees(endpoint)) for endpoint in endpoints))
+                return OrderedDict({endpoint_idx: hadees for endpoint_idx, hadees in enumerate(hadithes, start=1)})
 
             async def _execute_hadees(endpoints):
-                async with asyncio.Semaphore(value=10):
-                    parsed_endpoints = asyncio.ensure_future(_executor(endpoints))
-                hadees = (await asyncio.gather(*[parsed_endpoints]))[0]
+                #** Concurrency/politeness is enforced by the CrawlScheduler of _request
+                chapters = await asyncio.gather(*(_parse_chapter(endpoints_) for endpoints_ in endpoints.values()))
+                hadees = OrderedDict({idx: chapter for idx, chapter in enumerate(chapters, start=1)})
                 return hadees
 
             hadith_endpoints = _unpack_endpoints()
@@ -851,7 +1635,7 @@ class HadithAPI(BaseAPI):
                 for chapter in chapters:
                     parsed_book['Chapters'][chap_key][chapter].update({'Hadiths': parsed_hadithes.get(chap_idx)})
             
-            if export:
+            if export and not manifest.skip_export(book_name, units=chain.from_iterable(hadith_endpoints.values())):
                 return self._exporter(parsed_book, file_name=book_name, path='jsons/hadiths')
             return parsed_book
         
@@ -892,15 +1676,14 @@ class HadithAPI(BaseAPI):
             async def _executor():
                 all_chapters = _get_chaps()
                 parsed_chapters = OrderedDict()
-                async with asyncio.Semaphore(value=20):
-                    for chapID, chapters in all_chapters.items():
-                        key = f'Chapter-{chapID}'
-                        chap_names = {name: chapters.pop(name) for name in ('Chapter-en', 'Chapter-ar')}
-                        chap_contents, len_hadees = await _parse_chap(chapID)
-                        contents = OrderedDict({**chap_names,
-                                                'Total Hadith': len_hadees,
-                                                **chap_contents})
-                        parsed_chapters[key] = {chap_names['Chapter-en']: contents}
+                all_contents = await asyncio.gather(*(_parse_chap(chapID) for chapID in all_chapters))
+                for (chapID, chapters), (chap_contents, len_hadees) in zip(all_chapters.items(), all_contents):
+                    key = f'Chapter-{chapID}'
+                    chap_names = {name: chapters.pop(name) for name in ('Chapter-en', 'Chapter-ar')}
+                    contents = OrderedDict({**chap_names,
+                                            'Total Hadith': len_hadees,
+                                            **chap_contents})
+                    parsed_chapters[key] = {chap_names['Chapter-en']: contents}
                 return parsed_chapters
             
             async def _structure_malik_book():
@@ -936,8 +1719,7 @@ class HadithAPI(BaseAPI):
             main_page = await _get_hadith_mp()
             total = len(main_page)+1
             print(f'Parsing {total} Hadith Books')
-            async with asyncio.Semaphore(value=15):
-                await asyncio.gather(*(asyncio.ensure_future(_structure_book(*book)) for book in main_page), extract_book_malik())
+            await asyncio.gather(*(_structure_book(*book) for book in main_page), extract_book_malik())
             return f'All {total} Hadith Books parsed and cleaned successfully'
         return await _parse_books()
 
@@ -2139,8 +2921,10 @@ class IslamPillars(BaseAPI):
             return self._exporter(all_pillars, file_name='pillars-of-islam2', path='jsons/pillars')
         return all_pillars
 
-async def main():
+async def main(fresh=False):
+    '''fresh: ignores (and resets) the checkpointed work units of every extractor'''
     # tracemalloc.start()
+    BaseAPI.fresh_manifests = fresh
 
     # a = QuranAPI()
     # b = HadithAPI()
@@ -2153,9 +2937,18 @@ async def main():
     # i = ArabicAPI()
     # j = IslamPillars()
     
+    async def isolated(task):
+        #** One extractor giving up does not cancel the others (TaskGroup cancels every sibling on an error)
+        try:
+            return await task
+        except CRAWL_ERRORS as error:
+            print(f'\033[1;31m{task.__qualname__} gave up: {type(error).__name__}: {error}\033[0m')
+            return error
+    
     async def run_all(default):
         async with asyncio.TaskGroup() as tg:
-            tasks = [tg.create_task(task) for task in [
+            #** Each extractor is its own CrawlScheduler lane (fair sharing of the global concurrency cap)
+            tasks = [tg.create_task(CrawlScheduler.in_lane(isolated(task), task.__qualname__)) for task in [
                     # d.extract_qibla_data(default),
                     # a.surahquran_extract_surahs(default),
                     # a.altafsir_extract_surahs(default),
@@ -2191,7 +2984,14 @@ async def main():
     # except Exception as e:
     #     traceback = tracemalloc.get_object_traceback(e)
     #     print(traceback)
-    results = await run_all(True)
+    try:
+        results = await run_all(True)
+    finally:
+        print(f'Crawl report: {BaseAPI.crawl_report()}')
+        await asyncio.gather(BaseAPI.close_session(), BaseAPI.close_drivers())
+        if BaseAPI._http_cache is not None:
+            BaseAPI._http_cache.close()
+            BaseAPI._http_cache = None
     end = time()
     pprint(results)
     timer = (end-start)
@@ -2199,8 +2999,11 @@ async def main():
     print(f"Execution Time: {minutes:.0f} minutes and {seconds:.5f} seconds")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Islamic data extractors')
+    parser.add_argument('--fresh', action='store_true', help='Reset the work manifests and crawl every unit again')
+    args = parser.parse_args()
     try:
-        asyncio.run(main())
+        asyncio.run(main(fresh=args.fresh))
     except KeyboardInterrupt:
         print('Terminated')
 
@@ -1,6 +1,13 @@
 import re
+import json
+import argparse
+import sqlite3
+import hashlib
+import threading
 from os import environ
-from functools import lru_cache
+from pathlib import Path
+from typing import (Dict, Tuple)
+from collections import OrderedDict
 import logging
 logging.getLogger('tensorflow').setLevel(logging.ERROR)
 environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
@@ -10,19 +17,34 @@ from tensorflow.keras import Sequential #type: ignore
 from tensorflow.keras.layers import Embedding, Dense # type: ignore
 from tensorflow.keras.layers.experimental.preprocessing import TextVectorization # type: ignore
 from nltk.sentiment import SentimentIntensityAnalyzer
-from blueprints.data_loader import (STOPWORDS, CSVS)
+from blueprints.data_loader import (MAIN_DIR, DataLoader, NLTKLoader, QuranStore)
+from nested_lookup import nested_lookup as nested
 from pydantic import BaseModel, ValidationError
 
 
 intensity_analyzer = SentimentIntensityAnalyzer()
+#^ Corpus-fitted TextVectorization (config + vocabulary)
+VECTORIZER_DIR = MAIN_DIR / 'models' / 'vectorizer'
+#^ Local MarianMT models (opus-mt-<src>-<tgt>) and the translation cache
+TRANSLATION_DIR = MAIN_DIR / 'models' / 'translation'
 
 class TextProcessor:
     class Validator(BaseModel):
         string: str
     
     def __init__(self, text, **kwargs):
+        '''
+        kwargs:
+            - lang: NLTK language name used for stopword filtering (all languages if None).
+              Defaults to the language the corpus vectorizer was fitted on when it is used.
+            - corpus: Uses the corpus-fitted vectorizer when available (default True).
+              TextVectorization kwargs (max_tokens, ...) fit a new vectorizer on `text` instead.
+        '''
         self.kwargs = kwargs
-        self.text = self._filter_stopwords(text)
+        self._corpus = kwargs.get('corpus', True) and CorpusVectorizer.exists() and \
+                        not any(arg in kwargs for arg in ('max_tokens', 'ngrams', 'output_mode', 'output_sequence_length'))
+        self.lang = kwargs.get('lang', CorpusVectorizer.config().get('lang') if self._corpus else None)
+        self.text = self._filter_stopwords(text, self.lang)
         self._vectorizer = self._get_vector()
         self.vectorized_sequences = self._get_vect_sequences()
         self.polarity = self._get_polarity(text)
@@ -33,23 +55,48 @@ class TextProcessor:
         except ValidationError: return ''.join(t)
     
     def _get_vector(self):
+        if self._corpus:
+            return CorpusVectorizer.load()
         default_values = (100, None, 'int', 100, None)
         default_args = ('max_tokens', 'ngrams', 'output_mode', 'output_sequence_length')
         new_kwargs = {arg: self.kwargs.get(arg, value) for arg, value in zip(default_args, default_values)}
         return TextVectorization(**new_kwargs)
     
     @staticmethod
-    def _filter_stopwords(text):
+    def _tokenize(text):
         org_text = TextProcessor._validate_str(t=text)
         fix_text = org_text.translate(str.maketrans('','','\t\n'))
         sep = '-' if re.match(r'^\S*$', org_text) else ' '
-        updated_text = tf.strings.split([fix_text], sep=sep).numpy().tolist()[0]
-        stopwords_contents = [getattr(STOPWORDS, i) for i in vars(STOPWORDS).keys() if re.match(r'^[a-z].*[a-z]$', i)]
-        flattened_stopwords = tf.concat(stopwords_contents, axis=0)
-        return [i for i in updated_text if tf.strings.lower(i) not in flattened_stopwords]
+        return fix_text.split(sep)
+    
+    @staticmethod
+    def _filter_stopwords(text, lang=None):
+        '''lang: NLTK language name (e.g 'english') to filter only that language, all languages if None'''
+        stopwords = NLTKLoader.get_stopwords(lang)
+        return [i for i in TextProcessor._tokenize(text) if i.lower() not in stopwords]
+    
+    @staticmethod
+    def filter_stopwords_batch(texts, lang=None):
+        '''
+        Filters stopwords of a whole batch of texts at once.
+        The stopword set (hashed frozenset) is built once per language and cached by NLTKLoader.
+        
+        Returns:
+            >>> tf.RaggedTensor of shape [len(texts), None] holding the kept tokens of each text
+                (tf.string even for an empty batch or texts filtered to nothing).
+        '''
+        texts = list(texts)
+        if not texts:
+            return tf.RaggedTensor.from_row_lengths(tf.constant([], dtype=tf.string), tf.constant([], dtype=tf.int64))
+        stopwords = NLTKLoader.get_stopwords(lang)
+        tokens = [[i for i in TextProcessor._tokenize(text) if i.lower() not in stopwords] for text in texts]
+        #** Flat values + row lengths: no dtype/shape inference from the (possibly all empty) nested lists
+        return tf.RaggedTensor.from_row_lengths(tf.constant([i for row in tokens for i in row], dtype=tf.string),
+                                                tf.constant([len(row) for row in tokens], dtype=tf.int64))
 
     def _get_vect_sequences(self):
-        self._vectorizer.adapt(self.text)
+        if not self._corpus:
+            self._vectorizer.adapt(self.text)
         return tf.constant(self._vectorizer(self.text))
     
     @staticmethod
@@ -69,25 +116,191 @@ class TextProcessor:
         return {word: index for word, index in zip(self.get_vocabulary(), range(0, len(self.get_vocabulary()) + 1))}
     
     @classmethod
-    @lru_cache(maxsize=1)
-    def _translate_text(cls, *args):
-        from transformers import MarianConfig, MarianMTModel, MarianTokenizer, pipeline
+    def translate(cls, *args):
+        '''
+        args: text (str or list of str), src_lang, tgt_lang
+        Returns the translated str (or list of str for a batch of texts).
+        '''
         text, src_lang, tgt_lang = args
-        model_name = f'Helsinki-NLP/opus-mt-{src_lang}-{tgt_lang}'
-        config = MarianConfig.from_pretrained(model_name, revision="main")
-        model = MarianMTModel.from_pretrained(model_name, config=config)
-        tokenizer = MarianTokenizer.from_pretrained(model_name, config=config)
-        translation = pipeline("translation", model=model, tokenizer=tokenizer)
-        translated_text = translation(text, max_length=512, return_text=True)[0]
-        return translated_text.get('translation_text')
+        texts = [text] if isinstance(text, str) else list(text)
+        translations = translation_registry.translate(texts, src_lang, tgt_lang)
+        return translations[0] if isinstance(text, str) else translations
 
+class TranslationRegistry:
+    '''
+    ### Note:
+        >>> The TranslationRegistry class keeps loaded translation pipelines per language pair and
+            serves repeated translations from an on-disk cache.
+
+    - Pipelines are kept in an LRU bounded by the parameter bytes of their models (`max_bytes`).
+    - Models are loaded from `model_dir/opus-mt-<src>-<tgt>` when present (see `save_model`),
+      otherwise from the Helsinki-NLP hub name.
+    - Finished translations are stored in SQLite keyed by sha256(src, tgt, text).
+    '''
+    def __init__(self, max_bytes=2 * 1024**3, model_dir=TRANSLATION_DIR, cache_path=None, batch_size=16):
+        self.max_bytes = max_bytes
+        self.model_dir = model_dir
+        self.cache_path = cache_path or model_dir / 'translations.sqlite3'
+        self.batch_size = batch_size
+        self._pipelines = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = None
+    
+    @staticmethod
+    def _model_name(src_lang, tgt_lang):
+        return f'opus-mt-{src_lang}-{tgt_lang}'
+    
+    def _model_path(self, src_lang, tgt_lang):
+        local_path = self.model_dir / self._model_name(src_lang, tgt_lang)
+        return str(local_path) if local_path.is_dir() else f'Helsinki-NLP/{self._model_name(src_lang, tgt_lang)}'
+    
+    def save_model(self, src_lang, tgt_lang):
+        '''Downloads a model once into `model_dir` so later loads never hit the hub'''
+        from transformers import MarianMTModel, MarianTokenizer
+        model_name = f'Helsinki-NLP/{self._model_name(src_lang, tgt_lang)}'
+        local_path = self.model_dir / self._model_name(src_lang, tgt_lang)
+        MarianMTModel.from_pretrained(model_name).save_pretrained(local_path)
+        MarianTokenizer.from_pretrained(model_name).save_pretrained(local_path)
+        return local_path
+    
+    @staticmethod
+    def _model_bytes(model):
+        return sum(param.numel() * param.element_size() for param in model.parameters())
+    
+    def get_pipeline(self, src_lang, tgt_lang):
+        key = (src_lang, tgt_lang)
+        with self._lock:
+            if key in self._pipelines:
+                self._pipelines.move_to_end(key)
+                return self._pipelines[key][0]
+            from transformers import MarianConfig, MarianMTModel, MarianTokenizer, pipeline
+            model_path = self._model_path(src_lang, tgt_lang)
+            config = MarianConfig.from_pretrained(model_path, revision="main")
+            model = MarianMTModel.from_pretrained(model_path, config=config)
+            tokenizer = MarianTokenizer.from_pretrained(model_path, config=config)
+            translation = pipeline("translation", model=model, tokenizer=tokenizer)
+            self._pipelines[key] = (translation, self._model_bytes(model))
+            #** Evicts least recently used pipelines (the requested one is always kept)
+            while len(self._pipelines) > 1 and sum(size for _, size in self._pipelines.values()) > self.max_bytes:
+                self._pipelines.popitem(last=False)
+            return translation
+    
+    @property
+    def db(self):
+        if self._db is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.cache_path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, translation TEXT NOT NULL)')
+        return self._db
+    
+    @staticmethod
+    def _key(text, src_lang, tgt_lang):
+        return hashlib.sha256(f'{src_lang}\0{tgt_lang}\0{text}'.encode('utf-8')).hexdigest()
+    
+    def translate(self, texts, src_lang, tgt_lang):
+        '''Translates a batch of texts; only texts missing from the cache reach the model'''
+        keys = [self._key(text, src_lang, tgt_lang) for text in texts]
+        with self._lock:
+            cached = {}
+            for idx in range(0, len(keys), 500):
+                chunk = keys[idx:idx+500]
+                rows = self.db.execute(f'SELECT key, translation FROM translations WHERE key IN ({",".join("?"*len(chunk))})', chunk)
+                cached.update(rows.fetchall())
+        missing = list(OrderedDict.fromkeys(text for text, key in zip(texts, keys) if key not in cached))
+        if missing:
+            translation = self.get_pipeline(src_lang, tgt_lang)
+            outputs = translation(missing, max_length=512, batch_size=self.batch_size)
+            new_rows = [(self._key(text, src_lang, tgt_lang), output.get('translation_text')) for text, output in zip(missing, outputs)]
+            with self._lock:
+                self.db.executemany('INSERT OR REPLACE INTO translations (key, translation) VALUES (?, ?)', new_rows)
+                self.db.commit()
+            cached.update(new_rows)
+        return [cached[key] for key in keys]
+
+translation_registry = TranslationRegistry()
+
+class CorpusVectorizer:
+    '''
+    ### Note:
+        >>> The CorpusVectorizer class fits a single TextVectorization over the whole verse/hadith corpus,
+            saves its config and vocabulary under islamic_data/models/vectorizer and loads it (once per process)
+            so every request shares the same vocabulary and word_index.
+        >>> The corpus is filtered with the same stopword set as TextProcessor (every NLTK language unless `lang` is given),
+            and the fitted `lang` is saved in config.json so inference filters with it too.
+
+    E.g
+        - CorpusVectorizer.fit()               #** Once (offline): `python ai_model.py --fit-vectorizer`
+        - process_texts(['...', '...'])        #** Inference
+    '''
+    #^ {path: (TextVectorization, config)} of every loaded vectorizer directory
+    _loaded: Dict[Path, Tuple[TextVectorization, Dict]] = {}
+    DEFAULTS = {'max_tokens': 20000, 'output_mode': 'int', 'output_sequence_length': 100}
+    
+    @staticmethod
+    def corpus(lang=None):
+        '''English verses (surah-quran) and hadiths with stopwords of `lang` (all languages if None) removed'''
+        store = QuranStore.get('surah-quran')
+        if 'English' in store:
+            verses = [store.verse('English', surahID, ayah) for surahID in range(1, 115) for ayah in range(1, store.verse_count(surahID)+1)]
+        else:
+            surahs = DataLoader(folder_path='jsons/quran/surah-quran')
+            verses = [verse for _, path in surahs.get_files.items() for verse in nested('English', surahs._read_file(path))[0].values()]
+        hadith_books = DataLoader(folder_path='jsons/hadiths')
+        hadiths = [hadith for _, path in hadith_books.get_files.items() for hadith in nested('english', hadith_books._read_file(path))]
+        texts = [i for i in verses + hadiths if isinstance(i, str) and i.strip()]
+        return tf.strings.reduce_join(TextProcessor.filter_stopwords_batch(texts, lang), axis=1, separator=' ')
+    
     @classmethod
-    def translate(cls, *args):
-        return cls._translate_text(*args)
+    def exists(cls, path=VECTORIZER_DIR):
+        return (path / 'config.json').is_file() and (path / 'vocabulary.txt').is_file()
+    
+    @classmethod
+    def fit(cls, path=VECTORIZER_DIR, lang=None, **kwargs):
+        config = {**cls.DEFAULTS, **kwargs}
+        texts = cls.corpus(lang)
+        vectorizer = TextVectorization(**config)
+        vectorizer.adapt(tf.data.Dataset.from_tensor_slices(texts).batch(512))
+        vocabulary = vectorizer.get_vocabulary(include_special_tokens=False)
+        path.mkdir(parents=True, exist_ok=True)
+        with open(path / 'vocabulary.txt', mode='w', encoding='utf-8') as file:
+            file.write('\n'.join(vocabulary))
+        with open(path / 'config.json', mode='w', encoding='utf-8') as file:
+            json.dump({**config, 'lang': lang, 'corpus_size': int(texts.shape[0]), 'vocabulary_size': len(vocabulary)}, file, indent=4)
+        cls._loaded.pop(Path(path), None)
+        print(f'\033[1;32mFitted vectorizer on {texts.shape[0]} texts ({len(vocabulary)} tokens) into {path}\033[0m')
+        return cls.load(path)
     
+    @classmethod
+    def _load(cls, path=VECTORIZER_DIR):
+        path = Path(path)
+        if path not in cls._loaded:
+            with open(path / 'config.json', encoding='utf-8') as file:
+                config = json.load(file)
+            with open(path / 'vocabulary.txt', encoding='utf-8') as file:
+                vocabulary = file.read().splitlines()
+            vectorizer = TextVectorization(**{k: v for k, v in config.items() if k in cls.DEFAULTS}, vocabulary=vocabulary)
+            cls._loaded[path] = (vectorizer, config)
+        return cls._loaded[path]
+    
+    @classmethod
+    def load(cls, path=VECTORIZER_DIR):
+        return cls._load(path)[0]
+    
+    @classmethod
+    def config(cls, path=VECTORIZER_DIR):
+        return cls._load(path)[1]
+
 def process_text(text, **kwargs):
     return TextProcessor(text, **kwargs)
 
+def process_texts(texts, lang=None):
+    '''
+    Vectorizes many texts in one call with the corpus-fitted vectorizer -> [len(texts), output_sequence_length]
+    Stopwords are filtered with the language the vectorizer was fitted on (all languages if None) unless `lang` is given.
+    '''
+    filtered = TextProcessor.filter_stopwords_batch(texts, lang or CorpusVectorizer.config().get('lang'))
+    return CorpusVectorizer.load()(tf.strings.reduce_join(filtered, axis=1, separator=' '))
+
 # test1 = load(path='jsons/quran/altafsir', file_name='1-Al-Fatihah')['text']
 # lst = list(test2.values())[0]
 # tf_tokenizer = process_text([test1[0]], max_tokens=100)
@@ -108,3 +321,13 @@ def process_text(text, **kwargs):
     
 #     Embedded Sequences: {embedded_sequences}
 #     ''')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Offline model artifacts')
+    parser.add_argument('--fit-vectorizer', action='store_true', help=f'Fit the corpus TextVectorization into {VECTORIZER_DIR}')
+    parser.add_argument('--lang', default=None, help='NLTK stopword language of the corpus (every language if omitted)')
+    parser.add_argument('--max-tokens', type=int, default=CorpusVectorizer.DEFAULTS['max_tokens'])
+    parser.add_argument('--output-sequence-length', type=int, default=CorpusVectorizer.DEFAULTS['output_sequence_length'])
+    args = parser.parse_args()
+    if args.fit_vectorizer:
+        CorpusVectorizer.fit(lang=args.lang, max_tokens=args.max_tokens, output_sequence_length=args.output_sequence_length)
@@ -0,0 +1,70 @@
+'''
+Crawl throughput (requests/sec) of BaseAPI._request against a local stand-in server.
+Compares the previous per-request ClientSession (force_close, DNS cache discarded) with the pooled keep-alive session.
+
+Usage:
+    python -m benchmarks.bench_crawl --requests 2000 --concurrency 32 --size 20000
+'''
+import os
+import asyncio
+import argparse
+from time import perf_counter
+from aiohttp import (ClientSession, TCPConnector, web)
+from ai_data import BaseAPI
+
+def stand_in_server(size):
+    page = '<html><body>{}</body></html>'.format('<p>verse</p>' * (size // 12))
+    async def handler(request):
+        return web.Response(text=page, content_type='text/html')
+    app = web.Application()
+    app.router.add_get('/surah/{surahID}', handler)
+    return app
+
+async def legacy_request(url):
+    #** BaseAPI._request before the pooled session: new session + connector for every GET
+    async with ClientSession(connector=TCPConnector(ssl=False, enable_cleanup_closed=True,
+                                                    force_close=True, ttl_dns_cache=300),
+                                                    raise_for_status=True) as session:
+        async with session.get(url) as response:
+            return await response.text()
+
+async def crawl(fetch, url, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    async def bound(i):
+        async with semaphore:
+            return await fetch(f'{url}/surah/{i % 114 + 1}')
+    start = perf_counter()
+    pages = await asyncio.gather(*(bound(i) for i in range(total)))
+    elapsed = perf_counter() - start
+    assert all(pages)
+    return round(total / elapsed, 2)
+
+async def run(total=2000, concurrency=32, size=20000):
+    runner = web.AppRunner(stand_in_server(size))
+    await runner.setup()
+    site = web.TCPSite(runner, 'localhost', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    url = f'http://localhost:{port}'
+    api = BaseAPI()
+    #** Network cost only: no on-disk HTTP cache and no politeness limits towards the stand-in server
+    os.environ['ISLAMAI_HTTP_CACHE'] = 'off'
+    BaseAPI.scheduler_options = {**BaseAPI.scheduler_options, 'max_concurrency': concurrency, 'rate': 1e9, 'burst': total}
+    try:
+        legacy = await crawl(legacy_request, url, total, concurrency)
+        pooled = await crawl(lambda endpoint: api._request(url=endpoint), url, total, concurrency)
+    finally:
+        await BaseAPI.close_session()
+        await runner.cleanup()
+    return {'requests': total, 'concurrency': concurrency, 'page_bytes': size,
+            'legacy_requests_per_sec': legacy, 'pooled_requests_per_sec': pooled,
+            'speedup': round(pooled / legacy, 2)}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pooled session crawl benchmark')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--size', type=int, default=20000, help='Page size in bytes')
+    args = parser.parse_args()
+    for key, value in asyncio.run(run(args.requests, args.concurrency, args.size)).items():
+        print(f'{key:<28} {value}')
@@ -0,0 +1,48 @@
+'''
+Per-request key lookup latency (µs): nested_lookup walks vs PathIndex direct accesses.
+Mirrors the quran_blueprint lookups (`verses` of a surah, a key under one translator).
+
+Usage:
+    python -m benchmarks.bench_path_index --requests 1000 --surah 36-Ya-Sin
+'''
+import argparse
+from time import perf_counter
+from nested_lookup import nested_lookup as nested
+from blueprints.data_loader import (DataLoader, PathIndex)
+
+def get_surah(name):
+    surahs = DataLoader(folder_path='jsons/quran/surah-quran')
+    return surahs._read_file(surahs.get(f'{name}.json'))
+
+def timeit(func, total):
+    start = perf_counter()
+    for _ in range(total):
+        func()
+    return (perf_counter() - start) / total * 1e6
+
+def run(total=1000, surah_name='36-Ya-Sin'):
+    surah = get_surah(surah_name)
+    start = perf_counter()
+    paths = PathIndex(surah)
+    build = perf_counter() - start
+
+    lookups = {'verses': (lambda: nested('verses', surah)[0],
+                        lambda: paths.first('verses')),
+            'under': (lambda: nested('verse 36:1', nested('English', surah)[0]),
+                        lambda: paths.get('verse 36:1', under='English'))}
+    results = {'surah': surah_name, 'requests': total, 'index_build_ms': round(build * 1e3, 3)}
+    for name, (legacy, indexed) in lookups.items():
+        assert legacy() == indexed()
+        legacy_us, indexed_us = timeit(legacy, total), timeit(indexed, total)
+        results[f'{name}_nested_us'] = round(legacy_us, 2)
+        results[f'{name}_path_index_us'] = round(indexed_us, 2)
+        results[f'{name}_speedup'] = round(legacy_us / indexed_us, 2)
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Path index lookup benchmark')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--surah', default='36-Ya-Sin')
+    args = parser.parse_args()
+    for key, value in run(args.requests, args.surah).items():
+        print(f'{key:<24} {value}')
@@ -0,0 +1,54 @@
+'''
+Stopword filtering throughput (tokens/sec): legacy per-token TF membership vs the batch engine.
+
+Usage:
+    python -m benchmarks.bench_stopwords --texts 50 --lang english
+'''
+import argparse
+from time import perf_counter
+import tensorflow as tf
+from ai_model import TextProcessor
+from blueprints.data_loader import (DataLoader, NLTKLoader)
+
+def legacy_filter_stopwords(text, stopwords):
+    #** Previous TextProcessor._filter_stopwords (tf.concat per call + per-token tensor membership)
+    fix_text = text.translate(str.maketrans('','','\t\n'))
+    updated_text = tf.strings.split([fix_text], sep=' ').numpy().tolist()[0]
+    flattened_stopwords = tf.concat([tf.constant(stopwords)], axis=0)
+    return [i for i in updated_text if tf.strings.lower(i) not in flattened_stopwords]
+
+def get_corpus(total):
+    surahs = DataLoader(folder_path='jsons/quran/surah-quran')
+    surah = surahs._read_file(surahs.get('36-Ya-Sin.json'))
+    verses = list(surah['verses']['English'].values())
+    return [verses[i % len(verses)] for i in range(total)]
+
+def run(total=50, lang='english'):
+    texts = get_corpus(total)
+    total_tokens = sum(len(TextProcessor._tokenize(i)) for i in texts)
+    stopwords = sorted(NLTKLoader.get_stopwords(lang))
+    
+    start = perf_counter()
+    for text in texts:
+        legacy_filter_stopwords(text, stopwords)
+    legacy = perf_counter() - start
+    
+    TextProcessor.filter_stopwords_batch(texts[:1], lang) #** Warm-up (builds the cached stopword set)
+    start = perf_counter()
+    TextProcessor.filter_stopwords_batch(texts, lang)
+    batch = perf_counter() - start
+    
+    results = {'texts': total,
+               'tokens': total_tokens,
+               'legacy_tokens_per_sec': round(total_tokens / legacy, 2),
+               'batch_tokens_per_sec': round(total_tokens / batch, 2),
+               'speedup': round(legacy / batch, 2)}
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stopword filtering benchmark')
+    parser.add_argument('--texts', type=int, default=50)
+    parser.add_argument('--lang', default='english')
+    args = parser.parse_args()
+    for key, value in run(args.texts, args.lang).items():
+        print(f'{key:<24} {value}')
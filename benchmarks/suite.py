@@ -0,0 +1,190 @@
+'''
+Benchmark suite: data loading, DataFrame build, text processing and every Flask route.
+Results are written to JSON with machine metadata and compared against a stored baseline.
+
+Usage:
+    python -m benchmarks.suite --output bench_results.json
+    python -m benchmarks.suite --save-baseline                 (stores benchmarks/baseline.json)
+    python -m benchmarks.suite --threshold 0.25                (exit code 1 if any benchmark is >25% slower)
+    python -m benchmarks.suite --only loader,routes --repeat 5
+'''
+import sys
+import json
+import socket
+import asyncio
+import argparse
+import platform
+import subprocess
+from copy import deepcopy
+from datetime import datetime, timezone
+from multiprocessing import cpu_count
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+BASELINE = Path(__file__).parent / 'baseline.json'
+#^ Query strings (or JSON bodies for POST) for routes that need arguments
+ROUTE_ARGS = {
+    '/api/v1/quran/search': 'surahID=1',
+    '/api/v1/quran/translate': 'surahID=1&lang=en',
+    '/api/v1/quran/keyword': 'keyword=mercy&total=10',
+    '/api/v1/quran/verses': {'refs': ['1:1-7', '2:255', '3:8'], 'langs': ['English']},
+}
+
+def timeit(func, repeat=3, setup=None):
+    '''Returns {cold_ms, min_ms, median_ms, mean_ms} (cold is the first call, the others cover every call)'''
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        func()
+        timings.append((perf_counter() - start) * 1e3)
+    return {'cold_ms': round(timings[0], 3),
+            'min_ms': round(min(timings), 3),
+            'median_ms': round(median(timings), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3)}
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parents[1]).stdout.strip()
+    except OSError:
+        commit = None
+    return {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'host': socket.gethostname(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': cpu_count(),
+            'python': platform.python_version(),
+            'commit': commit}
+
+def bench_loader(repeat):
+    from blueprints.data_loader import (DataLoader, loader)
+    results = {}
+    results['DataLoader.cold'] = timeit(lambda: DataLoader()(mapper=True), repeat)
+    results['DataLoader.lazy'] = timeit(lambda: DataLoader()(mapper=True, lazy=True), repeat)
+    results['loader.cold'] = timeit(lambda: loader(mapper=True), repeat, setup=loader.cache_clear)
+    loader(mapper=True)
+    results['loader.warm'] = timeit(lambda: loader(mapper=True), repeat)
+    return results
+
+def bench_csvs(repeat):
+    import blueprints.data_loader as data_loader
+    processor = data_loader.CSVProcessor()
+    folders = {name: value for name, value in vars(data_loader).items() if isinstance(value, data_loader.ArgMapper) and name.isupper()}
+    pristine = {name: deepcopy(value.reset) for name, value in folders.items()}
+
+    def restore():
+        #** process_* methods pop keys from the JSON globals; every run starts from the loaded data
+        for name, value in pristine.items():
+            setattr(data_loader, name, data_loader.ArgMapper(deepcopy(value)))
+
+    results = {}
+    for frame in processor._get_methods():
+        method = getattr(processor, f'process_{frame}')
+        results[f'CSVProcessor.{frame}'] = timeit(lambda: asyncio.run(method()), repeat, setup=restore)
+    results['CSVProcessor.execute_all'] = timeit(lambda: asyncio.run(processor.execute_all()), repeat, setup=restore)
+    restore()
+    return results
+
+def bench_text(repeat):
+    from ai_model import TextProcessor
+    from blueprints.data_loader import NLTKLoader
+
+    def nltk_startup():
+        #** Every run reads the artifact again (class-level caches and the memoized loader included)
+        NLTKLoader.get_stopwords.cache_clear()
+        NLTKLoader._nltk_files.cache_clear()
+        NLTKLoader._stopwords = None
+        NLTKLoader._nltk = None
+        NLTKLoader().stopwords
+
+    text = 'In the name of Allah, the Entirely Merciful, the Especially Merciful. ' * 20
+    return {'NLTKLoader.startup': timeit(nltk_startup, repeat),
+            'TextProcessor.init': timeit(lambda: TextProcessor(text), repeat),
+            'TextProcessor.filter_stopwords': timeit(lambda: TextProcessor._filter_stopwords(text, 'english'), repeat),
+            'TextProcessor.filter_stopwords_batch': timeit(lambda: TextProcessor.filter_stopwords_batch([text] * 100, 'english'), repeat)}
+
+def bench_routes(repeat):
+    from ai_app import app
+    from blueprints.quran_blueprint import (prerendered, response_cache)
+    client = app.test_client()
+    results = {}
+    #** Measures the resources themselves: no ResponseCache hits (cleared before every call) nor prerendered files
+    enabled, prerendered.enabled = prerendered.enabled, False
+    try:
+        results.update(_bench_routes(app, client, repeat, setup=response_cache.clear))
+    finally:
+        prerendered.enabled = enabled
+    return results
+
+def _bench_routes(app, client, repeat, setup):
+    results = {}
+    for rule in sorted(app.url_map.iter_rules(), key=lambda i: i.rule):
+        if rule.endpoint == 'static' or rule.arguments:
+            continue
+        args = ROUTE_ARGS.get(rule.rule.rstrip('/'), '')
+        if 'GET' in rule.methods:
+            url = f'{rule.rule}?{args}' if args else rule.rule
+            request = lambda url=url: client.get(url)
+        elif 'POST' in rule.methods and isinstance(args, dict):
+            request = lambda url=rule.rule, body=args: client.post(url, json=body)
+        else:
+            continue
+        setup()
+        response = request()
+        results[f'route {rule.rule}'] = {**timeit(request, repeat, setup=setup),
+                                         'status': response.status_code,
+                                         'bytes': len(response.get_data())}
+    return results
+
+BENCHMARKS = {'loader': bench_loader, 'csvs': bench_csvs, 'text': bench_text, 'routes': bench_routes}
+
+def run(only=None, repeat=3):
+    results = {'metadata': metadata(), 'results': {}, 'errors': {}}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        try:
+            results['results'].update(bench(repeat))
+        except Exception as error:
+            #** One broken group (E.g missing model files) does not hide the others
+            results['errors'][name] = f'{type(error).__name__}: {error}'
+    return results
+
+def compare(results, baseline, threshold=0.2, key='median_ms'):
+    '''Returns {benchmark: ratio} for every benchmark slower than `baseline` by more than `threshold`'''
+    regressions = {}
+    for name, current in results['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous and previous.get(key) and current[key] > previous[key] * (1 + threshold):
+            regressions[name] = round(current[key] / previous[key], 3)
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='IslamAI benchmark suite')
+    parser.add_argument('--only', default='', help=f'Comma separated groups: {",".join(BENCHMARKS)}')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=Path, default=Path('bench_results.json'))
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown vs the baseline (0.2 = 20%%)')
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = run([i for i in args.only.split(',') if i], args.repeat)
+    args.output.write_text(json.dumps(results, indent=4))
+    for name, timings in results['results'].items():
+        print(f'{name:<48} {timings["median_ms"]:>12.3f} ms')
+    for name, error in results['errors'].items():
+        print(f'\033[1;31m{name}: {error}\033[0m')
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=4))
+        print(f'\033[1;32mBaseline saved to {args.baseline}\033[0m')
+    elif args.baseline.is_file():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for name, ratio in regressions.items():
+            print(f'\033[1;31mRegression: {name} is {ratio}x the baseline\033[0m')
+        sys.exit(1 if regressions or results['errors'] else 0)
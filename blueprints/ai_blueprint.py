@@ -1,11 +1,18 @@
 
 #** All modules for Blueprints will be stored here
-from flask import (Blueprint, Flask, jsonify, redirect, render_template, url_for, request, make_response)
+import gzip
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from flask import (Blueprint, Flask, Response, g, has_request_context, jsonify, redirect, render_template, url_for,
+                   request, make_response, send_file, stream_with_context)
 from flask_restful import (Api, Resource, abort)
+from flask_restful.representations.json import output_json as restful_output_json
 from nested_lookup import nested_lookup as nested
 from rapidfuzz import (fuzz, process)
 from marshmallow import Schema, fields
-from webargs.flaskparser import use_args
+from webargs.flaskparser import FlaskParser
 #** (pathlib, json, concurrent)
 from .data_loader import *
 
@@ -13,6 +20,344 @@ main_endpoint, api_endpoint = '/islam-ai/v1/index', '/api/v1'
 ai_bp = Blueprint('ai_blueprint', __name__, url_prefix=main_endpoint)
 ai_api = Api(ai_bp)
 
+class RequestMetrics:
+    '''
+    ### Note:
+        >>> The RequestMetrics class records per-route latency histograms split into phases, response sizes,
+            status codes and response cache results, rendered in Prometheus text format (`/metrics`).
+
+    Phases (seconds):
+        - parse: webargs parsing/validation (`use_args` of this module).
+        - serialize: JSON encoding (ResponseCache and the Api JSON representation).
+        - lookup: the rest of the request (fuzzy matching, data access, framework dispatch).
+        - total: the whole request.
+    Cache results come from ResponseCache/PrerenderedResponses (`g.cache_status`).
+    '''
+    LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+    
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], List] = {}
+        self.sizes: Dict[str, List] = {}
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.cache: Dict[Tuple[str, str], int] = {}
+    
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            if has_request_context():
+                phases = g.setdefault('metric_phases', {})
+                phases[name] = phases.get(name, 0.0) + perf_counter() - start
+    
+    @staticmethod
+    def _observe(histogram: Optional[List], buckets: Tuple, value: float) -> List:
+        #** [bucket counts..., +Inf count, sum]
+        histogram = histogram or [0] * (len(buckets) + 2)
+        histogram[bisect_left(buckets, value)] += 1
+        histogram[-1] += value
+        return histogram
+    
+    def _before(self) -> None:
+        g.metric_start = perf_counter()
+    
+    def _after(self, response: Response) -> Response:
+        if 'metric_start' not in g:
+            return response
+        total = perf_counter() - g.metric_start
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        phases = g.get('metric_phases', {})
+        phases = {'parse': phases.get('parse', 0.0), 'serialize': phases.get('serialize', 0.0), 'total': total,
+                'lookup': max(total - phases.get('parse', 0.0) - phases.get('serialize', 0.0), 0.0)}
+        with self._lock:
+            for phase, seconds in phases.items():
+                self.latency[(route, phase)] = self._observe(self.latency.get((route, phase)), self.LATENCY_BUCKETS, seconds)
+            if response.content_length is not None:
+                self.sizes[route] = self._observe(self.sizes.get(route), self.SIZE_BUCKETS, response.content_length)
+            key = (route, request.method, response.status_code)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            cache_key = (route, g.get('cache_status', 'none'))
+            self.cache[cache_key] = self.cache.get(cache_key, 0) + 1
+        return response
+    
+    def init_app(self, app: Flask) -> None:
+        app.before_request(self._before)
+        app.after_request(self._after)
+    
+    def output_json(self, data: Any, code: int, headers: Optional[Dict]=None) -> Response:
+        '''Api JSON representation (flask_restful's output_json) with the serialize phase timed'''
+        with self.phase('serialize'):
+            return restful_output_json(data, code, headers)
+    
+    @staticmethod
+    def _labels(**labels: Any) -> str:
+        return ','.join(f'{key}="{str(value).replace(chr(92), chr(92)*2).replace(chr(34), chr(92)+chr(34))}"' for key, value in labels.items())
+    
+    def _histogram(self, name: str, buckets: Tuple, histograms: Dict, label_names: Tuple[str, ...]) -> List[str]:
+        lines = [f'# TYPE {name} histogram']
+        for key, histogram in sorted(histograms.items()):
+            labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), histogram[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{self._labels(**labels, le=bound)}}} {cumulative}')
+            lines.append(f'{name}_sum{{{self._labels(**labels)}}} {histogram[-1]}')
+            lines.append(f'{name}_count{{{self._labels(**labels)}}} {cumulative}')
+        return lines
+    
+    def render(self) -> str:
+        with self._lock:
+            lines = ['# HELP islamai_request_phase_seconds Request latency by route and phase (parse, lookup, serialize, total)',
+                     *self._histogram('islamai_request_phase_seconds', self.LATENCY_BUCKETS, self.latency, ('route', 'phase')),
+                     '# HELP islamai_response_size_bytes Response body size by route',
+                     *self._histogram('islamai_response_size_bytes', self.SIZE_BUCKETS, self.sizes, ('route',)),
+                     '# HELP islamai_requests_total Requests by route, method and status',
+                     '# TYPE islamai_requests_total counter',
+                     *(f'islamai_requests_total{{{self._labels(route=route, method=method, status=status)}}} {count}'
+                       for (route, method, status), count in sorted(self.requests.items())),
+                     '# HELP islamai_response_cache_total Response cache results by route (hit, miss, not_modified, prerendered, none)',
+                     '# TYPE islamai_response_cache_total counter',
+                     *(f'islamai_response_cache_total{{{self._labels(route=route, result=result)}}} {count}'
+                       for (route, result), count in sorted(self.cache.items()))]
+        return '\n'.join(lines) + '\n'
+
+metrics = RequestMetrics()
+
+class TimedFlaskParser(FlaskParser):
+    '''webargs parser that records the `parse` phase'''
+    def parse(self, *args, **kwargs):
+        with metrics.phase('parse'):
+            return super().parse(*args, **kwargs)
+
+use_args = TimedFlaskParser().use_args
+
+ai_api.representations['application/json'] = metrics.output_json
+
+class ResponseCache:
+    '''
+    ### Note:
+        >>> The ResponseCache class stores serialized (UTF-8 JSON) response bytes keyed by the
+            endpoint and its normalized query args, bounded by `max_bytes` with LRU eviction.
+
+    - ETags are strong and are the sha256 of the serialized body, so they change whenever the bytes change.
+    - If-None-Match is only answered (304) for a cached entry or a freshly rendered body: the args were validated
+      by the resource, and streamed/redirect/error responses (and `None`) are never cached nor answered with 304.
+    - Entries of an older dataset version are treated as misses.
+    - `stats` holds hits/misses/not-modified/evictions, hit ratio and bytes saved.
+
+    E.g
+        @response_cache.cached
+        @use_args(...)
+        def get(self, args): ...
+    '''
+    def __init__(self, max_bytes: int=64 * 1024**2, version: Callable[[], str]=lambda: '') -> None:
+        self.max_bytes = max_bytes
+        self.version = version
+        #^ {key: (version, etag, body)}
+        self._entries: Dict[str, Tuple[str, str, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.counters = dict.fromkeys(('hits', 'misses', 'not_modified', 'evictions', 'bytes_saved'), 0)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def key() -> str:
+        args = sorted((key, value.strip()) for key, values in request.args.lists() for value in values)
+        return f'{request.path}?{"&".join(f"{key}={value}" for key, value in args)}'
+    
+    @staticmethod
+    def etag(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()[:32]
+    
+    def _response(self, body: bytes, etag: str) -> Response:
+        if etag in request.if_none_match:
+            g.cache_status = 'not_modified'
+            with self._lock:
+                self.counters['not_modified'] += 1
+                self.counters['bytes_saved'] += len(body)
+            response = Response(status=304)
+        else:
+            response = Response(body, status=200, mimetype='application/json')
+        response.set_etag(etag)
+        return response
+    
+    def _store(self, key: str, version: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key)[2])
+            if len(body) > self.max_bytes:
+                return
+            self._entries[key] = (version, etag, body)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._bytes -= len(self._entries.popitem(last=False)[1][2])
+                self.counters['evictions'] += 1
+    
+    def cached(self, func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, version = self.key(), self.version()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end(key)
+                    g.cache_status = 'hit'
+                    self.counters['hits'] += 1
+                    self.counters['bytes_saved'] += len(entry[2])
+                else:
+                    entry = None
+            if entry is not None:
+                return self._response(entry[2], entry[1])
+            
+            result = func(*args, **kwargs)
+            #** Only plain 200 payloads are cached (streams/redirects/errors and `None` pass through)
+            if result is None or isinstance(result, (Response, tuple)):
+                return result
+            with metrics.phase('serialize'):
+                body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+            g.cache_status = 'miss'
+            with self._lock:
+                self.counters['misses'] += 1
+            etag = self.etag(body)
+            self._store(key, version, etag, body)
+            return self._response(body, etag)
+        return wrapper
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def invalidate(self, prefix: str) -> int:
+        '''Drops the entries of one endpoint (key prefix) and returns how many were dropped'''
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._bytes -= len(self._entries.pop(key)[2])
+            return len(keys)
+    
+    @property
+    def stats(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['misses'] + self.counters['not_modified']
+            return {**self.counters,
+                    'entries': len(self._entries),
+                    'resident_bytes': self._bytes,
+                    'max_bytes': self.max_bytes,
+                    'hit_ratio': round((lookups - self.counters['misses']) / lookups, 4) if lookups else 0.0}
+
+class PrerenderedResponses:
+    '''
+    ### Note:
+        >>> The PrerenderedResponses class writes static responses to disk once (UTF-8 JSON plus gzip and,
+            if the optional `brotli` package is installed, brotli variants) and serves the best encoding
+            the client accepts with send_file (sendfile/X-Sendfile when the server supports it).
+
+    - manifest.json records the `version()` the files were rendered from (content hashes of their sources);
+      files are only served while it matches and ISLAMAI_PRERENDERED is not '0'. `version()` is never computed
+      on a request: `build()` stores it and `verify()` (startup) compares it once with the stored value.
+      `refresh()` (E.g from a DataWatcher subscriber) stops serving the files until they are verified or rebuilt.
+    - Payloads may be the exact bytes of the live route (rendered through the test client) or JSON-serializable objects.
+    - ETags are the content hash of each file plus its encoding (one strong ETag per representation).
+    '''
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+    
+    def __init__(self, path: Path, version: Callable[[], str]=lambda: '') -> None:
+        self.path = path
+        self.version = version
+        self.enabled = environ.get('ISLAMAI_PRERENDERED', '1') != '0'
+        self._manifest: Optional[Dict] = None
+        self._version: Optional[str] = None
+    
+    @property
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            manifest_file = self.path / 'manifest.json'
+            self._manifest = json.loads(manifest_file.read_bytes()) if manifest_file.is_file() else {}
+        return self._manifest
+    
+    def verify(self) -> bool:
+        '''Computes the source version once (startup, off the request path) and compares it with the stored one'''
+        self._version, self._manifest = None, None
+        if self.enabled and self.manifest:
+            self._version = self.version()
+        return self.active
+    
+    def refresh(self) -> None:
+        '''The sources changed: the files are not served until `verify()` or `build()`'''
+        self._version, self._manifest = None, None
+    
+    @property
+    def active(self) -> bool:
+        return self.enabled and self._version is not None and bool(self.manifest) and self.manifest.get('version') == self._version
+    
+    def build(self, responses: Dict[str, Union[bytes, Any]]) -> Path:
+        '''Writes {relative_path: body bytes or payload} into `path` (replaces any previous build)'''
+        self.refresh()
+        version = self.version()
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+            print('\033[1;33m`brotli` is not installed. Only gzip variants will be written.\033[0m')
+        tmp_path = self.path.with_name(f'.{self.path.name}.{getpid()}.tmp')
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        files = OrderedDict()
+        for rel_path, payload in responses.items():
+            body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            file_path = tmp_path / rel_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(body)
+            with gzip.open(file_path.with_name(file_path.name + '.gz'), 'wb', compresslevel=9) as file:
+                file.write(body)
+            if brotli is not None:
+                file_path.with_name(file_path.name + '.br').write_bytes(brotli.compress(body, quality=11))
+            files[rel_path] = hashlib.sha256(body).hexdigest()[:32]
+        with open(tmp_path / 'manifest.json', 'w', encoding='utf-8') as file:
+            json.dump({'version': version, 'files': files}, file, indent=4, ensure_ascii=False)
+        shutil.rmtree(self.path, ignore_errors=True)
+        tmp_path.rename(self.path)
+        self._version, self._manifest = version, None
+        print(f'\033[1;32mPrerendered {len(files)} responses into {self.path}\033[0m')
+        return self.path
+    
+    def send(self, rel_path: str) -> Optional[Response]:
+        '''Returns the pre-compressed response for `rel_path` (None if it was not prerendered)'''
+        content_hash = self.manifest.get('files', {}).get(rel_path)
+        if content_hash is None:
+            return None
+        file_path, encoding = self.path / rel_path, None
+        for name, suffix in self.ENCODINGS:
+            variant = file_path.with_name(file_path.name + suffix)
+            if request.accept_encodings[name] and variant.is_file():
+                file_path, encoding = variant, name
+                break
+        response = send_file(file_path, mimetype='application/json', etag=f'{content_hash}-{encoding or "identity"}', conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    def serves(self, rel_path: Callable[[Any], Optional[str]]) -> Callable:
+        '''Serves the prerendered file named by `rel_path(request.args)` and falls back to the resource'''
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if self.active:
+                    name = rel_path(request.args)
+                    response = self.send(name) if name else None
+                    if response is not None:
+                        g.cache_status = 'prerendered'
+                        return response
+                return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
 islamic_data = {
     f'Primary Endpoint `/api/v1`': {
     1: {
@@ -25,6 +370,7 @@ islamic_data = {
                     '/search?surahID=None&author=None',
                     '/translate?surahID=None&lang=None',
                     #^ Keyword: Find total count of given keyword
+                    '/keyword?keyword=None&lang=None&source=None&total=None&stem=None',
                     ]
         },
     2: {
@@ -1,14 +1,128 @@
 
+from urllib.parse import quote
 from .ai_blueprint import *
 
 quran_bp = Blueprint('quran_blueprint', __name__, url_prefix=api_endpoint)
 quran_api = Api(quran_bp, prefix='/quran')
+quran_api.representations['application/json'] = metrics.output_json
 
 quran_file = all_files['list_of_surahs']
 quran_stats = all_files['quran_stats']
+#** Key paths of every surah (direct lookups instead of nested_lookup per request)
+quran_paths = PathIndex.build(quran_file)
+#** Memory-mapped verses (build once with QuranStore.build('surah-quran'))
+quran_store = QuranStore.get('surah-quran')
 
 surahIDs = {str(values['id']): values['surah_name'] for _, (_keys, values) in enumerate(quran_file.items(), start=1)}
-surah_authors = list(nested('verses', quran_file['1'])[0].keys())
+#** Authors of list_of_surahs (`/search?author=`, `/index`) whether or not the store is built
+surah_authors = list(quran_paths['1'].first('verses', {}).keys())
+#^ `/translate` languages that are prerendered (full_surah_ar, full_surah_en of list_of_surahs)
+translate_langs = ('ar', 'en')
+
+def reload_quran(path):
+    '''
+    DataWatcher subscriber: swaps in the reloaded Quran data and everything derived from it.
+    
+    ### Note:
+        >>> surah-quran files only feed the store (their verses are keyed by language); list_of_surahs
+            (verses keyed by author), its PathIndex, surahIDs and surah_authors change only with list_of_surahs.json.
+    '''
+    global quran_file, quran_stats, quran_paths, quran_store, surahIDs, surah_authors
+    path = Path(path)
+    if path.name == 'quran_stats.json':
+        quran_stats = current('JSONS').get('quran_stats', quran_stats)
+    elif path.name == 'list_of_surahs.json':
+        new_file = current('JSONS').get('list_of_surahs', quran_file)
+        new_paths = PathIndex.build(new_file)
+        new_surahIDs = {str(values['id']): values['surah_name'] for values in new_file.values()}
+        #** Rebinds every name together (requests in flight keep the objects they already read)
+        quran_file, quran_paths, surahIDs = new_file, new_paths, new_surahIDs
+        surah_authors = list(quran_paths['1'].first('verses', {}).keys())
+    quran_store = QuranStore.get('surah-quran')
+
+def dataset_version():
+    return '-'.join([data_version(), *(QuranStore.get(source).version for source in QuranStore.SOURCES)])
+
+def prerender_version():
+    '''Content hashes of what the prerendered files are rendered from (surah-quran files and list_of_surahs)'''
+    surah_files = (MAIN_DIR / 'jsons' / 'quran' / 'surah-quran').glob('*.json')
+    list_of_surahs = hashlib.sha256(json.dumps(quran_file, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+    return f'{content_hash(*surah_files)}-{list_of_surahs}'
+
+#** Serialized responses (ISLAMAI_RESPONSE_CACHE_BYTES bounds the resident bytes)
+response_cache = ResponseCache(max_bytes=int(environ.get('ISLAMAI_RESPONSE_CACHE_BYTES', 64 * 1024**2)), version=dataset_version)
+#** Hot-reloaded data is swapped in first, then only the endpoints that depend on it are invalidated
+for pattern in ('quran_stats.json', 'list_of_surahs.json', 'quran/surah-quran/*'):
+    DataWatcher.get().subscribe(pattern, reload_quran)
+DataWatcher.get().subscribe('quran_stats.json', lambda _: response_cache.invalidate(f'{api_endpoint}/quran/stats'))
+for pattern in ('list_of_surahs.json', 'quran/**'):
+    DataWatcher.get().subscribe(pattern, lambda _: response_cache.invalidate(f'{api_endpoint}/quran/'))
+#** Pre-compressed static responses (build with `python -m blueprints.quran_blueprint --prerender`)
+prerendered = PrerenderedResponses(STORE_DIR / 'responses', version=prerender_version)
+#** Hashes the sources once at import (the gunicorn master with preload_app), never inside a request
+prerendered.verify()
+for pattern in ('list_of_surahs.json', 'quran/**'):
+    DataWatcher.get().subscribe(pattern, lambda _: prerendered.refresh())
+
+def match_author(author):
+    return process.extractOne(author, choices=surah_authors, scorer=fuzz.ratio)[0]
+
+def store_languages():
+    '''Verse columns of the projections (store languages once built, list_of_surahs authors until then)'''
+    return quran_store.languages or surah_authors
+
+def search_artifact(args):
+    if not set(args) <= {'surahID', 'author'} or args.get('surahID') not in surahIDs:
+        return None
+    if not args.get('author'):
+        return f"search/{args['surahID']}.json"
+    return f"search/{args['surahID']}/{quote(match_author(args['author']), safe='')}.json"
+
+def translate_artifact(args):
+    if not set(args) <= {'surahID', 'lang'} or args.get('lang') not in translate_langs:
+        return None
+    return f"translate/{args.get('surahID')}/{args['lang']}.json"
+
+def prerender_responses():
+    '''
+    Renders every surah, surah×author and surah×language response through the live routes (Flask test client),
+    then checks that each served file is byte-for-byte the live response.
+    '''
+    app = Flask(__name__)
+    app.register_blueprint(quran_bp)
+    client, endpoint = app.test_client(), f'{api_endpoint}/quran'
+    urls = OrderedDict()
+    for surahID in surahIDs:
+        urls[search_artifact({'surahID': surahID})] = f'{endpoint}/search?surahID={surahID}'
+        for author in surah_authors:
+            urls[search_artifact({'surahID': surahID, 'author': author})] = f"{endpoint}/search?surahID={surahID}&author={quote(author)}"
+        for lang in translate_langs:
+            urls[translate_artifact({'surahID': surahID, 'lang': lang})] = f'{endpoint}/translate?surahID={surahID}&lang={lang}'
+    
+    def live(url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise ValueError(f'`{url}` answered {response.status_code}')
+        return response.get_data()
+    
+    enabled, prerendered.enabled = prerendered.enabled, False
+    try:
+        response_cache.clear()
+        responses = OrderedDict({rel_path: live(url) for rel_path, url in urls.items()})
+        path = prerendered.build(responses)
+        prerendered.enabled = True
+        mismatches = []
+        for rel_path, url in urls.items():
+            served = client.get(url, headers={'Accept-Encoding': 'identity'})
+            if served.get_data() != responses[rel_path] or gzip.decompress((path / f'{rel_path}.gz').read_bytes()) != responses[rel_path]:
+                mismatches.append(rel_path)
+            served.close()
+        if mismatches:
+            raise ValueError(f'{len(mismatches)} prerendered responses differ from the live routes: {mismatches[:5]}')
+    finally:
+        prerendered.enabled = enabled
+        response_cache.clear()
+    return path
 
 quran_index = {
                 'message': 'Redirect to `/index` endpoint for more reference',
@@ -17,6 +131,7 @@ quran_index = {
             }, 302
 
 class QuranIndex(Resource):
+    @response_cache.cached
     def get(self):
         return {
                 'message': 'Quran API Reference Page',
@@ -26,8 +141,11 @@ class QuranIndex(Resource):
                                     '/index',
                                     '/stats',
                                     '/search?surahID=None&author=None',
+                                    '/search?verses=2:255-257&langs=None&fields=None&stream=false',
+                                    'POST /verses {"refs": ["1:1-7", "2:201"], "langs": ["Arabic", "English"], "authors": None}',
                                     '/translate?surahID=None&lang=None',
-                                    '/keyword'
+                                    '/keyword?keyword=None&lang=None&source=None&total=None&stem=None',
+                                    '/cache'
                                     ],
                 'author-translators': surah_authors,
                 'supported_languages': {
@@ -41,9 +159,79 @@ class QuranIndex(Resource):
 class SurahRequestSchema(Schema):
     surahID = fields.Int(required=False)
     author = fields.Str(required=False)
-    lang = fields.Str(requires=False)
+    lang = fields.Str(required=False)
+    #^ Projection: verses=2:255-257, langs=English,Arabic, fields=name_simple,verses_count, stream=true (NDJSON)
+    verses = fields.Str(required=False)
+    langs = fields.Str(required=False)
+    select = fields.Str(required=False, data_key='fields')
+    stream = fields.Bool(required=False)
+
+def resolve_langs(*names):
+    '''Fuzzy-matches language names to store columns (all columns if none are given)'''
+    choices = store_languages()
+    langs = [process.extractOne(i.strip(), choices=choices, scorer=fuzz.ratio)[0] for i in chain.from_iterable(names) if i and i.strip()]
+    return list(OrderedDict.fromkeys(langs)) or choices
+
+def resolve_columns(langs=(), authors=(), default=()):
+    '''
+    Verse columns of a request: `langs` fuzzy-matched to the store languages, then `authors` matched to the
+    list_of_surahs translators (read from list_of_surahs). Without either, `default` (every store language if empty).
+    '''
+    langs, authors = ([i.strip() for i in names if i and i.strip()] for names in (langs, authors))
+    columns = resolve_langs(langs or default) if langs or not authors else []
+    return list(OrderedDict.fromkeys(columns + [match_author(author) for author in authors]))
+
+def surah_verse_count(surahID, langs):
+    '''Verses of a surah (store manifest, or the longest list_of_surahs column until the store is built)'''
+    if quran_store.built:
+        return quran_store.verse_count(surahID)
+    fallback = quran_paths[surahID].first('verses', {}) if surahID in quran_paths else {}
+    return max((len(fallback.get(lang, {})) for lang in langs), default=0)
+
+def verse_rows(verse_range, langs):
+    '''Yields {'verse': 's:a', <lang>: verse, ...} per ayah of the range (read verse by verse)'''
+    surahID = str(verse_range.surahID)
+    fallback = quran_paths[surahID].first('verses', {}) if surahID in quran_paths else {}
+    for ayah in verse_range.ayahs(surah_verse_count(surahID, langs)):
+        row = OrderedDict({'verse': f'{surahID}:{ayah}'})
+        for lang in langs:
+            verse = quran_store.verse(lang, surahID, ayah) if lang in quran_store \
+                    else fallback.get(lang, {}).get(f'verse {surahID}:{ayah}')
+            if verse is not None:
+                row[lang] = verse
+        yield row
+
+def project_surah(args):
+    '''Returns only the requested verse range, languages and surah fields (or streams them as NDJSON)'''
+    try:
+        verse_range = VerseRange.parse(args.get('verses', args.get('surahID')), None if 'verses' not in args else args.get('surahID'))
+    except ValueError as error:
+        abort(400, message=str(error))
+    if str(verse_range.surahID) not in surahIDs:
+        return quran_index
+    langs = resolve_columns(args.get('langs', '').split(','), [args.get('author', '')])
+    select = [i.strip() for i in args.get('select', '').split(',') if i.strip()]
+    surah_content = quran_file.get(str(verse_range.surahID), {})
+    surah_fields = OrderedDict({key: surah_content[key] for key in select if key in surah_content and key != 'verses'})
+    
+    if args.get('stream'):
+        def ndjson():
+            if surah_fields:
+                yield json.dumps({'surah': surah_fields}, ensure_ascii=False) + '\n'
+            for row in verse_rows(verse_range, langs):
+                yield json.dumps(row, ensure_ascii=False) + '\n'
+        return Response(stream_with_context(ndjson()), mimetype='application/x-ndjson')
+    
+    verses = OrderedDict({lang: OrderedDict() for lang in langs})
+    for row in verse_rows(verse_range, langs):
+        for lang in langs:
+            if lang in row:
+                verses[lang][f"verse {row['verse']}"] = row[lang]
+    return {**surah_fields, 'range': str(verse_range), 'verses': OrderedDict({lang: i for lang, i in verses.items() if i})}
 
 class SurahContentsResource(Resource):
+    @prerendered.serves(search_artifact)
+    @response_cache.cached
     @use_args(SurahRequestSchema(), location="query")
     def get(self, args):
         
@@ -52,6 +240,8 @@ class SurahContentsResource(Resource):
         
         if args is None:
             return quran_index
+        if {'verses', 'langs', 'select', 'stream'} & set(args):
+            return project_surah(args)
         try:
             if surahID not in surahIDs.keys():
                 return quran_index
@@ -60,8 +250,11 @@ class SurahContentsResource(Resource):
             if not author:
                 return surah_content
             else:
-                author = process.extractOne(author, choices=surah_authors, scorer=fuzz.ratio)[0]
-                author_contents = nested('verses', surah_content)[0].get(author)
+                author = match_author(author)
+                if author in quran_store:
+                    author_contents = quran_store.surah(author, surahID)
+                else:
+                    author_contents = quran_paths[surahID].first('verses', {}).get(author)
                 if author_contents:
                     return {author: author_contents}
                 else:
@@ -70,6 +263,8 @@ class SurahContentsResource(Resource):
             abort(400, message="Invalid paramters")
 
 class SurahLangResource(Resource):
+    @prerendered.serves(translate_artifact)
+    @response_cache.cached
     @use_args(SurahRequestSchema(), location="query")
     def get(self, args):
         #** Available at the moment for only Sahih International
@@ -83,8 +278,8 @@ class SurahLangResource(Resource):
         
         def grabber(key, extractor=False):
             if not extractor:
-                return {key: nested(key, surah_content)[0]}
-            return {key: nested(key, nested('Sahih International', surah_content)[0])}
+                return {key: quran_paths[surahID].first(key)}
+            return {key: quran_paths[surahID].get(key, under='Sahih International')}
         
         try:
             surah_content = quran_file.get(surahID)
@@ -99,32 +294,77 @@ class SurahLangResource(Resource):
             abort(400, message="Invalid paramters")
 
 class QuranStatsResource(Resource):
+    @response_cache.cached
     def get(self):
         return quran_stats
 
+class ResponseCacheResource(Resource):
+    def get(self):
+        return response_cache.stats
+
+class KeywordRequestSchema(Schema):
+    keyword = fields.Str(required=True)
+    lang = fields.Str(required=False)
+    source = fields.Str(required=False)
+    total = fields.Int(required=False)
+    stem = fields.Bool(required=False)
+
 class QuranKeywordResource(Resource):
-    @use_args(SurahRequestSchema(), location="query")
+    @response_cache.cached
+    @use_args(KeywordRequestSchema(), location="query")
     def get(self, args):
+        #** Counts and locates a keyword (word or phrase) with the local inverted index
         keyword = args.get('keyword')
+        lang = args.get('lang', 'Arabic' if ArabicNormalizer.is_arabic(keyword) else 'English')
+        source = args.get('source', 'surah-quran')
         total = args.get('total')
+        
+        if source not in QuranStore.SOURCES:
+            abort(400, message=f"Invalid source. Available sources: {', '.join(QuranStore.SOURCES)}")
+        keyword_index = KeywordIndex.get(source)
+        try:
+            if lang not in keyword_index:
+                lang = process.extractOne(lang, choices=keyword_index.languages, scorer=fuzz.ratio)[0]
+            return keyword_index.search(keyword, lang, limit=total, stem=args.get('stem'))
+        except StoreUnavailableError as error:
+            abort(503, message=f'{error}. Try again once the Quran stores are compiled')
 
-class CustomJSONEncoder(json.JSONEncoder):
-    def __init__(self, *args, **kwargs):
-        super(CustomJSONEncoder, self).__init__(*args, **kwargs)
-    #!> Needs fixing. Content still is ascii
-    def default(self, o):
-        if isinstance(o, str):
-            return o.encode('utf-8').decode('unicode_escape')
-        elif isinstance(o, dict):
-            return {key: self.default(value) for key, value in o.items()}
-        elif isinstance(o, list):
-            return [self.default(item) for item in o]
-        return super(CustomJSONEncoder, self).default(o)
-
-quran_api.json_encoder = CustomJSONEncoder
+class BatchVersesSchema(Schema):
+    refs = fields.List(fields.Str(), required=True)
+    langs = fields.List(fields.Str(), required=False)
+    authors = fields.List(fields.Str(), required=False)
+
+class BatchVersesResource(Resource):
+    #^ Bound of verses × languages of one request (E.g 6236 verses in Arabic and English)
+    MAX_VERSES = 12500
+    #^ Languages returned when neither `langs` nor `authors` is given (authors are read from list_of_surahs)
+    DEFAULT_LANGS = ('Arabic', 'English')
+    
+    @use_args(BatchVersesSchema(), location="json")
+    def post(self, args):
+        #** Resolves many references ("1:1-7", "2:201", "3:8") in one round trip, in request order
+        refs = args['refs']
+        try:
+            verse_ranges = [VerseRange.parse(ref) for ref in refs]
+        except ValueError as error:
+            abort(400, message=str(error))
+        langs = resolve_columns(args.get('langs') or [], args.get('authors') or [], default=self.DEFAULT_LANGS)
+        verses = sum(len(verse_range.ayahs(surah_verse_count(str(verse_range.surahID), langs))) for verse_range in verse_ranges)
+        if verses * len(langs) > self.MAX_VERSES:
+            abort(400, message=f'Too many verses ({verses} verses × {len(langs)} languages). Maximum is {self.MAX_VERSES}')
+        return {'langs': langs,
+                'results': [{'ref': ref, 'verses': list(verse_rows(verse_range, langs))}
+                            for ref, verse_range in zip(refs, verse_ranges)]}
 
 quran_api.add_resource(QuranIndex, '/index')
 quran_api.add_resource(SurahContentsResource, '/search')
 quran_api.add_resource(QuranStatsResource, '/stats')
 quran_api.add_resource(SurahLangResource, '/translate')
-# quran_api.add_resource(SurahLangResource, '/keyword')
\ No newline at end of file
+quran_api.add_resource(QuranKeywordResource, '/keyword')
+quran_api.add_resource(ResponseCacheResource, '/cache')
+quran_api.add_resource(BatchVersesResource, '/verses')
+
+if __name__ == '__main__':
+    import sys
+    if '--prerender' in sys.argv:
+        prerender_responses()
@@ -1,23 +1,39 @@
 import re
-import ssl
+import sys
 import json
+import fcntl
+import math
+import mmap
+import pickle
+import hashlib
+import shutil
 import asyncio
+import threading
 import pandas as pd
+from os import (environ, getpid)
+from time import perf_counter
+from array import array
+from bisect import bisect_right
 from pathlib import Path
-from nltk import download
+from fnmatch import fnmatch
+from contextlib import contextmanager
 from dataclasses import dataclass
 from itertools import chain
 from collections import OrderedDict
 from multiprocessing import cpu_count
 from nested_lookup import nested_lookup as nested
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
 from functools import (lru_cache, cached_property)
 from concurrent.futures import (ThreadPoolExecutor, as_completed)
-from typing import (Any, AnyStr, Dict, Generator, IO, ItemsView, KeysView,
+from typing import (Any, AnyStr, Callable, Dict, Generator, IO, ItemsView, KeysView,
                     List, Optional, Tuple, Union, ValuesView)
 from pprint import pprint
 
 #^ Primary path for accessing project-related data.
 MAIN_DIR = Path(__file__).parents[1].absolute() / 'islamic_data'
+#^ Compiled (memory-mapped) artifacts built from MAIN_DIR.
+STORE_DIR = MAIN_DIR / 'store'
 
 @dataclass
 class ArgMapper[T: Dict]:
@@ -118,6 +134,202 @@ class ArgMapper[T: Dict]:
         '''Resets ArgMapper back to Dictionary instance'''
         return self.dict_
 
+class PathIndex[T: Dict]:
+    '''
+    ### Note:
+        >>> The PathIndex class walks a document once and records the concrete key paths of every key name,
+            so repeated lookups are direct dictionary accesses instead of a full nested_lookup walk.
+
+    - Paths are tuples of dict keys and list indices in document order (same order as nested_lookup).
+    - The index assumes the document shape does not change after it is built.
+
+    E.g
+        - paths = PathIndex(surah)
+        - paths.first('verses') == nested('verses', surah)[0]
+        - paths.first('full_surah_en', under='Sahih International')
+    '''
+    def __init__(self, document: T) -> None:
+        self.document = document
+        self.paths: Dict[Any, List[Tuple]] = {}
+        self._walk(document, ())
+    
+    def __contains__(self, __key: Any) -> bool:
+        return __key in self.paths
+    
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(keys={len(self.paths)})'
+    
+    def _walk(self, node: Any, path: Tuple) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                self.paths.setdefault(key, []).append(path + (key,))
+                self._walk(value, path + (key,))
+        elif isinstance(node, (list, tuple)):
+            for idx, value in enumerate(node):
+                self._walk(value, path + (idx,))
+    
+    def resolve(self, path: Tuple) -> Any:
+        node = self.document
+        for key in path:
+            node = node[key]
+        return node
+    
+    def get(self, __key: Any, under: Optional[Any]=None) -> List[Any]:
+        '''Returns every value of `__key` (only inside the first `under` key if given), like nested_lookup'''
+        paths = self.paths.get(__key, [])
+        if under is not None:
+            prefix = self.paths.get(under, [None])[0]
+            if prefix is None:
+                return []
+            paths = [i for i in paths if i[:len(prefix)] == prefix and len(i) > len(prefix)]
+        return [self.resolve(i) for i in paths]
+    
+    def first(self, __key: Any, __default: Optional[Any]=None, under: Optional[Any]=None) -> Any:
+        values = self.get(__key, under=under)
+        return values[0] if values else __default
+    
+    @classmethod
+    def build(cls, documents: Dict[Any, T]) -> Dict[Any, 'PathIndex[T]']:
+        '''Indexes every loaded document (E.g {surahID: PathIndex(surah)})'''
+        return OrderedDict({name: cls(document) for name, document in documents.items()})
+
+def deep_sizeof(obj: Any) -> int:
+    '''Resident bytes of a parsed dataset (the object and every dict/list/tuple/set item it holds, counted once)'''
+    seen, stack, size = set(), [obj], 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+class DatasetCache:
+    '''
+    ### Note:
+        >>> Byte-size bounded LRU shared by LazyArgMapper instances.
+            Sizes are the on-disk size of each dataset file (cheap proxy for its parsed size).
+
+    - max_bytes=None keeps every parsed dataset resident (no eviction).
+    - `sizeof(key, data)` overrides how an entry is sized (E.g deep_sizeof of the parsed data).
+    - `stats` holds per-entry hit/miss/eviction counters and the size of each resident entry.
+    '''
+    def __init__(self, max_bytes: Optional[int]=None, sizeof: Optional[Callable[[Any, Any], int]]=None) -> None:
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda path, data: path.stat().st_size)
+        self._entries: OrderedDict[Path, Tuple[Any, int]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats: Dict[str, Dict[str, int]] = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, __path: Path) -> bool:
+        return __path in self._entries
+    
+    @property
+    def resident_bytes(self) -> int:
+        return sum(size for _, size in self._entries.values())
+    
+    def get(self, path: Path, load: Callable[[Path], Any]) -> Any:
+        with self._lock:
+            stats = self.stats.setdefault(str(path), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0})
+            if path in self._entries:
+                stats['hits'] += 1
+                self._entries.move_to_end(path)
+                return self._entries[path][0]
+            stats['misses'] += 1
+            data = load(path)
+            size = self.sizeof(path, data)
+            self._entries[path] = (data, size)
+            stats['size'] = size
+            self._evict()
+            return data
+    
+    def put(self, path: Path, data: Any) -> None:
+        '''Replaces (or adds) a resident entry (E.g a reloaded dataset)'''
+        with self._lock:
+            self._entries.pop(path, None)
+            self._entries[path] = (data, self.sizeof(path, data))
+            self.stats.setdefault(str(path), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0})['size'] = self._entries[path][1]
+            self._evict()
+    
+    def _evict(self) -> None:
+        #** The most recently loaded entry is always kept, even if it alone exceeds `max_bytes`
+        while self.max_bytes is not None and len(self._entries) > 1 and self.resident_bytes > self.max_bytes:
+            path, _ = self._entries.popitem(last=False)
+            self.stats.setdefault(str(path), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0})['evictions'] += 1
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def report(self) -> Dict[str, Dict[str, Union[int, bool]]]:
+        '''Per-entry counters including whether the dataset is currently resident'''
+        with self._lock:
+            resident = {str(i) for i in self._entries}
+            return OrderedDict({path: {**stats, 'resident': path in resident}
+                                for path, stats in self.stats.items()})
+
+class LazyArgMapper[T: Dict[str, Path]](ArgMapper):
+    '''
+        [LAZY ArgMapper]
+        
+        ~Holds file paths instead of contents. A dataset is parsed on first attribute access
+        and kept in a (shared) DatasetCache, which may evict rarely used datasets.
+        1. Access is the same as ArgMapper (attribute name, brackets or `get`).
+        2. `paths` returns the underlying {file_name: Path} mapping without parsing anything.
+        3. `stats` returns hit/miss/size counters for the datasets of this mapper.
+    '''
+    def __init__(self, dict_: T, parser: Callable[[Path], Any], cache: Optional[DatasetCache]=None, max_bytes: Optional[int]=None) -> None:
+        self._parser = parser
+        self.cache = cache if cache is not None else DatasetCache(max_bytes)
+        super().__init__(dict_)
+    
+    def _set_attrs(self):
+        #** Nothing is parsed up front
+        return None
+    
+    def __getattr__(self, __key: AnyStr) -> Any:
+        if __key.startswith('_') or __key not in self.dict_:
+            raise AttributeError(f'`{__key}` is not an attribute')
+        return self.get(__key)
+    
+    def get(self, __key: AnyStr, __default: Optional[Any]=None) -> Any:
+        if str(__key) not in self.dict_:
+            return __default
+        return self.cache.get(self.dict_[str(__key)], self._parser)
+    
+    def values(self) -> Generator[Any, None, None]:
+        return (self.get(key) for key in self.dict_)
+    
+    def items(self) -> Generator[Tuple[str, Any], None, None]:
+        return ((key, self.get(key)) for key in self.dict_)
+    
+    @property
+    def get_files(self) -> ItemsView:
+        return self.dict_.items()
+    
+    @property
+    def paths(self) -> T:
+        return self.dict_
+    
+    @property
+    def stats(self) -> Dict[str, Dict[str, Union[int, bool]]]:
+        report = self.cache.report()
+        return OrderedDict({key: report.get(str(path), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'resident': False})
+                            for key, path in self.dict_.items()})
+    
+    @property
+    def reset(self) -> Dict:
+        '''Resets LazyArgMapper back to (fully parsed) Dictionary instance'''
+        return OrderedDict(self.items())
+
 class DataLoader[T: Union[IO[str], str]]:
     def __init__(self, folder_path: T='jsons', file_ext: Optional[AnyStr]='json', ext_path: T='') -> Union[Dict, ArgMapper]:
         '''
@@ -236,8 +448,31 @@ class DataLoader[T: Union[IO[str], str]]:
         file_name = file_path.stem 
         data = json_map() if not self.ext_path else ext_map()
         return file_name, data
+    
+    def _read_file(self, file_path: Path) -> Union[Dict, List[str]]:
+        '''Parses a single file without caching it (used by LazyArgMapper)'''
+        with open(file_path, encoding='utf-8') as file:
+            if self.ext_path:
+                return file.read().splitlines()
+            try:
+                return json.load(file)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Error decoding JSON for {file_path.stem} at `{file_path}`: {e}")
 
-    def __call__(self, mapper: bool=False) -> Union[Dict, ArgMapper]:
+    def __call__(self, mapper: bool=False, lazy: bool=False, max_bytes: Optional[int]=None,
+                cache: Optional[DatasetCache]=None) -> Union[Dict, ArgMapper, LazyArgMapper]:
+        '''
+        ### Args:
+        :param mapper Optional[bool]: Returns an ArgMapper instance instead of a Dictionary.
+        :param lazy Optional[bool]: Returns a LazyArgMapper (files are parsed on first access, implies `mapper`).
+        :param max_bytes Optional[int]: Byte budget for resident datasets of a lazy mapper (LRU eviction).
+        :param cache Optional[DatasetCache]: Shares one byte budget between several lazy mappers.
+        '''
+        if lazy:
+            #** Same files as the eager mode (files directly under `path`, subdirectories are not mapped)
+            file_paths = OrderedDict({file_path.stem: file_path for file_path in self._get_all_files()
+                                    if file_path.is_file() and file_path.parent==self.path})
+            return LazyArgMapper(file_paths, parser=self._read_file, cache=cache, max_bytes=max_bytes)
         #** Using OrderedDict to maintain files in chronological order as they appear in the directory.
         all_files: Dict= OrderedDict()
         with ThreadPoolExecutor(max_workers=cpu_count() // 2) as executor:
@@ -465,22 +700,29 @@ class CSVProcessor[T: ArgMapper[pd.DataFrame]]:
 class NLTKLoader:
     _stopwords = None
     _nltk = None
+    VERSION = 1
+    #^ Compiled stopword artifact (no network access needed at runtime)
+    ARTIFACT = MAIN_DIR / 'stopwords' / 'stopwords.json'
     '''
     ### Note:
         >>> The NLTKLoader class is designed to provide a convenient way for accessing
             a unified set of NLTK stopwords from all languages to be used for Tensforflow text filtering.
+        >>> Stopwords are read from a compiled, versioned artifact (islamic_data/stopwords/stopwords.json)
+            holding sorted per-language lists and a sha256 checksum. The artifact is compiled from NLTK's
+            stopwords corpus by a build step (`python -m blueprints.resource_handler --compile-stopwords --download`);
+            imports never download: a missing artifact is only compiled from a corpus already on disk.
+            Artifacts compiled from any other corpus are rejected so filtering always matches the NLTK lists.
     '''
-    def __init__(self, __ext_path=None) -> None:
+    def __init__(self, __ext_path=None, languages: Optional[Tuple[str, ...]]=None) -> None:
         '''
         ### Args:
-        - __ext_path: A dummy argument mainly used for caching purposes.
-            It represents the path to the NLTK stopwords data directory, but its value does not
-            affect the functionality of the class. The class caches the stopwords, so this
-            argument is provided for caching purposes.
+        - __ext_path: Path to a local NLTK stopwords corpus. Only used by `compile` when the artifact is missing.
+        - languages: Optional languages to select (e.g ('english', 'arabic')). Defaults to every language.
         '''
         if __ext_path is None:
             __ext_path = Path.home() / 'nltk_data/corpora/stopwords'
         self.ext_path = __ext_path
+        self.languages = languages
     
     @cached_property
     def _filter_stopwords(self) -> List[str]:
@@ -489,41 +731,619 @@ class NLTKLoader:
         The STOPWORDS property filters and combines NLTK stopwords from multiple languages into
         a single set then converted back into a list for Tensorflow purposes. It ensures efficient and consistent access to common stop words for
         natural language processing and text analysis.
-
-        Note:
-            >>> This property utilizes the NLTK library and its data, and it may perform an initial
-            download of the stopwords data if not already present in the specified or default path.
         '''
         stopwords = [[word for word in words if word] \
                     for lang, words in self.nltk.items() \
-                    if re.match(r'[a-z].*[a-z]$', lang)]
-        cleaned_stopwords = OrderedDict.fromkeys(*[map(str.lower, chain.from_iterable(stopwords))])
+                    if re.match(r'[a-z].*[a-z]$', lang) and (not self.languages or lang in self.languages)]
+        cleaned_stopwords = OrderedDict.fromkeys(map(str.lower, chain.from_iterable(stopwords)))
         return list(cleaned_stopwords)
     
     @cached_property
     def stopwords(self) -> List[str]:
+        if self.languages:
+            return self._filter_stopwords
         if NLTKLoader._stopwords is None:
-            nltk_stopwords = self._filter_stopwords
-        NLTKLoader._stopwords = nltk_stopwords
+            NLTKLoader._stopwords = self._filter_stopwords
         return NLTKLoader._stopwords
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_stopwords(cls, lang: Optional[AnyStr]=None) -> frozenset:
+        '''Stopwords of a single language (lowercase frozenset). All languages are merged if `lang` is None'''
+        if lang is None:
+            return frozenset(cls().stopwords)
+        words = cls().nltk.get(str(lang).lower())
+        if words is None:
+            raise KeyError(f'No stopwords available for `{lang}`')
+        return frozenset(map(str.lower, words))
+    
+    @classmethod
+    def _load_artifact(cls, artifact: Path) -> Dict[str, List[str]]:
+        with open(artifact, encoding='utf-8') as file:
+            contents = json.load(file)
+        if contents.get('version') != cls.VERSION:
+            raise ValueError(f'Stopword artifact version {contents.get("version")} is not supported (expected {cls.VERSION})')
+        if cls._checksum(contents['languages']) != contents.get('sha256'):
+            raise ValueError(f'Stopword artifact `{artifact}` is corrupted (checksum mismatch)')
+        if contents.get('source') != 'nltk':
+            raise ValueError(f'Stopword artifact `{artifact}` was not compiled from the NLTK corpus ({contents.get("source")})')
+        return contents['languages']
+    
+    @staticmethod
+    def _checksum(languages: Dict[str, List[str]]) -> str:
+        return hashlib.sha256(json.dumps(languages, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def _corpus_dir(cls, source_dir: Optional[Path]=None, download: bool=False) -> Path:
+        '''Local NLTK stopwords corpus (searches every nltk.data path, downloads it only if `download`)'''
+        if source_dir and Path(source_dir).is_dir():
+            return Path(source_dir)
+        import nltk
+        try:
+            return Path(nltk.data.find('corpora/stopwords'))
+        except LookupError:
+            if not download:
+                raise FileNotFoundError('NLTK stopwords corpus not found. Compile the artifact with '
+                                        '`python -m blueprints.resource_handler --compile-stopwords --download`') from None
+            nltk.download('stopwords', quiet=True, raise_on_error=True)
+            return Path(nltk.data.find('corpora/stopwords'))
+    
+    @classmethod
+    def compile(cls, source_dir: Optional[Path]=None, artifact: Optional[Path]=None, source: AnyStr='nltk', download: bool=False) -> Path:
+        '''
+        Compiles NLTK's stopwords corpus directory (one `<language>` file per language, one word per line)
+        into the sorted, checksummed artifact loaded by NLTKLoader.
+        '''
+        source_dir = cls._corpus_dir(source_dir, download)
+        artifact = artifact or cls.ARTIFACT
+        languages = OrderedDict()
+        for file in sorted(source_dir.iterdir()):
+            if file.is_file() and file.suffix in ('', '.txt') and re.match(r'^[a-z].*[a-z]$', file.stem):
+                words = {i.strip().lower() for i in file.read_text(encoding='utf-8').splitlines()}
+                languages[file.stem] = sorted(i for i in words if i)
+        if not languages:
+            raise FileNotFoundError(f'No stopword files found in `{source_dir}`')
+        contents = OrderedDict({'version': cls.VERSION,
+                                'source': source,
+                                'sha256': cls._checksum(languages),
+                                'languages': languages})
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        with open(artifact, mode='w', encoding='utf-8') as file:
+            json.dump(contents, file, ensure_ascii=False, separators=(',', ':'))
+        print(f'\033[1;32mCompiled {len(languages)} stopword languages into {artifact}\033[0m')
+        return artifact
 
     @lru_cache(maxsize=None)
     def _nltk_files(self) -> ArgMapper:
-        ssl._create_default_https_context = ssl._create_unverified_context
-        download('stopwords', quiet=True, force=True, raise_on_error=True)
-        return DataLoader(ext_path=self.ext_path).mapper
+        try:
+            return ArgMapper(self._load_artifact(self.ARTIFACT))
+        except (FileNotFoundError, ValueError) as error:
+            #** Missing, stale or non-NLTK artifact: compiled from a local NLTK corpus (never downloaded at import)
+            print(f'\033[1;33m{error}. Compiling it from the local NLTK stopwords corpus\033[0m')
+            self.compile(self.ext_path)
+            return ArgMapper(self._load_artifact(self.ARTIFACT))
     
     @cached_property
     def nltk(self) -> ArgMapper[Dict]:
         if NLTKLoader._nltk is None:
-            nltk_files = self._nltk_files()
-        NLTKLoader._nltk = nltk_files
+            NLTKLoader._nltk = self._nltk_files()
         return NLTKLoader._nltk
 
+@dataclass(frozen=True)
+class VerseRange:
+    '''
+    ### Note:
+        >>> Parsed verse reference. `end=None` runs to the last ayah of the surah.
+
+    - "2:255-257" -> VerseRange(2, 255, 257)
+    - "2:255"     -> VerseRange(2, 255, 255)
+    - "2"         -> VerseRange(2, 1, None) (whole surah)
+    - "255-257" with surahID=2 -> VerseRange(2, 255, 257) (a bare number is then an ayah)
+    '''
+    surahID: int
+    start: int = 1
+    end: Optional[int] = None
+    
+    def __str__(self) -> str:
+        if self.end is None:
+            return f'{self.surahID}' if self.start == 1 else f'{self.surahID}:{self.start}-'
+        return f'{self.surahID}:{self.start}' + (f'-{self.end}' if self.end != self.start else '')
+    
+    @classmethod
+    def parse(cls, ref: AnyStr, surahID: Optional[Union[int, str]]=None) -> 'VerseRange':
+        match_ = re.fullmatch(r'\s*(?:(\d{1,3})\s*:\s*)?(\d{1,3})(?:\s*-\s*(\d{1,3}))?\s*', str(ref))
+        if not match_:
+            raise ValueError(f'Invalid verse reference `{ref}` (E.g 2:255-257, 2:255, 2)')
+        surah, start, end = match_.groups()
+        if surah is None and surahID is None:
+            verse_range = cls(int(start)) if end is None else None
+        else:
+            verse_range = cls(int(surah or surahID), int(start), int(end or start))
+        if verse_range is None or not 1 <= verse_range.surahID <= 114 or verse_range.start < 1 \
+                or (verse_range.end is not None and verse_range.end < verse_range.start):
+            raise ValueError(f'Invalid verse reference `{ref}` (E.g 2:255-257, 2:255, 2)')
+        return verse_range
+    
+    def ayahs(self, verse_count: int) -> range:
+        '''Ayahs of the range that exist in a surah of `verse_count` verses'''
+        return range(self.start, min(verse_count if self.end is None else self.end, verse_count) + 1)
+
+class QuranStore:
+    '''
+    ### Note:
+        >>> The QuranStore class compiles the Quran corpus (jsons/quran/<source>) into a memory-mapped
+            columnar store so a single verse can be read without json.loads on a whole surah file.
+
+    Layout (islamic_data/store/<source> -> <source>@<sha256>, a symlink to the current build):
+        - manifest.json: surah offsets (`{surahID: [start, verse_count]}`), column names and byte order.
+        - columns/<n>.bin: UTF-8 verse blobs of one column (language or language/translator) concatenated.
+        - columns/<n>.idx: uint64 offset table (total verses + 1) indexed by the verse ordinal.
+    Verses are stored in reading order (columns scraped reversed, E.g surah-quran `Arabic`, are un-reversed at build).
+
+    Builds are serialized across processes with a file lock (store/.<source>.lock) and written to a per-pid
+    temporary directory, so concurrent builders (gunicorn workers, the scrapers) never share a half-written tree.
+    A finished build is published by atomically replacing the `<source>` symlink; readers pin the build they
+    opened the manifest of, so their columns always come from that same build (the previous build is kept).
+
+    E.g
+        - QuranStore.build('surah-quran')
+        - QuranStore.ensure('surah-quran')     #** Builds only if missing (startup)
+        - QuranStore.refresh('surah-quran')    #** Rebuilds only if the source files changed, otherwise reopens (hot reload)
+        - QuranStore.get('surah-quran').verse('English', 1, 1)
+    '''
+    VERSION = 2
+    SOURCES = ('surah-quran', 'altafsir', 'verse-meanings')
+    #^ Columns whose verses were scraped reversed (same as CSVProcessor.process_surahquran)
+    _REVERSED = {'surah-quran': ('Arabic',)}
+    _stores: Dict[str, 'QuranStore'] = {}
+    
+    def __init__(self, source: AnyStr='surah-quran', path: Optional[Path]=None) -> None:
+        self.source = source
+        self.link = (path or STORE_DIR) / source
+        self._path: Optional[Path] = None
+        self._manifest: Optional[Dict] = None
+        self._column_ids: Optional[Dict[str, int]] = None
+        self._columns: Dict[int, Tuple[Union[mmap.mmap, bytes], memoryview]] = {}
+        self._version: Optional[str] = None
+    
+    def __str__(self) -> str:
+        return f'{self.source}: {self.languages}'
+    
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(source={self.source!r}, built={self.built})'
+    
+    def __contains__(self, __lang: AnyStr) -> bool:
+        return self.built and __lang in self.column_ids
+    
+    @classmethod
+    def get(cls, source: AnyStr='surah-quran') -> 'QuranStore':
+        '''Returns the per-process reader for `source` (mmaps are shared across all callers)'''
+        if source not in cls._stores:
+            cls._stores[source] = cls(source)
+        return cls._stores[source]
+    
+    @property
+    def path(self) -> Path:
+        '''Build directory of this reader (pinned once the manifest is read)'''
+        return self._path or self.link.resolve()
+    
+    @property
+    def built(self) -> bool:
+        #** Stores compiled with an older layout (E.g VERSION 1 kept Arabic reversed) count as unbuilt
+        return (self.path / 'manifest.json').is_file() and self.manifest.get('version') == self.VERSION
+    
+    @property
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            self._path = self.link.resolve()
+            with open(self._path / 'manifest.json', encoding='utf-8') as file:
+                self._manifest = json.load(file)
+        return self._manifest
+    
+    @property
+    def version(self) -> str:
+        '''Content hash of the compiled verses (changes whenever a rebuild changes any verse)'''
+        if not self.built:
+            return 'unbuilt'
+        if self._version is None:
+            self._version = self.manifest.get('sha256') or hashlib.sha256((self.path / 'manifest.json').read_bytes()).hexdigest()[:16]
+        return self._version
+    
+    @property
+    def column_ids(self) -> Dict[str, int]:
+        if self._column_ids is None:
+            self._column_ids = {name: idx for idx, name in enumerate(self.manifest['columns'])}
+        return self._column_ids
+    
+    @property
+    def languages(self) -> List[str]:
+        return list(self.manifest['columns']) if self.built else []
+    
+    def verse_count(self, surahID: Union[int, str]) -> int:
+        return self.manifest['surahs'].get(str(surahID), [0, 0])[1]
+    
+    def _column(self, lang: AnyStr) -> Tuple[Union[mmap.mmap, bytes], memoryview]:
+        idx = self.column_ids[lang]
+        if idx not in self._columns:
+            blob_path, idx_path = (self.path / 'columns' / f'{idx}.{ext}' for ext in ('bin', 'idx'))
+            with open(idx_path, 'rb') as file:
+                offsets = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)).cast('Q')
+            if not blob_path.stat().st_size:
+                #** mmap cannot map empty files (column without any verse)
+                blob = b''
+            else:
+                with open(blob_path, 'rb') as file:
+                    blob = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._columns[idx] = (blob, offsets)
+        return self._columns[idx]
+    
+    def verse(self, lang: AnyStr, surahID: Union[int, str], ayah: int) -> Optional[str]:
+        '''O(1) lookup of a single verse. Returns None if the verse is missing for this column'''
+        start, count = self.manifest['surahs'].get(str(surahID), [0, 0])
+        if lang not in self or not 1 <= int(ayah) <= count:
+            return None
+        blob, offsets = self._column(lang)
+        ordinal = start + int(ayah) - 1
+        begin, end = offsets[ordinal], offsets[ordinal+1]
+        return None if begin==end else bytes(blob[begin:end]).decode('utf-8')
+    
+    def verses(self, lang: AnyStr, surahID: Union[int, str], start: int=1, end: Optional[int]=None) -> Dict[str, str]:
+        '''Returns {'verse surahID:ayah': verse} for the inclusive ayah range [start, end]'''
+        count = self.verse_count(surahID)
+        end = count if end is None else min(int(end), count)
+        range_ = range(max(int(start), 1), end+1)
+        all_verses = OrderedDict({f'verse {surahID}:{ayah}': self.verse(lang, surahID, ayah) for ayah in range_})
+        return OrderedDict({k: v for k, v in all_verses.items() if v is not None})
+    
+    def surah(self, lang: AnyStr, surahID: Union[int, str]) -> Dict[str, str]:
+        return self.verses(lang, surahID)
+    
+    @staticmethod
+    def _get_columns(source: AnyStr, surah: Dict) -> Generator[Tuple[str, Dict], None, None]:
+        '''Yields (column_name, {'verse s:a': text}) for every column of one surah file'''
+        match source:
+            case 'surah-quran':
+                yield from surah.get('verses', {}).items()
+            case 'altafsir':
+                for lang, lang_contents in nested('languages', surah)[0].items():
+                    for _, translators in lang_contents['translators'].items():
+                        for name, verses in translators.items():
+                            yield f'{lang}/{name}', verses
+            case 'verse-meanings':
+                verse_info = surah.get('verse-info', [])
+                for key in ('verse', 'description'):
+                    yield key, {j['verse-id']: ''.join(j[key]) if isinstance(j[key], list) else j[key] for j in verse_info}
+            case _:
+                raise ValueError(f'`{source}` is not a supported Quran source {QuranStore.SOURCES}')
+    
+    @staticmethod
+    @contextmanager
+    def _build_lock(source: AnyStr, path: Optional[Path]=None) -> Generator[None, None, None]:
+        '''Exclusive (cross-process) lock of one source's build'''
+        lock_path = (path or STORE_DIR) / f'.{source}.lock'
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    @classmethod
+    def ensure(cls, source: AnyStr='surah-quran', path: Optional[Path]=None) -> 'QuranStore':
+        '''Builds the store only if it is missing (processes waiting on the lock reuse the finished build)'''
+        if cls(source, path).built:
+            return cls.get(source) if path is None else cls(source, path)
+        with cls._build_lock(source, path):
+            if cls(source, path).built:
+                cls._stores.pop(source, None)
+                return cls.get(source) if path is None else cls(source, path)
+            return cls._build(source, path)
+    
+    @classmethod
+    def refresh(cls, source: AnyStr='surah-quran', path: Optional[Path]=None) -> 'QuranStore':
+        '''
+        Rebuilds the store if its source files changed since the last build, otherwise reopens it.
+        Every watching process calls it: the first one to take the build lock rebuilds, the others reopen that build.
+        '''
+        with cls._build_lock(source, path):
+            store = cls(source, path)
+            if not store.built or store.manifest.get('sources') != cls._sources_hash(source):
+                return cls._build(source, path)
+            cls._stores.pop(source, None)
+            return cls.get(source) if path is None else store
+    
+    @staticmethod
+    def _sources_hash(source: AnyStr) -> str:
+        return content_hash(*DataLoader(folder_path=f'jsons/quran/{source}').get_files.values())
+    
+    @classmethod
+    def build(cls, source: AnyStr='surah-quran', path: Optional[Path]=None) -> 'QuranStore':
+        '''Compiles jsons/quran/<source> into the memory-mapped store (replaces any previous build)'''
+        with cls._build_lock(source, path):
+            return cls._build(source, path)
+    
+    @classmethod
+    def _build(cls, source: AnyStr='surah-quran', path: Optional[Path]=None) -> 'QuranStore':
+        _verseID = re.compile(r'(\d{1,3}):(\d{1,3})')
+        surah_files = DataLoader(folder_path=f'jsons/quran/{source}').get_files
+        all_surahs = OrderedDict()
+        for file_name, file_path in surah_files.items():
+            with open(file_path, encoding='utf-8') as file:
+                all_surahs[int(file_name.split('-')[0])] = json.load(file)
+        
+        surahs, columns, total = OrderedDict(), OrderedDict(), 0
+        for surahID in range(1, 115):
+            surah = all_surahs.get(surahID, {})
+            verse_count = surah.get('verses_count', surah.get('verse-count', 0))
+            surahs[str(surahID)] = [total, verse_count]
+            for name, verses in cls._get_columns(source, surah) if surah else ():
+                column = columns.setdefault(name, {})
+                reversed_ = name in cls._REVERSED.get(source, ())
+                for verseID, verse in verses.items():
+                    match_ = _verseID.search(verseID)
+                    if match_ and verse and 1 <= int(match_.group(2)) <= verse_count:
+                        column[total + int(match_.group(2)) - 1] = verse[::-1] if reversed_ else verse
+            total += verse_count
+        
+        store_path = (path or STORE_DIR) / source
+        tmp_path = store_path.with_name(f'.{source}.{getpid()}.tmp')
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        (tmp_path / 'columns').mkdir(parents=True)
+        verses_hash = hashlib.sha256()
+        for idx, (name, column) in enumerate(columns.items()):
+            verses_hash.update(f'\0{name}\0'.encode('utf-8'))
+            offsets, offset = array('Q', [0]), 0
+            with open(tmp_path / 'columns' / f'{idx}.bin', 'wb') as blob:
+                for ordinal in range(total):
+                    encoded = column.get(ordinal, '').encode('utf-8')
+                    verses_hash.update(encoded)
+                    blob.write(encoded)
+                    offset += len(encoded)
+                    offsets.append(offset)
+            with open(tmp_path / 'columns' / f'{idx}.idx', 'wb') as file:
+                offsets.tofile(file)
+        manifest = OrderedDict({'version': cls.VERSION,
+                                'source': source,
+                                'byteorder': sys.byteorder,
+                                'total': total,
+                                'sha256': verses_hash.hexdigest()[:16],
+                                'sources': content_hash(*surah_files.values()),
+                                'surahs': surahs,
+                                'columns': list(columns)})
+        with open(tmp_path / 'manifest.json', 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=4, ensure_ascii=False)
+        cls._publish(store_path, tmp_path, f"{source}@{manifest['sha256']}")
+        cls._stores.pop(source, None)
+        print(f'\033[1;32mCompiled `{source}` ({len(columns)} columns, {total} verses) into {store_path}\033[0m')
+        return cls.get(source) if path is None else cls(source, path)
+    
+    @staticmethod
+    def _publish(store_path: Path, tmp_path: Path, name: AnyStr) -> None:
+        '''Moves a finished build to `name` and atomically points the `store_path` symlink at it'''
+        build_path = store_path.with_name(name)
+        if build_path.is_dir():
+            #** Same verses as an existing build (content-addressed)
+            shutil.rmtree(tmp_path)
+        else:
+            tmp_path.rename(build_path)
+        previous = store_path.resolve() if store_path.is_symlink() else None
+        if store_path.is_dir() and not store_path.is_symlink():
+            #** Store compiled before the symlink layout
+            shutil.rmtree(store_path)
+        link_path = store_path.with_name(f'.{store_path.name}.{getpid()}.link')
+        link_path.unlink(missing_ok=True)
+        link_path.symlink_to(name)
+        link_path.replace(store_path)
+        #** Readers may still have the previous build pinned, older ones are removed
+        for old_path in store_path.parent.glob(f'{store_path.name}@*'):
+            if old_path not in (build_path, previous):
+                shutil.rmtree(old_path, ignore_errors=True)
+    
+    @classmethod
+    def build_all(cls) -> List['QuranStore']:
+        return [cls.build(source) for source in cls.SOURCES]
+    
+    @classmethod
+    def ensure_all(cls) -> List['QuranStore']:
+        return [cls.ensure(source) for source in cls.SOURCES]
+
+class StoreUnavailableError(LookupError):
+    '''The compiled QuranStore of a source is missing (build it offline or at startup with QuranStore.ensure)'''
+
+class ArabicNormalizer:
+    '''
+    ### Note:
+        >>> Folds Arabic script into a search form: tashkeel/tatweel stripped and
+            alef, hamza, ya and ta-marbuta variants folded to one letter.
+
+    E.g
+        - ArabicNormalizer.normalize('الرَّحْمَٰنِ') -> 'الرحمن'
+        - ArabicNormalizer.light_stem('والكتاب') -> 'كتاب'
+    '''
+    _ARABIC = re.compile(r'[\u0600-\u06FF]')
+    _TASHKEEL = re.compile(r'[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]')
+    _FOLD = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ى': 'ي', 'ئ': 'ي', 'ؤ': 'و', 'ة': 'ه'})
+    #^ Light10 affixes (applied after folding, so ة/ى are already ه/ي)
+    _PREFIXES = ('وال', 'بال', 'كال', 'فال', 'لل', 'ال')
+    _SUFFIXES = ('ها', 'ان', 'ات', 'ون', 'ين', 'يه', 'ه', 'ي')
+    
+    @classmethod
+    def is_arabic(cls, text: AnyStr) -> bool:
+        return bool(cls._ARABIC.search(text))
+    
+    @classmethod
+    def normalize(cls, text: AnyStr) -> str:
+        return cls._TASHKEEL.sub('', text).translate(cls._FOLD)
+    
+    @classmethod
+    def light_stem(cls, term: AnyStr) -> str:
+        if not cls.is_arabic(term):
+            return term
+        if term.startswith('و') and len(term) > 3:
+            term = term[1:]
+        for prefix in cls._PREFIXES:
+            if term.startswith(prefix) and len(term) - len(prefix) >= 2:
+                term = term[len(prefix):]
+                break
+        for suffix in cls._SUFFIXES:
+            if term.endswith(suffix) and len(term) - len(suffix) >= 2:
+                term = term[:-len(suffix)]
+        return term
+
+class KeywordIndex:
+    '''
+    ### Note:
+        >>> The KeywordIndex class is an inverted index over the QuranStore columns
+            (surah-quran languages, altafsir translators and verse-meanings descriptions).
+
+    - Columns are indexed lazily (first query per column) and kept in an LRU of `max_columns`.
+    - Postings are positional (`{term: {ordinal: [positions]}}`), so multi-word keywords are matched as phrases.
+    - Results are ranked with BM25 computed per column (each column is its own collection).
+    - Text is indexed in reading order and folded with ArabicNormalizer (tashkeel, alef/hamza/ya/ta-marbuta),
+      so Arabic queries match regardless of diacritics. `stem=True` also matches light-stem variants.
+
+    E.g
+        - KeywordIndex.get('surah-quran').search('mercy', 'English')
+        - KeywordIndex.get('altafsir').search('mercy', 'English/Ibn Kathir')
+    '''
+    K1, B = 1.2, 0.75
+    #^ Default of `stem` for every caller (exact word matches, like the previous corpus/{keyword} counts)
+    STEM = False
+    _TOKEN = re.compile(r'\w+', flags=re.UNICODE)
+    _indexes: Dict[str, 'KeywordIndex'] = {}
+    
+    def __init__(self, source: AnyStr='surah-quran', max_columns: int=16) -> None:
+        self.source = source
+        self.max_columns = max_columns
+        self._columns: Dict[str, Dict[str, Any]] = OrderedDict()
+        self._starts: Optional[List[int]] = None
+        self._lock = threading.RLock()
+    
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(source={self.source!r}, indexed={list(self._columns)})'
+    
+    def __contains__(self, __lang: AnyStr) -> bool:
+        return __lang in self.store
+    
+    @classmethod
+    def get(cls, source: AnyStr='surah-quran') -> 'KeywordIndex':
+        if source not in cls._indexes:
+            cls._indexes[source] = cls(source)
+        return cls._indexes[source]
+    
+    @property
+    def store(self) -> QuranStore:
+        store = QuranStore.get(self.source)
+        #** Never builds inside a request: the store is compiled offline or at startup (QuranStore.ensure)
+        if not store.built:
+            raise StoreUnavailableError(f'The `{self.source}` store is not built yet')
+        return store
+    
+    @property
+    def languages(self) -> List[str]:
+        return self.store.languages
+    
+    @classmethod
+    def tokenize(cls, text: AnyStr, lang: Optional[AnyStr]=None) -> List[str]:
+        #** Tashkeel are combining marks (not `\w`) and would otherwise split Arabic words
+        return cls._TOKEN.findall(ArabicNormalizer.normalize(text.lower()))
+    
+    def verse(self, lang: AnyStr, surahID: Union[int, str], ayah: int) -> Optional[str]:
+        '''Returns the verse in reading order (the store un-reverses scraped columns at build)'''
+        return self.store.verse(lang, surahID, ayah)
+    
+    def _index(self, lang: AnyStr) -> Dict[str, Any]:
+        with self._lock:
+            if lang in self._columns:
+                self._columns.move_to_end(lang)
+                return self._columns[lang]
+            store = self.store
+            postings, lengths = {}, array('I', [0]*store.manifest['total'])
+            for surahID, (start, count) in store.manifest['surahs'].items():
+                for ayah in range(1, count+1):
+                    verse = self.verse(lang, surahID, ayah)
+                    if not verse:
+                        continue
+                    terms = self.tokenize(verse, lang)
+                    lengths[start+ayah-1] = len(terms)
+                    for position, term in enumerate(terms):
+                        postings.setdefault(term, {}).setdefault(start+ayah-1, []).append(position)
+            documents = sum(1 for i in lengths if i)
+            stems = {}
+            for term in postings:
+                stems.setdefault(ArabicNormalizer.light_stem(term), []).append(term)
+            self._columns[lang] = {'postings': postings,
+                                'stems': stems,
+                                'lengths': lengths,
+                                'documents': documents,
+                                'avgdl': sum(lengths) / documents if documents else 0.0}
+            while len(self._columns) > self.max_columns:
+                self._columns.popitem(last=False)
+            return self._columns[lang]
+    
+    def _locate(self, ordinal: int) -> Tuple[int, int]:
+        '''Maps a verse ordinal back to (surahID, ayah)'''
+        starts = self.store.manifest['surahs']
+        if self._starts is None:
+            self._starts = [start for start, _ in starts.values()]
+        surahID = bisect_right(self._starts, ordinal)
+        while not starts[str(surahID)][1]:
+            surahID -= 1
+        return surahID, ordinal - starts[str(surahID)][0] + 1
+    
+    def _matches(self, index: Dict[str, Any], terms: List[str], stem: bool=False) -> Dict[int, List[int]]:
+        '''Returns {ordinal: [start positions]} of the phrase `terms`'''
+        postings = []
+        for term in terms:
+            variants = index['stems'].get(ArabicNormalizer.light_stem(term), [term]) if stem else [term]
+            merged = {}
+            for variant in variants:
+                for ordinal, positions in index['postings'].get(variant, {}).items():
+                    merged.setdefault(ordinal, set()).update(positions)
+            postings.append(merged)
+        if not all(postings):
+            return {}
+        matches = {}
+        for ordinal in set(postings[0]).intersection(*postings[1:]):
+            positions = [i for i in sorted(postings[0][ordinal])
+                        if all(i+offset in postings[offset][ordinal] for offset in range(1, len(terms)))]
+            if positions:
+                matches[ordinal] = positions
+        return matches
+    
+    def search(self, keyword: AnyStr, lang: AnyStr, limit: Optional[int]=None, stem: Optional[bool]=None) -> Dict[str, Any]:
+        '''
+        Counts and locates `keyword` (word or phrase) in the column `lang`.
+        Returns the total count, counts per surah and the verses ranked by BM25.
+        `stem` defaults to KeywordIndex.STEM.
+        '''
+        stem = self.STEM if stem is None else stem
+        terms = self.tokenize(keyword, lang)
+        if lang not in self or not terms:
+            return {'keyword': keyword, 'language': lang, 'total': 0, 'surahs': {}, 'verses': []}
+        index = self._index(lang)
+        matches = self._matches(index, terms, stem)
+        idf = math.log(1 + (index['documents'] - len(matches) + 0.5) / (len(matches) + 0.5))
+        verses, surahs = [], OrderedDict()
+        for ordinal, positions in matches.items():
+            tf, length = len(positions), index['lengths'][ordinal]
+            score = idf * tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * length / index['avgdl']))
+            surahID, ayah = self._locate(ordinal)
+            surahs[str(surahID)] = surahs.get(str(surahID), 0) + tf
+            verses.append({'verse': f'{surahID}:{ayah}', 'count': tf, 'positions': positions, 'score': round(score, 4)})
+        verses.sort(key=lambda i: i['score'], reverse=True)
+        return {'keyword': keyword,
+                'language': lang,
+                'total': sum(surahs.values()),
+                'surahs': OrderedDict(sorted(surahs.items(), key=lambda i: int(i[0]))),
+                'verses': verses[:limit] if limit else verses}
+
 @lru_cache(maxsize=None)
-def loader(*keys: Optional[AnyStr], mapper: bool=False) -> List[Union[ArgMapper, Dict, Exception]]:
+def loader(*keys: Optional[AnyStr], mapper: bool=False, lazy: bool=False, max_bytes: Optional[int]=None) -> List[Union[ArgMapper, Dict, Exception]]:
     '''
     key -> folder name: Optional[str] = None (Loads all JSON files)
+    lazy -> Folders are LazyArgMapper instances (parsed on first access) sharing one DatasetCache bounded by `max_bytes`.
     This function is mainly for this projects data rather for external use.
     Otherwise use DataLoader (dl) ext_path argument if needed.
     (E.g dl(ext_path=Path.home() / 'nltk_data/corpora/stopwords')(mapper: bool=False))
@@ -545,7 +1365,8 @@ def loader(*keys: Optional[AnyStr], mapper: bool=False) -> List[Union[ArgMapper,
     _error = lambda __key, __color=False: f'`{__key}` not found' if not __color \
                                         else f'\033[1;31m`{__key}` is invalid. No available contents.\033[0m'
     
-    _folders: Dict[ArgMapper] = {_JSONS.as_posix() if not folder else folder: DataLoader(folder_path=_JSONS / folder).mapper
+    _cache = DatasetCache(max_bytes) if lazy else None
+    _folders: Dict[ArgMapper] = {_JSONS.as_posix() if not folder else folder: DataLoader(folder_path=_JSONS / folder)(mapper=True, lazy=lazy, cache=_cache)
                                 for folder in _FOLDERS}
     _arg: Dict[ArgMapper] = {_error(key) if key not in _folders else key: _folders.get(key, _error(key, True)) for key in keys}
     if not keys:
@@ -558,21 +1379,395 @@ def loader(*keys: Optional[AnyStr], mapper: bool=False) -> List[Union[ArgMapper,
         else: return _arg #** Dict[ArgMapper] instance
     else: return _error
 
-#^ Filtered NLTK stopwords
-STOPWORDS: List[str] = NLTKLoader().stopwords
-#^ All structured JSON files (JSONs + folders[JSONs])
-'''d
-- Automatically includes future folders in the global scope.
-- Global variables utilized for CSVProcessor.
-- Objects are designated as constants, hence represented in uppercase.
-'''
-globals().update({__folder.upper(): __contents for __folder, __contents in loader(mapper=True).items()})
+class StartupSnapshot:
+    '''
+    ### Note:
+        >>> The StartupSnapshot class persists the fully built module globals (STOPWORDS, JSON folders and CSVS)
+            into a single pickle file and restores them on the next import instead of rebuilding them.
+
+    - The snapshot is keyed by the size/mtime (and optionally sha1 with ISLAMAI_SNAPSHOT_HASH=1) of every source file
+      and of this module, so any change to the data or to the processing code invalidates it automatically.
+    - Set ISLAMAI_SNAPSHOT=0 to always rebuild; ISLAMAI_IMPORT_REPORT=1 prints the import-time breakdown.
+    '''
+    PROTOCOL = 5
+    
+    def __init__(self, path: Optional[Path]=None) -> None:
+        self.path = path or MAIN_DIR / '.snapshot'
+        self.enabled = environ.get('ISLAMAI_SNAPSHOT', '1') != '0'
+        self.hashed = environ.get('ISLAMAI_SNAPSHOT_HASH', '0') == '1'
+        self.report: Dict[str, Union[float, str]] = OrderedDict()
+    
+    def _sources(self) -> List[Path]:
+        json_files = [i for i in (MAIN_DIR / 'jsons').rglob('*')
+                    if i.is_file() and i.relative_to(MAIN_DIR / 'jsons').parts[0] != 'quran']
+        stopword_files = [NLTKLoader.ARTIFACT] if NLTKLoader.ARTIFACT.is_file() else []
+        return sorted([Path(__file__), *json_files, *stopword_files])
+    
+    @cached_property
+    def key(self) -> str:
+        def _fingerprint(file: Path) -> List:
+            stat = file.stat()
+            info = [str(file), stat.st_size, stat.st_mtime_ns]
+            if self.hashed:
+                info.append(hashlib.sha1(file.read_bytes()).hexdigest())
+            return info
+        with self.timer('fingerprint'):
+            fingerprints = [_fingerprint(i) for i in self._sources()]
+        return hashlib.sha256(json.dumps(fingerprints).encode('utf-8')).hexdigest()[:16]
+    
+    @property
+    def file(self) -> Path:
+        return self.path / f'data_loader-{self.key}.pickle'
+    
+    @contextmanager
+    def timer(self, phase: AnyStr) -> Generator[None, None, None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.report[phase] = round(perf_counter() - start, 4)
+    
+    def restore(self) -> Optional[Dict[str, Any]]:
+        '''Returns the snapshot contents or None if it is missing, stale or unreadable'''
+        if not self.enabled or not self.file.is_file():
+            return None
+        try:
+            with self.timer('restore'), open(self.file, 'rb') as file:
+                contents = pickle.load(file)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as error:
+            print(f'\033[1;31mIgnoring unreadable snapshot `{self.file.name}`: {error}\033[0m')
+            return None
+        self.report['source'] = 'snapshot'
+        return contents
+    
+    def save(self, **contents: Any) -> None:
+        if not self.enabled:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self.timer('save'):
+            tmp_file = self.file.with_suffix('.tmp')
+            with open(tmp_file, 'wb') as file:
+                pickle.dump(contents, file, protocol=self.PROTOCOL)
+            tmp_file.replace(self.file)
+            #** Removes snapshots of previous source versions
+            for old_file in self.path.glob('data_loader-*.pickle'):
+                if old_file != self.file:
+                    old_file.unlink(missing_ok=True)
+        self.report['source'] = 'build'
+    
+    def print_report(self) -> None:
+        total = sum(i for i in self.report.values() if isinstance(i, float))
+        print(f'\033[1;32mdata_loader import ({self.report.get("source", "build")}): {total:.4f}s\033[0m')
+        for phase, seconds in self.report.items():
+            if phase != 'source':
+                print(f'    {phase:<12} {seconds:.4f}s')
+
+class SharedDataStore:
+    '''
+    ### Note:
+        >>> The SharedDataStore class publishes the loaded datasets once (in the gunicorn master with preload)
+            into a single anonymous shared mmap that every forked worker inherits and reads without copying it.
+
+    - Each dataset is pickled (protocol 5) with out-of-band buffers, so numpy blocks of DataFrames are
+      rebuilt as read-only views over the segment instead of per-worker arrays.
+    - JSON datasets are exposed as LazyArgMapper instances: a worker unpickles a file on first access
+      into a DatasetCache bounded by ISLAMAI_SHARED_CACHE_BYTES (default 128 MiB, 0 for unbounded) of
+      unpickled (deep_sizeof) bytes, the real per-worker footprint. The segment itself is never copied.
+    - Enabled with ISLAMAI_SHARED_MEMORY=1 (set by gunicorn.conf.py); `memory_report` compares
+      the RSS/PSS of the current process with the shared bytes and the worker's unpickled datasets.
+    - Only numeric blocks are shared without copying (`out_of_band_bytes`). Strings (object-dtype columns of
+      the CSV DataFrames and every JSON dataset) pickle in-band (`in_band_bytes`): each process that reads them
+      unpickles private objects. The master's CSVS are such objects, inherited copy-on-write by the workers
+      (gc.freeze keeps the GC from writing to them, refcount updates still un-share their pages).
+    '''
+    ALIGNMENT = 64
+    _active: Optional['SharedDataStore'] = None
+    
+    def __init__(self, max_bytes: Optional[int]=None) -> None:
+        self.cache = DatasetCache(max_bytes, sizeof=lambda name, data: deep_sizeof(data))
+        self.table: Dict[str, Tuple[int, int, Tuple[Tuple[int, int], ...]]] = OrderedDict()
+        #^ Bytes of the segment read as zero-copy views (numeric blocks) and unpickled per process (everything else)
+        self.out_of_band_bytes = 0
+        self.in_band_bytes = 0
+        self._segment: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+    
+    def __len__(self) -> int:
+        return len(self.table)
+    
+    def __contains__(self, __name: AnyStr) -> bool:
+        return __name in self.table
+    
+    @property
+    def size(self) -> int:
+        return len(self._segment) if self._segment is not None else 0
+    
+    def _align(self, offset: int) -> int:
+        return -(-offset // self.ALIGNMENT) * self.ALIGNMENT
+    
+    def publish(self, datasets: Dict[str, Any]) -> 'SharedDataStore':
+        '''Copies every dataset into one shared memory segment (call once, before the workers fork)'''
+        pickled, offset = [], 0
+        for name, data in datasets.items():
+            buffers: List[pickle.PickleBuffer] = []
+            payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+            raw_buffers = [i.raw() for i in buffers]
+            pickled.append((name, payload, raw_buffers))
+            self.in_band_bytes += len(payload)
+            self.out_of_band_bytes += sum(raw.nbytes for raw in raw_buffers)
+            offset = self._align(offset + len(payload))
+            for raw in raw_buffers:
+                offset = self._align(offset + raw.nbytes)
+        #** MAP_SHARED anonymous memory: shared with (not copied into) every process forked afterwards
+        self._segment = mmap.mmap(-1, max(offset, 1), flags=mmap.MAP_SHARED)
+        self._view = memoryview(self._segment)
+        offset = 0
+        for name, payload, raw_buffers in pickled:
+            start = offset
+            self._view[start:start+len(payload)] = payload
+            offset, buffer_table = self._align(offset + len(payload)), []
+            for raw in raw_buffers:
+                self._view[offset:offset+raw.nbytes] = raw.cast('B')
+                buffer_table.append((offset, raw.nbytes))
+                offset = self._align(offset + raw.nbytes)
+            self.table[name] = (start, len(payload), tuple(buffer_table))
+        self._view = self._view.toreadonly()
+        SharedDataStore._active = self
+        print(f'\033[1;32mPublished {len(self.table)} datasets ({self.size / 1024**2:.1f} MiB) into shared memory '
+              f'({self.out_of_band_bytes / 1024**2:.1f} MiB zero-copy, {self.in_band_bytes / 1024**2:.1f} MiB unpickled per process)\033[0m')
+        return self
+    
+    def load(self, name: AnyStr) -> Any:
+        '''Unpickles `name`; out-of-band buffers stay read-only views over the shared segment'''
+        if isinstance(name, Path):
+            #** Files reloaded by DataWatcher after the segment was published
+            return DataLoader(folder_path=name.parent)._read_file(name)
+        start, length, buffer_table = self.table[name]
+        view = self._view
+        return pickle.loads(view[start:start+length], buffers=[view[i:i+size] for i, size in buffer_table])
+    
+    def mapper(self, prefix: AnyStr, names: List[str]) -> LazyArgMapper:
+        return LazyArgMapper({name: f'{prefix}/{name}' for name in names}, parser=self.load, cache=self.cache)
+    
+    @classmethod
+    def memory_report(cls) -> Dict[str, Union[int, str]]:
+        '''RSS/PSS breakdown (bytes) of the current process from /proc/self/smaps_rollup'''
+        report = OrderedDict({'pid': getpid(), 'shared_segment': cls._active.size if cls._active else 0})
+        if cls._active is not None:
+            report['shared_out_of_band'] = cls._active.out_of_band_bytes
+            report['shared_in_band'] = cls._active.in_band_bytes
+            #** Datasets unpickled by this process (private copies next to the shared segment)
+            report['worker_datasets'] = len(cls._active.cache)
+            report['worker_datasets_bytes'] = cls._active.cache.resident_bytes
+            report['worker_datasets_max_bytes'] = cls._active.cache.max_bytes or 'unbounded'
+        rollup = Path('/proc/self/smaps_rollup')
+        if not rollup.is_file():
+            return report
+        for line in rollup.read_text().splitlines()[1:]:
+            key, value = line.split(':', 1)
+            if key in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty'):
+                report[key.lower()] = int(value.split()[0]) * 1024
+        return report
+
+class DataWatcher(FileSystemEventHandler):
+    '''
+    ### Note:
+        >>> The DataWatcher class watches islamic_data/jsons and reloads only the files that changed,
+            without restarting the server or dropping unrelated warm caches.
+
+    - JSON folders: the changed file is re-parsed and a new folder mapper is swapped into the module
+      globals (read-copy-update: requests holding the previous mapper keep a consistent view).
+    - CSVS: only the DataFrames whose `process_*` method reads the changed file are rebuilt.
+    - Quran sources: the compiled QuranStore of that source is refreshed (rebuilt once under its build lock by the
+      first worker, reopened by the others) and its KeywordIndex dropped (response ETags follow the store version).
+    - `subscribe(pattern, callback)` lets dependents rebind what they derived from the data (E.g quran_blueprint's
+      PathIndex) and invalidate their caches. Modules that imported a global by name keep the old object,
+      so reloadable data is read through `current(name)`.
+    '''
+    _JSONS = MAIN_DIR / 'jsons'
+    _watcher: Optional['DataWatcher'] = None
+    
+    def __init__(self, debounce: float=0.5) -> None:
+        super().__init__()
+        self.debounce = debounce
+        self._subscribers: List[Tuple[str, Callable[[Path], Any]]] = []
+        self._pending: Dict[Path, threading.Timer] = {}
+        self._lock = threading.RLock()
+        self._observer: Optional[Observer] = None
+        self.reloads: Dict[str, int] = OrderedDict()
+    
+    @classmethod
+    def start(cls, debounce: float=0.5) -> 'DataWatcher':
+        '''Starts the (per-process) watcher once'''
+        watcher = cls.get()
+        if watcher._observer is None:
+            watcher.debounce = debounce
+            watcher._observer = Observer()
+            watcher._observer.schedule(watcher, path=str(cls._JSONS), recursive=True)
+            watcher._observer.daemon = True
+            watcher._observer.start()
+        return watcher
+    
+    @classmethod
+    def get(cls) -> 'DataWatcher':
+        if cls._watcher is None:
+            cls._watcher = cls()
+        return cls._watcher
+    
+    def subscribe(self, pattern: AnyStr, callback: Callable[[Path], Any]) -> None:
+        '''`pattern` is a glob relative to islamic_data/jsons (E.g "quran_stats.json", "quran/**")'''
+        self._subscribers.append((pattern, callback))
+    
+    def on_any_event(self, event) -> None:
+        if event.is_directory or event.event_type not in ('modified', 'created', 'moved'):
+            return
+        path = Path(getattr(event, 'dest_path', '') or event.src_path)
+        if path.suffix != '.json':
+            return
+        #** Editors write files in several events; only the last one (after `debounce`) is reloaded
+        with self._lock:
+            if path in self._pending:
+                self._pending[path].cancel()
+            self._pending[path] = threading.Timer(self.debounce, self.reload, args=(path,))
+            self._pending[path].daemon = True
+            self._pending[path].start()
+    
+    @staticmethod
+    def _dependents(folder: AnyStr, name: AnyStr) -> List[str]:
+        '''CSVProcessor frames whose `process_*` method reads `<FOLDER>.<name>` (or <FOLDER>[name])'''
+        def _names(code) -> set:
+            names = set(code.co_names) | {i for i in code.co_consts if isinstance(i, str)}
+            for const in code.co_consts:
+                if hasattr(const, 'co_names'):
+                    names |= _names(const)
+            return names
+        frames = []
+        for frame in CSVProcessor()._get_methods():
+            names = _names(getattr(CSVProcessor, f'process_{frame}').__code__)
+            if folder.upper() in names and name in names:
+                frames.append(frame)
+        return frames
+    
+    def reload(self, path: Path) -> None:
+        with self._lock:
+            self._pending.pop(path, None)
+        module = globals()
+        rel_path = path.relative_to(self._JSONS)
+        try:
+            if rel_path.parts[0] == 'quran':
+                source = rel_path.parts[1] if len(rel_path.parts) > 2 else None
+                if source in QuranStore.SOURCES and QuranStore.get(source).built:
+                    QuranStore.refresh(source)
+                    KeywordIndex._indexes.pop(source, None)
+                #** Quran files are not part of the snapshot key: the edited content itself versions the responses
+                module['DATA_VERSION'] = hashlib.sha256(f'{DATA_VERSION}\0{rel_path}\0'.encode('utf-8') + path.read_bytes()).hexdigest()[:16]
+            else:
+                folder = rel_path.parts[0] if len(rel_path.parts) > 1 else self._JSONS.as_posix().rsplit('/', 1)[-1]
+                mapper = module.get(folder.upper())
+                if mapper is None:
+                    return
+                data = DataLoader(folder_path=path.parent)._read_file(path)
+                if isinstance(mapper, LazyArgMapper):
+                    new_mapper = LazyArgMapper({**mapper.paths, path.stem: path}, parser=mapper._parser, cache=mapper.cache)
+                    new_mapper.cache.put(path, data)
+                else:
+                    new_mapper = ArgMapper({**mapper.reset, path.stem: data})
+                module[folder.upper()] = new_mapper
+                
+                frames = self._dependents(folder, path.stem)
+                if frames and CSVProcessor._dataframes is not None:
+                    processor, dataframes = CSVProcessor(), OrderedDict(CSVProcessor._dataframes.reset)
+                    for frame in frames:
+                        dataframes[frame] = asyncio.run(getattr(processor, f'process_{frame}')())
+                    module['CSVS'] = CSVProcessor._dataframes = ArgMapper(dataframes)
+                module['DATA_VERSION'] = StartupSnapshot().key
+        except (ValueError, KeyError, OSError) as error:
+            #** A half-written or invalid file keeps the previous (consistent) data
+            print(f'\033[1;31mReload of `{rel_path}` failed, keeping the previous data: {error}\033[0m')
+            return
+        self.reloads[rel_path.as_posix()] = self.reloads.get(rel_path.as_posix(), 0) + 1
+        for pattern, callback in self._subscribers:
+            if rel_path.match(pattern) or fnmatch(rel_path.as_posix(), pattern):
+                callback(path)
+        print(f'\033[1;32mReloaded `{rel_path}`\033[0m')
+
+def content_hash(*paths: Path) -> str:
+    '''sha256 of the contents of `paths` (independent of mtimes, E.g a touched but unchanged file keeps its hash)'''
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(f'\0{path.name}\0'.encode('utf-8'))
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()[:16]
+
+def current(name: AnyStr) -> Any:
+    '''
+    Current value of a data_loader global (E.g current('CSVS'), current('JSONS').quran_stats).
+    DataWatcher.reload swaps new objects into this module, so names bound at import time
+    (`from .data_loader import CSVS`) keep the old data; read reloadable data through this instead.
+    '''
+    return globals()[name]
+
+def data_version() -> str:
+    '''Current DATA_VERSION (changes when DataWatcher reloads a file)'''
+    return DATA_VERSION
+
+#^ Build step (`python -m blueprints.resource_handler --compile-stopwords [--download]`), before any dataset is loaded
+if __name__ == '__main__' and '--compile-stopwords' in sys.argv:
+    NLTKLoader.compile(download='--download' in sys.argv)
+    sys.exit()
+
+#^ Restores module globals from the startup snapshot (if it matches the current sources)
+_SNAPSHOT = StartupSnapshot()
+_restored = _SNAPSHOT.restore()
+if _restored is not None:
+    STOPWORDS: List[str] = _restored['STOPWORDS']
+    _folders = {__folder: ArgMapper(__contents) for __folder, __contents in _restored['JSONS'].items()}
+    globals().update({__folder.upper(): __contents for __folder, __contents in _folders.items()})
+    CSVProcessor._dataframes = ArgMapper(_restored['CSVS'])
+else:
+    #^ Filtered NLTK stopwords
+    with _SNAPSHOT.timer('stopwords'):
+        STOPWORDS: List[str] = NLTKLoader().stopwords
+    #^ All structured JSON files (JSONs + folders[JSONs])
+    '''d
+    - Automatically includes future folders in the global scope.
+    - Global variables utilized for CSVProcessor.
+    - Objects are designated as constants, hence represented in uppercase.
+    '''
+    with _SNAPSHOT.timer('jsons'):
+        _folders = loader(mapper=True)
+        globals().update({__folder.upper(): __contents for __folder, __contents in _folders.items()})
+
+#^ Version of the loaded (non-Quran) JSON data and of this module (E.g for response ETags)
+DATA_VERSION: str = _SNAPSHOT.key
 
 #^ All structured JSON files converted to DataFrames (CSVs)
-CSVS: ArgMapper[pd.DataFrame] = CSVProcessor().dataframes
+with _SNAPSHOT.timer('csvs'):
+    CSVS: ArgMapper[pd.DataFrame] = CSVProcessor().dataframes
+
+if _restored is None:
+    _SNAPSHOT.save(STOPWORDS=STOPWORDS,
+                JSONS={__folder: __contents.reset for __folder, __contents in _folders.items()},
+                CSVS=CSVS.reset)
+if environ.get('ISLAMAI_IMPORT_REPORT', '0') == '1':
+    _SNAPSHOT.print_report()
+
+#^ Shares the datasets read-only across prefork workers (see gunicorn.conf.py)
+if environ.get('ISLAMAI_SHARED_MEMORY', '0') == '1':
+    SHARED_STORE = SharedDataStore(int(environ.get('ISLAMAI_SHARED_CACHE_BYTES', 128 * 1024**2)) or None)
+    SHARED_STORE.publish({**{f'{__folder}/{__name}': __data for __folder, __contents in _folders.items()
+                            for __name, __data in __contents.reset.items()},
+                        **{f'csvs/{__name}': __df for __name, __df in CSVS.reset.items()}})
+    globals().update({__folder.upper(): SHARED_STORE.mapper(__folder, list(__contents.keys())) for __folder, __contents in _folders.items()})
+    CSVS = CSVProcessor._dataframes = ArgMapper({__name: SHARED_STORE.load(f'csvs/{__name}') for __name in CSVS.keys()})
+    #** Drops the parsed copies held by the master (loaded or restored from the snapshot) so only the shared segment remains
+    del _folders
+    loader.cache_clear()
+del _restored
 
 if __name__ == '__main__':
     pprint(STOPWORDS)
+    _SNAPSHOT.print_report()
     # print(JSONS)
     # print(CSVS)
     pass
@@ -0,0 +1,26 @@
+import gc
+import os
+from multiprocessing import cpu_count
+
+#^ Datasets are loaded once in the master (preload_app) and published to a shared segment (blueprints/data_loader
+#** SharedDataStore): numeric blocks are shared zero-copy, string data is unpickled per worker on first use.
+#** Set ISLAMAI_SHARED_MEMORY=0 to give each worker its own copy.
+os.environ.setdefault('ISLAMAI_SHARED_MEMORY', '1')
+
+wsgi_app = 'ai_app:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', max(cpu_count(), 2)))
+preload_app = True
+
+def when_ready(server):
+    #** Moves every preloaded object to the permanent generation so GC passes in the
+    #** workers do not write to (and un-share) the pages inherited from the master.
+    gc.freeze()
+
+def post_worker_init(worker):
+    from blueprints.data_loader import (DataWatcher, SharedDataStore)
+    #** Each worker reloads changed data files into its own globals (no restart needed).
+    #** A changed Quran source is rebuilt once under the store's build lock; the other workers reopen that build.
+    DataWatcher.start()
+    report = SharedDataStore.memory_report()
+    worker.log.info('worker %s memory: %s', worker.pid, ', '.join(f'{key}={value}' for key, value in report.items()))
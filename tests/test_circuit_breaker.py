@@ -0,0 +1,83 @@
+'''
+CircuitBreaker states on a fake clock: tripping, shedding, half-open probes and `release`.
+
+Usage:
+    python -m pytest tests/test_circuit_breaker.py
+'''
+import pytest
+import ai_data
+from ai_data import CircuitBreaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ai_data, 'monotonic', clock)
+    return clock
+
+def tripped(clock, threshold=3, cooldown=30.0):
+    breaker = CircuitBreaker('host', threshold=threshold, cooldown=cooldown)
+    for _ in range(threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+def test_opens_after_threshold_failures(clock):
+    breaker = tripped(clock)
+    assert breaker.state == 'open' and breaker.trips == 1
+    assert not breaker.allow()
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker('host', threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed' and breaker.failures == 1
+
+def test_probe_after_cooldown(clock):
+    breaker = tripped(clock)
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow() and breaker.state == 'half_open'
+    #** Only one probe at a time
+    assert not breaker.allow()
+
+def test_probe_success_closes(clock):
+    breaker = tripped(clock)
+    clock.now += 30
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+def test_probe_failure_reopens(clock):
+    breaker = tripped(clock)
+    clock.now += 30
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and breaker.trips == 2
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+
+def test_release_lets_the_next_request_probe(clock):
+    breaker = tripped(clock)
+    clock.now += 30
+    assert breaker.allow()
+    #** E.g an invalid URL or a cancelled request: no verdict on the host
+    breaker.release()
+    assert breaker.state == 'open' and breaker.trips == 1
+    assert breaker.allow() and breaker.state == 'half_open'
+
+def test_release_of_a_closed_circuit_is_a_no_op(clock):
+    breaker = CircuitBreaker('host')
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == 'closed' and breaker.allow()
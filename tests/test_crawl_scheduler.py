@@ -0,0 +1,117 @@
+'''
+TokenBucket (on a fake clock) and CrawlScheduler concurrency, priority and lane fairness (no network).
+
+Usage:
+    python -m pytest tests/test_crawl_scheduler.py
+'''
+import asyncio
+import pytest
+import ai_data
+from ai_data import (CrawlScheduler, TokenBucket)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ai_data, 'monotonic', clock)
+    return clock
+
+def test_bucket_allows_bursts_then_waits(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+
+def test_bucket_refill_is_capped(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    clock.now += 60
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+
+def unlimited(max_concurrency):
+    return CrawlScheduler(max_concurrency=max_concurrency, rate=1e9, burst=1e9)
+
+def test_concurrency_is_bounded():
+    scheduler, running, peak = unlimited(2), [0], [0]
+    async def fetch():
+        async with scheduler.slot('host', lane='lane'):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+    async def _run():
+        await asyncio.gather(*(fetch() for _ in range(6)))
+    asyncio.run(_run())
+    assert peak[0] == 2
+    assert scheduler.running == 0 and scheduler.completed['lane'] == 6
+
+def dispatch_order(scheduler, requests):
+    '''Holds the only slot while `requests` [(lane, priority)] queue up, then returns the order they ran in'''
+    order = []
+    async def _run():
+        release = asyncio.Event()
+        async def hold():
+            async with scheduler.slot('host', lane='holder'):
+                await release.wait()
+        async def fetch(lane, priority):
+            async with scheduler.slot('host', lane=lane, priority=priority):
+                order.append(lane)
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(fetch(lane, priority)) for lane, priority in requests]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+    asyncio.run(_run())
+    return order
+
+def test_lower_priority_value_runs_first():
+    assert dispatch_order(unlimited(1), [('slow', 2), ('fast', 0), ('normal', 1)]) == ['fast', 'normal', 'slow']
+
+def test_lanes_share_the_slots_fairly():
+    order = dispatch_order(unlimited(1), [('a', 1), ('a', 1), ('a', 1), ('b', 1)])
+    assert order == ['a', 'b', 'a', 'a']
+
+def test_rate_limited_host_does_not_block_other_hosts():
+    scheduler = CrawlScheduler(max_concurrency=4, rate=1e9, burst=1e9, host_rates={'slow': (0.001, 1)})
+    order = []
+    async def fetch(host):
+        async with scheduler.slot(host, lane=host):
+            order.append(host)
+    async def _run():
+        await fetch('slow')
+        waiting = asyncio.create_task(fetch('slow'))
+        await asyncio.gather(*(fetch('fast') for _ in range(3)))
+        assert not waiting.done()
+        waiting.cancel()
+    asyncio.run(_run())
+    assert order == ['slow', 'fast', 'fast', 'fast']
+    assert scheduler.running == 0
+
+def test_cancelled_waiter_releases_nothing():
+    scheduler = unlimited(1)
+    async def _run():
+        release = asyncio.Event()
+        async def hold():
+            async with scheduler.slot('host', lane='holder'):
+                await release.wait()
+        async def fetch():
+            async with scheduler.slot('host', lane='waiter'):
+                pass
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(fetch())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await holder
+        await fetch()
+    asyncio.run(_run())
+    assert scheduler.running == 0 and scheduler.completed['waiter'] == 1
@@ -0,0 +1,79 @@
+'''
+DatasetCache and LazyArgMapper against an in-memory parser (entries sized by `sizeof`, no dataset files read).
+
+Usage:
+    python -m pytest tests/test_dataset_cache.py
+'''
+from pathlib import Path
+from blueprints.data_loader import (DatasetCache, LazyArgMapper)
+
+class FakeParser:
+    '''Parses `<name>.json` into `<name>` × 10 (10 bytes per character of the name)'''
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path.stem)
+        return path.stem * 10
+
+def sizeof(path, data):
+    return len(data)
+
+def paths(*names):
+    return {name: Path(f'{name}.json') for name in names}
+
+def test_evicts_least_recently_used():
+    cache, parser, files = DatasetCache(max_bytes=25, sizeof=sizeof), FakeParser(), paths('a', 'b', 'c')
+    cache.get(files['a'], parser)
+    cache.get(files['b'], parser)
+    cache.get(files['a'], parser)
+    cache.get(files['c'], parser)
+    assert files['a'] in cache and files['c'] in cache and files['b'] not in cache
+    assert cache.resident_bytes == 20
+    report = cache.report()
+    assert report[str(files['a'])]['hits'] == 1
+    assert report[str(files['b'])]['evictions'] == 1 and not report[str(files['b'])]['resident']
+
+def test_keeps_an_entry_larger_than_max_bytes():
+    cache, parser = DatasetCache(max_bytes=5, sizeof=sizeof), FakeParser()
+    cache.get(Path('a.json'), parser)
+    assert len(cache) == 1 and cache.resident_bytes == 10
+
+def test_unbounded_never_evicts():
+    cache, parser = DatasetCache(sizeof=sizeof), FakeParser()
+    for path in paths('a', 'b', 'c', 'd').values():
+        cache.get(path, parser)
+    assert len(cache) == 4
+
+def test_put_replaces_and_evicts():
+    cache, parser, files = DatasetCache(max_bytes=25, sizeof=sizeof), FakeParser(), paths('a', 'b')
+    cache.get(files['a'], parser)
+    cache.get(files['b'], parser)
+    cache.put(files['a'], 'x' * 20)
+    assert files['a'] in cache and files['b'] not in cache
+    assert cache.get(files['a'], parser) == 'x' * 20
+    assert parser.calls == ['a', 'b']
+
+def test_lazy_mapper_parses_on_first_access():
+    parser = FakeParser()
+    mapper = LazyArgMapper(paths('a', 'b'), parser=parser, cache=DatasetCache(sizeof=sizeof))
+    assert parser.calls == []
+    assert mapper.a == 'a' * 10
+    assert mapper['a'] == mapper.get('a')
+    assert parser.calls == ['a']
+    assert mapper.get('missing', 'default') == 'default'
+    assert mapper.stats['a']['resident'] and not mapper.stats['b']['resident']
+
+def test_lazy_mapper_reparses_evicted_datasets():
+    parser = FakeParser()
+    mapper = LazyArgMapper(paths('a', 'b'), parser=parser, cache=DatasetCache(max_bytes=15, sizeof=sizeof))
+    for key in ('a', 'b', 'a'):
+        mapper.get(key)
+    assert parser.calls == ['a', 'b', 'a']
+    assert mapper.stats['a']['misses'] == 2 and mapper.stats['b']['evictions'] == 1
+
+def test_lazy_mapper_reset_parses_everything():
+    parser = FakeParser()
+    mapper = LazyArgMapper(paths('a', 'b'), parser=parser, cache=DatasetCache(sizeof=sizeof))
+    assert mapper.reset == {'a': 'a' * 10, 'b': 'b' * 10}
+    assert list(mapper.paths) == ['a', 'b']
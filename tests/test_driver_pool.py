@@ -0,0 +1,108 @@
+'''
+DriverPool against a fake driver factory (no browser needed).
+
+Usage:
+    python -m pytest tests/test_driver_pool.py
+'''
+import asyncio
+import pytest
+from selenium.common.exceptions import WebDriverException
+from ai_data import DriverPool
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def default_content(self):
+        self.driver.resets += 1
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quits = 0
+        self.resets = 0
+        self.switch_to = FakeSwitchTo(self)
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise WebDriverException('browser crashed')
+        return 'about:blank'
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quits += 1
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+def use(pool, times=1):
+    async def _use():
+        drivers = []
+        for _ in range(times):
+            async with pool.driver() as driver:
+                drivers.append(driver)
+        return drivers
+    return asyncio.run(_use())
+
+def test_reuses_healthy_driver():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=1, max_uses=10)
+    first, second = use(pool, times=2)
+    assert first is second
+    assert len(factory.drivers) == 1
+    assert first.resets == 2
+    assert pool.stats['created'] == 1 and pool.stats['reused'] == 1
+
+def test_unhealthy_driver_is_replaced():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=1, max_uses=10)
+    (first,) = use(pool)
+    first.alive = False
+    (second,) = use(pool)
+    assert second is not first
+    assert first.quits == 1
+    assert pool.stats['recycled'] == 1 and pool.stats['created'] == 2
+
+def test_recycled_after_max_uses():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=1, max_uses=2)
+    drivers = use(pool, times=5)
+    assert [factory.drivers.index(driver) for driver in drivers] == [0, 0, 1, 1, 2]
+    assert factory.drivers[0].quits == 1 and factory.drivers[1].quits == 1
+    assert pool.stats['recycled'] == 2
+
+def test_quit_on_error():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=1)
+    async def _fail():
+        async with pool.driver():
+            raise WebDriverException('page crashed')
+    with pytest.raises(WebDriverException):
+        asyncio.run(_fail())
+    assert factory.drivers[0].quits == 1
+    (driver,) = use(pool)
+    assert driver is not factory.drivers[0]
+    assert pool.stats['created'] == 2
+
+def test_close_quits_every_driver():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=2)
+    async def _run():
+        async def _hold():
+            async with pool.driver():
+                await asyncio.sleep(0.01)
+        await asyncio.gather(_hold(), _hold())
+        await pool.close()
+    asyncio.run(_run())
+    assert len(factory.drivers) == 2
+    assert all(driver.quits == 1 for driver in factory.drivers)
+    assert pool.stats['quit'] == 2
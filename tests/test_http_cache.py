@@ -0,0 +1,123 @@
+'''
+HTTPCache storage, LRU eviction, and revalidation/replay through BaseAPI._request against a local stand-in server.
+
+Usage:
+    python -m pytest tests/test_http_cache.py
+'''
+import asyncio
+import pytest
+from aiohttp import web
+from ai_data import (BaseAPI, CacheMissError, HTTPCache)
+
+def test_content_addressed_bodies(tmp_path):
+    cache = HTTPCache(tmp_path)
+    cache.put('a', 'http://host/a', b'same body', {'ETag': '"v1"'}, 'text/html', 'utf-8')
+    cache.put('b', 'http://host/b', b'same body', {}, 'text/html', 'utf-8')
+    assert len(list((tmp_path / 'bodies').rglob('*.gz'))) == 1
+    entry = cache.get('a')
+    assert cache.body(entry) == b'same body' and entry['fresh']
+    assert HTTPCache.validators(entry) == {'If-None-Match': '"v1"'}
+    assert cache.get('missing') is None
+    cache.close()
+
+def test_stale_entries_keep_their_validators(tmp_path):
+    cache = HTTPCache(tmp_path, max_age=0)
+    cache.put('a', 'http://host/a', b'body', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, 'text/html', 'utf-8')
+    entry = cache.get('a')
+    assert not entry['fresh']
+    assert HTTPCache.validators(entry) == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    cache.revalidated('a', {'ETag': '"v2"'})
+    assert cache.get('a')['etag'] == '"v2"' and cache.stats['revalidated'] == 1
+    cache.close()
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = HTTPCache(tmp_path)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, f'http://host/{key}', key.encode('utf-8') * 1000, {}, 'text/html', 'utf-8')
+    cache.get('a')
+    #** Room for three bodies of the same size
+    cache.max_bytes = cache._total
+    cache.put('d', 'http://host/d', b'd' * 1000, {}, 'text/html', 'utf-8')
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in ('a', 'c', 'd'))
+    assert cache.stats['evicted'] == 1
+    cache.close()
+
+def test_access_times_are_flushed_in_batches(tmp_path):
+    cache = HTTPCache(tmp_path)
+    cache.ACCESS_FLUSH = 3
+    for key in ('a', 'b', 'c', 'd'):
+        cache.put(key, f'http://host/{key}', key.encode('utf-8'), {}, 'text/html', 'utf-8')
+    #** Repeated hits of one entry are a single pending write
+    for key in ('a', 'a', 'b', 'b'):
+        cache.get(key)
+    assert cache.stats['access_flushes'] == 0
+    cache.get('c')
+    assert cache.stats['access_flushes'] == 1
+    cache.get('d')
+    cache.close()
+    assert cache.stats['access_flushes'] == 2
+
+class StandIn:
+    '''Local server answering with an ETag and 304 to a matching If-None-Match'''
+    def __init__(self):
+        self.requests = []
+
+    async def handler(self, request):
+        self.requests.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304, headers={'ETag': '"v1"'})
+        return web.json_response({'verse': request.match_info['verse']}, headers={'ETag': '"v1"'})
+
+@pytest.fixture
+def crawl(tmp_path, monkeypatch):
+    monkeypatch.setattr(BaseAPI, 'path', tmp_path)
+    monkeypatch.setattr(BaseAPI, '_http_cache', None)
+    monkeypatch.setattr(BaseAPI, 'scheduler_options', {'max_concurrency': 4, 'rate': 1e9, 'burst': 1e9})
+    server = StandIn()
+    def run(steps):
+        async def _run():
+            app = web.Application()
+            app.router.add_get('/verse/{verse}', server.handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, 'localhost', 0)
+            await site.start()
+            url = f'http://localhost:{runner.addresses[0][1]}'
+            try:
+                return await steps(BaseAPI(), url)
+            finally:
+                await BaseAPI.close_session()
+                await runner.cleanup()
+        return asyncio.run(_run())
+    yield run, server
+    if BaseAPI._http_cache is not None:
+        BaseAPI._http_cache.close()
+
+def test_revalidates_stale_entries(crawl, monkeypatch):
+    run, server = crawl
+    monkeypatch.setenv('ISLAMAI_HTTP_CACHE', 'online')
+    async def steps(api, url):
+        first = await api._request(url=f'{url}/verse/1')
+        second = await api._request(url=f'{url}/verse/1')
+        BaseAPI.get_http_cache().max_age = 0
+        third = await api._request(url=f'{url}/verse/1')
+        return first, second, third
+    assert run(steps) == ({'verse': '1'},) * 3
+    #** Fresh hit without a request, then a conditional request answered 304
+    assert server.requests == [None, '"v1"']
+    assert BaseAPI.get_http_cache().stats['revalidated'] == 1
+
+def test_replay_serves_only_from_disk(crawl, monkeypatch):
+    run, server = crawl
+    monkeypatch.setenv('ISLAMAI_HTTP_CACHE', 'online')
+    async def steps(api, url):
+        await api._request(url=f'{url}/verse/1')
+        monkeypatch.setenv('ISLAMAI_HTTP_CACHE', 'replay')
+        replayed = await api._request(url=f'{url}/verse/1')
+        with pytest.raises(CacheMissError):
+            await api._request(url=f'{url}/verse/2')
+        return replayed
+    assert run(steps) == {'verse': '1'}
+    assert len(server.requests) == 1
+    assert BaseAPI.get_http_cache().stats['replayed'] == 1
@@ -0,0 +1,29 @@
+'''
+`/quran/translate` keeps the baseline response shape: the list_of_surahs value of the requested key.
+
+Usage:
+    python -m pytest tests/test_quran_translate.py
+'''
+import pytest
+from flask import Flask
+from nested_lookup import nested_lookup as nested
+from blueprints.quran_blueprint import (api_endpoint, quran_bp, quran_file)
+
+SURAH_ID = '1'
+
+@pytest.fixture(scope='module')
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(quran_bp)
+    return app.test_client()
+
+@pytest.mark.parametrize('lang, key', [('ar', 'full_surah_ar'), ('en', 'full_surah_en')])
+def test_translate_matches_list_of_surahs(client, lang, key):
+    response = client.get(f'{api_endpoint}/quran/translate?surahID={SURAH_ID}&lang={lang}', headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert response.get_json() == {key: nested(key, quran_file[SURAH_ID])[0]}
+
+def test_translit_matches_list_of_surahs(client):
+    response = client.get(f'{api_endpoint}/quran/translate?surahID={SURAH_ID}&lang=translit', headers={'Accept-Encoding': 'identity'})
+    surah = quran_file[SURAH_ID]
+    assert response.get_json() == {'translation_eng': nested('translation_eng', nested('Sahih International', surah)[0])}
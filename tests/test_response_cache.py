@@ -0,0 +1,93 @@
+'''
+ResponseCache ETags, conditional GETs, version invalidation and eviction on a bare Flask app.
+
+Usage:
+    python -m pytest tests/test_response_cache.py
+'''
+import hashlib
+import pytest
+from flask import (Flask, Response, request)
+from blueprints.ai_blueprint import ResponseCache
+
+class FakeVersion:
+    def __init__(self):
+        self.value = 'v1'
+
+    def __call__(self):
+        return self.value
+
+@pytest.fixture
+def served():
+    version = FakeVersion()
+    cache = ResponseCache(max_bytes=1024, version=version)
+    calls = []
+    app = Flask(__name__)
+
+    @app.route('/surah')
+    @cache.cached
+    def surah():
+        calls.append(request.args.get('id'))
+        return {'id': request.args.get('id'), 'text': 'x' * int(request.args.get('size', 10))}
+
+    @app.route('/stream')
+    @cache.cached
+    def stream():
+        calls.append('stream')
+        return Response('{}', mimetype='application/x-ndjson')
+
+    return app.test_client(), cache, version, calls
+
+def test_miss_then_hit(served):
+    client, cache, _, calls = served
+    first = client.get('/surah?id=1&size=5')
+    second = client.get('/surah?size=5&id=1')
+    assert first.get_data() == second.get_data()
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert calls == ['1']
+    assert cache.stats['misses'] == 1 and cache.stats['hits'] == 1
+
+def test_etag_is_the_body_hash(served):
+    client, _, _, _ = served
+    response = client.get('/surah?id=1')
+    assert response.headers['ETag'] == f'"{hashlib.sha256(response.get_data()).hexdigest()[:32]}"'
+
+def test_if_none_match_answers_304(served):
+    client, cache, _, calls = served
+    etag = client.get('/surah?id=1').headers['ETag']
+    response = client.get('/surah?id=1', headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.get_data() == b''
+    assert cache.stats['not_modified'] == 1
+    assert client.get('/surah?id=1', headers={'If-None-Match': '"stale"'}).status_code == 200
+    assert calls == ['1']
+
+def test_new_version_is_a_miss(served):
+    client, cache, version, calls = served
+    etag = client.get('/surah?id=1').headers['ETag']
+    version.value = 'v2'
+    response = client.get('/surah?id=1', headers={'If-None-Match': etag})
+    #** Same bytes after re-rendering: same ETag, so the client copy is still valid
+    assert response.status_code == 304
+    assert calls == ['1', '1']
+    assert cache.stats['misses'] == 2
+
+def test_evicts_least_recently_used(served):
+    client, cache, _, calls = served
+    for surahID in ('1', '2', '1', '3'):
+        client.get(f'/surah?id={surahID}&size=400')
+    assert cache.stats['evictions'] == 1 and len(cache) == 2
+    client.get('/surah?id=2&size=400')
+    assert calls == ['1', '2', '3', '2']
+
+def test_streams_are_not_cached(served):
+    client, cache, _, calls = served
+    first = client.get('/stream')
+    client.get('/stream', headers={'If-None-Match': '*'})
+    assert 'ETag' not in first.headers
+    assert calls == ['stream', 'stream'] and len(cache) == 0
+
+def test_invalidate_by_prefix(served):
+    client, cache, _, calls = served
+    client.get('/surah?id=1')
+    assert cache.invalidate('/surah') == 1
+    client.get('/surah?id=1')
+    assert calls == ['1', '1']
@@ -0,0 +1,45 @@
+'''
+VerseRange parsing of verse references and clipping of its ayahs to the length of a surah.
+
+Usage:
+    python -m pytest tests/test_verse_range.py
+'''
+import pytest
+from blueprints.data_loader import VerseRange
+
+@pytest.mark.parametrize('ref, surahID, expected', [
+    ('2:255-257', None, VerseRange(2, 255, 257)),
+    ('2:255', None, VerseRange(2, 255, 255)),
+    ('2', None, VerseRange(2, 1, None)),
+    (' 2 : 255 - 257 ', None, VerseRange(2, 255, 257)),
+    ('255-257', 2, VerseRange(2, 255, 257)),
+    ('255', '2', VerseRange(2, 255, 255)),
+    (114, None, VerseRange(114, 1, None)),
+])
+def test_parse(ref, surahID, expected):
+    assert VerseRange.parse(ref, surahID) == expected
+
+@pytest.mark.parametrize('ref', ['', 'abc', '0', '115', '2:0', '2:257-255', '255-257', '2:1:3', '1234'])
+def test_parse_rejects_invalid_references(ref):
+    with pytest.raises(ValueError):
+        VerseRange.parse(ref)
+
+@pytest.mark.parametrize('verse_range, text', [
+    (VerseRange(2, 255, 257), '2:255-257'),
+    (VerseRange(2, 255, 255), '2:255'),
+    (VerseRange(2), '2'),
+    (VerseRange(2, 255), '2:255-'),
+])
+def test_str(verse_range, text):
+    assert str(verse_range) == text
+
+@pytest.mark.parametrize('verse_range, verse_count, ayahs', [
+    (VerseRange(1), 7, range(1, 8)),
+    (VerseRange(2, 255, 257), 286, range(255, 258)),
+    (VerseRange(1, 5, 10), 7, range(5, 8)),
+    (VerseRange(1, 8, 9), 7, range(8, 8)),
+    (VerseRange(1, 3), 7, range(3, 8)),
+    (VerseRange(1), 0, range(1, 1)),
+])
+def test_ayahs_are_clipped_to_the_surah(verse_range, verse_count, ayahs):
+    assert verse_range.ayahs(verse_count) == ayahs
@@ -0,0 +1,100 @@
+'''
+WorkManifest checkpoints: resuming from stored results, corrupted results, failed and empty units, skipped exports and reset.
+
+Usage:
+    python -m pytest tests/test_work_manifest.py
+'''
+import asyncio
+from collections import OrderedDict
+import pytest
+from ai_data import (CacheMissError, CircuitOpenError, WorkManifest)
+
+class FakeJob:
+    '''Counts its calls and returns `result` (or raises `error`)'''
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+def run(manifest, unit, job):
+    return asyncio.run(manifest.run(unit, job))
+
+def test_resumes_from_completed_units(tmp_path):
+    job = FakeJob({'1': 'In the name of Allah'})
+    assert run(WorkManifest('surahquran', tmp_path), 'surah-1/lang-14', job) == job.result
+    #** New run on the same manifest: the stored result is replayed, the job is not called
+    manifest = WorkManifest('surahquran', tmp_path)
+    assert manifest.done('surah-1/lang-14')
+    assert run(manifest, 'surah-1/lang-14', job) == job.result
+    assert job.calls == 1 and manifest.stats['skipped'] == 1
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    run(WorkManifest('surahquran', tmp_path), 'surah-1/lang-14', FakeJob({'1': 'verse'}))
+    with open(tmp_path / 'surahquran.jsonl', mode='a', encoding='utf-8') as file:
+        file.write('{"unit": "surah-2/la')
+    manifest = WorkManifest('surahquran', tmp_path)
+    assert list(manifest.completed) == ['surah-1/lang-14']
+
+def test_corrupted_result_is_run_again(tmp_path):
+    job = FakeJob({'1': 'verse'})
+    manifest = WorkManifest('surahquran', tmp_path)
+    run(manifest, 'surah-1/lang-14', job)
+    manifest._result_path(manifest.completed['surah-1/lang-14']).write_text('{"1": "truncated', encoding='utf-8')
+    with pytest.raises(ValueError):
+        manifest.load('surah-1/lang-14')
+    assert run(manifest, 'surah-1/lang-14', job) == job.result
+    assert job.calls == 2 and manifest.stats['corrupted'] == 1
+
+@pytest.mark.parametrize('error', [CacheMissError('not cached'), CircuitOpenError('circuit open'), asyncio.TimeoutError()])
+def test_failed_unit_is_retried_on_the_next_run(tmp_path, error):
+    manifest = WorkManifest('surahquran', tmp_path)
+    assert run(manifest, 'surah-2/lang-14', FakeJob(error=error)) == OrderedDict()
+    assert list(manifest.failed) == ['surah-2/lang-14'] and manifest.stats['failed'] == 1
+    assert not manifest.done('surah-2/lang-14')
+    job = FakeJob({'1': 'verse'})
+    assert run(WorkManifest('surahquran', tmp_path), 'surah-2/lang-14', job) == job.result
+    assert job.calls == 1
+
+def test_other_errors_propagate(tmp_path):
+    with pytest.raises(KeyError):
+        run(WorkManifest('surahquran', tmp_path), 'surah-2/lang-14', FakeJob(error=KeyError('verse')))
+
+@pytest.mark.parametrize('result', [None, '', {}, {'Sahih International': {}}, [{'1': ''}]])
+def test_empty_results_are_not_checkpointed(tmp_path, result):
+    manifest = WorkManifest('surahquran', tmp_path)
+    assert run(manifest, 'surah-1/lang-14', FakeJob(result)) == result
+    assert manifest.stats['unchecked'] == 1 and not manifest.done('surah-1/lang-14')
+
+def test_unserializable_results_are_not_checkpointed(tmp_path):
+    manifest = WorkManifest('surahquran', tmp_path)
+    result = {'verses': {1, 2}}
+    assert run(manifest, 'surah-1/lang-14', FakeJob(result)) is result
+    assert manifest.stats['unchecked'] == 1 and not manifest.done('surah-1/lang-14')
+
+def test_skip_export_of_incomplete_files(tmp_path):
+    manifest = WorkManifest('surahquran', tmp_path)
+    run(manifest, 'surah-2/lang-14', FakeJob({'1': 'verse'}))
+    run(manifest, 'surah-2/lang-15', FakeJob(error=CacheMissError('not cached')))
+    assert manifest.skip_export('surah-2.json', prefix='surah-2/')
+    assert manifest.skip_export('surah-2.json', units=('surah-2/lang-15',))
+    #** A failure under `surah-2/` does not hold back `surah-20/`
+    assert not manifest.skip_export('surah-20.json', prefix='surah-20/')
+    assert not manifest.skip_export('surah-3.json', units=('surah-3/lang-14',))
+    assert not manifest.skip_export('surah-3.json')
+    assert manifest.stats['unexported'] == 2
+
+def test_reset_starts_from_scratch(tmp_path):
+    job = FakeJob({'1': 'verse'})
+    manifest = WorkManifest('surahquran', tmp_path)
+    run(manifest, 'surah-1/lang-14', job)
+    manifest.reset()
+    assert not manifest.done('surah-1/lang-14')
+    assert not WorkManifest('surahquran', tmp_path).completed
+    run(manifest, 'surah-1/lang-14', job)
+    assert job.calls == 2